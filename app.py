@@ -6,13 +6,27 @@ VERSION 2.0 - Con procesamiento automático de archivos del CRM
 
 import streamlit as st
 import pandas as pd
-import numpy as np
-import pickle
-import plotly.express as px
-import plotly.graph_objects as go
 from pathlib import Path
-import sys
-import re
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from scoring.cache_lru import CacheLRU
+from scoring.config import cargar_config
+from scoring.duplicados import claves_previas, estado_previas, registrar_carga
+from scoring.excel import leer_excel, leer_excel_columnas
+from scoring.features import crear_features
+from scoring.modelo import cargar_artefactos, version_artefactos
+from scoring.pipeline import (
+    detectar_tipo_archivo,
+    limpiar_datos,
+    resolver_universidad,
+    preparar_datos_prediccion,
+    asignar_scores
+)
+from scoring.rendimiento import Perfil, configurar_log
+from scoring.reporte import Reporte
+from scoring.streaming import puntuar_por_lotes, leer_por_lotes, es_csv, TAMANO_LOTE_DEFAULT
 
 # Configurar la pagina
 st.set_page_config(
@@ -87,549 +101,213 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Funciones para cargar modelo
-@st.cache_resource
-def cargar_modelo():
-    """Carga el modelo limpio multi-universidad (SIN data leakage)"""
-    BASE_DIR = Path(__file__).parent
-    modelo_path = BASE_DIR / "models" / "modelo_scoring_sin_leakage.pkl"
-    encoders_path = BASE_DIR / "models" / "label_encoders_sin_leakage.pkl"
-    
-    with open(modelo_path, 'rb') as f:
-        modelo = pickle.load(f)
-    
-    with open(encoders_path, 'rb') as f:
-        encoders = pickle.load(f)
-    
-    return modelo, encoders
+# Log de rendimiento (data/logs/rendimiento.jsonl)
+configurar_log()
 
-# ===== FUNCIONES DE NORMALIZACION MULTI-UNIVERSIDAD =====
+# Límites de la caché de resultados (compartida por todas las sesiones)
+CACHE_MAX_MB = 1024
+CACHE_MAX_ENTRADAS = 12
 
-def detectar_universidad(df):
+# Funciones para cargar modelo
+@st.cache_resource
+def precargar_modelo():
     """
-    Detecta automáticamente la universidad basándose en características del dataset
-    Returns: 'UNAB', 'Crexe', 'UEES', 'Anahuac', 'Unisangil', 'Desconocido'
+    Empieza a cargar el modelo en un hilo aparte con la primera página del
+    servidor: la interfaz se muestra sin esperarlo y, para cuando se piden
+    scores, ya está en memoria
     """
-    # Método 0: Analizar columna "Base de datos" (MÁS CONFIABLE)
-    if 'Base de datos' in df.columns:
-        bases_str = ' '.join(df['Base de datos'].astype(str).str.upper().unique())
-        
-        # Buscar nombres de universidades en las bases de datos
-        # Orden de prioridad: buscar patrones más específicos primero
-        if 'UNAB' in bases_str:
-            return 'UNAB'
-        elif 'CREXE' in bases_str:
-            return 'Crexe'
-        elif 'UEES' in bases_str:
-            return 'UEES'
-        elif 'ANAHUAC' in bases_str or 'ANÁHUAC' in bases_str:
-            return 'Anahuac'
-        elif 'UNISANGIL' in bases_str or 'SANGIL' in bases_str:
-            return 'Unisangil'
-    
-    # Método 1: Analizar características específicas de columnas
-    col_names = [str(c).lower() for c in df.columns]
-    
-    # UEES tiene columnas únicas
-    if 'operador' in col_names and 'nombre operador' in col_names:
-        return 'UEES'
-    
-    # Crexe tiene CHKENTRANTEWHATSAPP antes de normalizar
-    if 'chkentrantewhatsapp' in col_names or 'txtestadoprincipal' in col_names:
-        return 'Crexe'
-    
-    # Método 2: Analizar programas únicos
-    if 'Programa interes' in df.columns or 'programa interes' in col_names:
-        programas = df['Programa interes'].astype(str).str.upper() if 'Programa interes' in df.columns else []
-        programas_str = ' '.join(programas.unique())
-        
-        # Programas específicos de cada universidad
-        if 'NEUROCIENCIA' in programas_str or 'MINDFULNESS' in programas_str:
-            return 'Crexe'
-        elif 'ANAHUAC' in programas_str:
-            return 'Anahuac'
-        elif 'UNISANGIL' in programas_str:
-            return 'Unisangil'
-    
-    # Método 3: Por cantidad de leads (ÚLTIMO RECURSO - menos confiable)
-    # Solo usar si ningún otro método funcionó
-    if len(df) > 40000:
-        return 'Crexe'  # Crexe tiene ~44K leads
-    elif len(df) > 25000:
-        return 'UEES'  # UEES tiene ~27K leads
-    elif len(df) > 10000:
-        return 'Anahuac'  # Anahuac tiene ~15K leads
-    elif len(df) > 5000:
-        return 'UNAB'  # UNAB tiene ~6K leads
-    else:
-        return 'Unisangil'  # Unisangil tiene ~4K leads
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix='precarga').submit(cargar_artefactos)
 
-def normalizar_columnas(df):
+def cargar_modelo():
     """
-    Normaliza nombres de columnas para compatibilidad entre universidades
-    - Elimina espacios al inicio/final
-    - Mapea nombres comunes entre diferentes CRMs
-    - Soporta: UNAB, Crexe, UEES y otras instituciones
+    Carga el modelo limpio multi-universidad (SIN data leakage)
+    Si la precarga falló (p. ej. modelo ausente o a medio escribir durante un
+    reentrenamiento) se descarta de la caché y se reintenta: el error no
+    queda guardado hasta reiniciar el servidor
     """
-    # 1. Eliminar espacios en nombres de columnas
-    df.columns = df.columns.str.strip()
-    
-    # 2. Mapeo de columnas con nombres diferentes
-    mapeo_columnas = {
-        # Crexe/UEES -> UNAB (estandar)
-        'Idcontacto': 'dcontacto',
-        'Lamadas_discador': 'Llamadas_discador',  # Typo en Crexe/UEES
-        'CHKENTRANTEWHATSAPP': 'WhatsApp entrante',
-        'TXTESTADOPRINCIPAL': 'Estado principal',
-        'Ultima resolucion': 'Ultima resolución',
-        
-        # UEES específico
-        'Contador de Llamadas': 'CONTADOR_LLAMADOS_TEL',
-        'Fecha Inserción Leads': 'Fecha insert Lead',
-        'UTM Origen': 'UTM Source',  # UEES usa "Origen" en vez de "Source"
-        
-        # Otras variaciones comunes
-        'Resolucion': 'Resolución',
-        'Fecha y hora de actualizacion': 'Fecha y hora de actualización',
-        'Programa interes': 'Programa interes',  # Ya normalizado
-    }
-    
-    # Aplicar mapeo
-    df = df.rename(columns=mapeo_columnas)
-    
-    # 3. Convertir CHKENTRANTEWHATSAPP (Si/No) a formato booleano
-    if 'WhatsApp entrante' in df.columns:
-        # Si es texto "Si"/"No", convertir
-        if df['WhatsApp entrante'].dtype == 'object':
-            df['WhatsApp entrante'] = df['WhatsApp entrante'].apply(
-                lambda x: 'entrante' if str(x).lower() in ['si', 'sí', 'yes', '1'] else None
-            )
-    
-    return df
+    precarga = precargar_modelo()
+    if precarga.exception() is not None:
+        precargar_modelo.clear()
+        precarga = precargar_modelo()
+    return precarga.result()
+
+@st.cache_resource
+def version_modelo():
+    """Hash de los artefactos del modelo (parte de las claves de caché de scores)"""
+    return version_artefactos()
+
+@st.cache_resource
+def cache_resultados():
+    """Archivos parseados, procesados y con scores, por hash de contenido (LRU)"""
+    return CacheLRU(max_mb=CACHE_MAX_MB, max_entradas=CACHE_MAX_ENTRADAS)
+
+def hash_archivo_subido(uploaded_file):
+    """Hash del contenido subido (se calcula una vez por archivo y sesión)"""
+    hashes = st.session_state.setdefault('hashes_archivos', {})
+    if uploaded_file.file_id not in hashes:
+        hashes[uploaded_file.file_id] = hashlib.sha256(uploaded_file.getbuffer()).hexdigest()[:16]
+    return hashes[uploaded_file.file_id]
+
+def leer_archivo_subido(uploaded_file, clave_archivo):
+    """DataFrame del archivo subido, parseado una sola vez por contenido"""
+    def parsear():
+        uploaded_file.seek(0)
+        if uploaded_file.name.endswith('.csv'):
+            return pd.read_csv(uploaded_file)
+        # Todas las columnas: el CSV de descarga las conserva, igual que con un CSV subido
+        return leer_excel(uploaded_file, solo_utiles=False)
+    
+    return cache_resultados().obtener_o_calcular(('archivo', clave_archivo, uploaded_file.name), parsear)
 
 # ===== FUNCIONES DE PROCESAMIENTO INTEGRADAS =====
 
-def validar_email(email):
-    """Valida si un email tiene formato correcto"""
-    if pd.isna(email):
-        return False
-    patron = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(patron, str(email).strip()))
+def mostrar_reporte(reporte, etapa=None):
+    """Renderiza los eventos del pipeline con los componentes de Streamlit"""
+    renderizadores = {
+        'info': st.info,
+        'exito': st.success,
+        'aviso': st.warning,
+        'error': st.error
+    }
+    
+    eventos = reporte.eventos if etapa is None else reporte.eventos_de(etapa)
+    for evento in eventos:
+        renderizadores[evento.nivel](evento.mensaje)
+
+def mostrar_rendimiento(perfil):
+    """Panel colapsable con tiempo, filas/s y memoria de cada etapa"""
+    etapas = perfil.por_etapa()
+    if not etapas:
+        return
+    
+    with st.expander("⏱️ Rendimiento"):
+        tabla = pd.DataFrame([
+            {
+                'Etapa': m.etapa,
+                'Tiempo (s)': round(m.segundos, 3),
+                'Filas': m.filas,
+                'Filas/s': round(m.filas_por_segundo) if m.filas_por_segundo else None,
+                'RSS (MB)': round(m.rss_mb, 1) if m.rss_mb is not None else None,
+                'Pico RSS (MB)': round(m.pico_rss_mb, 1) if m.pico_rss_mb is not None else None,
+                'DataFrame (MB)': round(m.memoria_df_mb, 1) if m.memoria_df_mb is not None else None,
+            }
+            for m in etapas
+        ])
+        st.dataframe(tabla, use_container_width=True, hide_index=True)
+        st.caption(f"Total: {perfil.segundos_total:.2f} s · DataFrame (MB) no incluye el contenido de los textos")
 
-def limpiar_datos_integrado(df):
-    """Limpia los datos del CRM (versión integrada para Streamlit)"""
+def limpiar_datos_integrado(df, perfil=None, universidad=None, claves_vistas=None):
+    """
+    Limpia los datos del CRM (versión integrada para Streamlit)
+    universidad: selección manual del sidebar (prioriza sus formatos de fecha)
+    claves_vistas: ConjuntoHashes (claves_previas) para descartar leads de cargas anteriores
+    """
+    perfil = perfil if perfil is not None else Perfil()
     
     with st.spinner("🧹 Limpiando datos..."):
-        # 0. NORMALIZAR COLUMNAS (Multi-universidad)
-        st.info("🔄 Normalizando formato de columnas...")
-        df_limpio = normalizar_columnas(df.copy())
-        
-        # 1. Eliminar columnas completamente vacías
-        columnas_vacias = df_limpio.columns[df_limpio.isnull().all()].tolist()
-        if columnas_vacias:
-            df_limpio = df_limpio.drop(columns=columnas_vacias)
-            st.info(f"✂️ Columnas vacías eliminadas: {', '.join(columnas_vacias)}")
-        
-        # 2. Crear variable objetivo (TARGET)
-        if 'Resolución' in df_limpio.columns:
-            # Usar matching flexible para soportar variaciones entre universidades
-            # UEES usa: "Matriculado / Inscripto", "En proceso de pago - No contesta"
-            # Otras universidades: "Matriculado", "Admitido", "En proceso de pago"
-            
-            def es_resolucion_positiva(resolucion):
-                """Detecta si una resolución indica probabilidad de matrícula"""
-                if pd.isna(resolucion):
-                    return 0
-                
-                resol_str = str(resolucion).strip().lower()
-                
-                # Patrones de resoluciones positivas
-                patrones_positivos = [
-                    'matricul',  # Cubre: Matriculado, Matriculado / Inscripto
-                    'inscripto',  # UEES específico
-                    'admitido',
-                    'proceso de pago',  # Cubre: En proceso de pago, En proceso de pago - No contesta
-                ]
-                
-                return 1 if any(patron in resol_str for patron in patrones_positivos) else 0
-            
-            df_limpio['target'] = df_limpio['Resolución'].apply(es_resolucion_positiva)
-            st.success(f"✅ Variable objetivo creada: {df_limpio['target'].sum()} matriculados ({df_limpio['target'].mean()*100:.2f}%)")
-            
-            # 🔒 ELIMINAR COLUMNAS DE DATA LEAKAGE DESPUÉS DE CREAR TARGET
-            # Estas columnas contienen información del futuro y NO deben estar en el dataset
-            columnas_leakage = [
-                'Resolución',
-                'Ultima resolución',
-                'Estado principal',
-                'Fecha y hora del proximo llamado',
-                'Contador de Llamadas'  # Si existe (es diferente a CONTADOR_LLAMADOS_TEL)
-            ]
-            
-            columnas_eliminadas = []
-            for col in columnas_leakage:
-                if col in df_limpio.columns:
-                    df_limpio = df_limpio.drop(columns=[col])
-                    columnas_eliminadas.append(col)
-            
-            if columnas_eliminadas:
-                st.warning(f"🔒 Columnas de data leakage eliminadas: {', '.join(columnas_eliminadas)}")
-        else:
-            st.warning("⚠️ No se encontró columna 'Resolución' - creando target = 0")
-        
-        # 3. Validar y limpiar emails
-        if 'EMLMAIL' in df_limpio.columns:
-            df_limpio['email_valido'] = df_limpio['EMLMAIL'].apply(validar_email)
-            emails_invalidos = (~df_limpio['email_valido']).sum()
-            st.info(f"📧 Emails validados: {emails_invalidos} inválidos detectados")
-        
-        # 4. Detectar y eliminar duplicados (mismo email + mismo programa)
-        if 'EMLMAIL' in df_limpio.columns and 'Programa interes' in df_limpio.columns:
-            df_con_email = df_limpio[df_limpio['email_valido']].copy()
-            duplicados_mask = df_con_email.duplicated(
-                subset=['EMLMAIL', 'Programa interes'], 
-                keep='first'
-            )
-            indices_duplicados = df_con_email[duplicados_mask].index
-            
-            if len(indices_duplicados) > 0:
-                df_limpio = df_limpio.drop(indices_duplicados)
-                st.warning(f"🗑️ {len(indices_duplicados)} duplicados eliminados (mismo email + programa)")
-        
-        # 5. Normalizar campos de texto
-        if 'Programa interes' in df_limpio.columns:
-            df_limpio['Programa interes'] = df_limpio['Programa interes'].fillna('NO ESPECIFICADO')
-            df_limpio['Programa interes'] = df_limpio['Programa interes'].str.strip().str.upper()
-        
-        if 'Base de datos' in df_limpio.columns:
-            df_limpio['Base de datos'] = df_limpio['Base de datos'].str.strip()
-        
-        for col in ['UTM Medium', 'UTM Source', 'UTM Campaing', 'UTM Content']:
-            if col in df_limpio.columns:
-                df_limpio[col] = df_limpio[col].fillna('no_disponible')
-                df_limpio[col] = df_limpio[col].str.strip().str.lower()
-        
-        # 6. Procesar fechas
-        if 'Fecha insert Lead' in df_limpio.columns:
-            df_limpio['Fecha insert Lead'] = pd.to_datetime(df_limpio['Fecha insert Lead'], errors='coerce')
-        
-        if 'Fecha y hora de actualización' in df_limpio.columns:
-            df_limpio['Fecha y hora de actualización'] = pd.to_datetime(
-                df_limpio['Fecha y hora de actualización'], errors='coerce'
-            )
-            
-            # Calcular días de gestión
-            if 'Fecha insert Lead' in df_limpio.columns:
-                df_limpio['dias_gestion'] = (
-                    df_limpio['Fecha y hora de actualización'] - df_limpio['Fecha insert Lead']
-                ).dt.days
-                df_limpio['dias_gestion'] = df_limpio['dias_gestion'].fillna(0)
-                df_limpio['dias_gestion'] = df_limpio['dias_gestion'].apply(lambda x: max(0, x))
-        
-        st.success(f"✅ Limpieza completada: {len(df_limpio)} leads listos")
+        with perfil.medir('limpieza', filas=len(df)) as medicion:
+            df_limpio, reporte = limpiar_datos(df, universidad=universidad, claves_vistas=claves_vistas)
+            medicion.registrar_df(df_limpio)
+        mostrar_reporte(reporte)
     
     return df_limpio
 
-def crear_features_integrado(df):
-    """Crea features adicionales (versión integrada para Streamlit)"""
+def crear_features_integrado(df, universidad=None, perfil=None):
+    """
+    Crea features adicionales (versión integrada para Streamlit)
+    universidad: selección manual del sidebar; None = detección automática
+    """
+    perfil = perfil if perfil is not None else Perfil()
     
     with st.spinner("🔧 Creando features..."):
-        df_features = df.copy()
-        
-        # 0. DETECTAR Y AGREGAR UNIVERSIDAD
-        if 'universidad' not in df_features.columns:
-            # Priorizar selección manual del usuario
-            if 'universidad_manual' in st.session_state and st.session_state['universidad_manual'] != "Detección Automática":
-                universidad_detectada = st.session_state['universidad_manual']
-                st.success(f"🎓 Universidad seleccionada manualmente: **{universidad_detectada}**")
-            else:
-                # Detección automática
-                universidad_detectada = detectar_universidad(df_features)
-                st.info(f"🎓 Universidad detectada automáticamente: **{universidad_detectada}**")
+        with perfil.medir('features', filas=len(df)) as medicion:
+            # 0. DETECTAR UNIVERSIDAD (la selección manual tiene prioridad)
+            reporte = Reporte()
+            universidad_detectada = resolver_universidad(df, universidad, reporte)
             
-            df_features['universidad'] = universidad_detectada
-
-        
-        # 1. Features de Email
-        if 'email_valido' in df_features.columns:
-            df_features['tiene_email'] = df_features['email_valido'].astype(int)
-        else:
-            df_features['tiene_email'] = 0
-        
-        # 2. Features de WhatsApp
-        if 'WhatsApp entrante' in df_features.columns:
-            df_features['whatsapp_entrante_flag'] = df_features['WhatsApp entrante'].notna().astype(int)
-        else:
-            df_features['whatsapp_entrante_flag'] = 0
-        
-        # 3. Features Temporales
-        if 'dias_gestion' in df_features.columns:
-            df_features['lead_reciente'] = (df_features['dias_gestion'] < 7).astype(int)
-            df_features['lead_antiguo'] = (df_features['dias_gestion'] > 30).astype(int)
-        else:
-            df_features['dias_gestion'] = 0
-            df_features['lead_reciente'] = 0
-            df_features['lead_antiguo'] = 0
-        
-        # 4. Features de Comportamiento
-        if 'CONTADOR_LLAMADOS_TEL' in df_features.columns:
-            df_features['ratio_llamadas_dias'] = df_features.apply(
-                lambda row: row['CONTADOR_LLAMADOS_TEL'] / max(row.get('dias_gestion', 1), 1),
-                axis=1
-            )
-            df_features['alta_actividad_llamadas'] = (df_features['CONTADOR_LLAMADOS_TEL'] > 5).astype(int)
-        else:
-            df_features['CONTADOR_LLAMADOS_TEL'] = 0
-            df_features['ratio_llamadas_dias'] = 0
-            df_features['alta_actividad_llamadas'] = 0
+            # 1-8. Features del modelo (motor vectorizado compartido con el batch)
+            df_features = crear_features(df, universidad=universidad_detectada)
+            medicion.registrar_df(df_features)
         
-        if 'Llamadas_discador' not in df_features.columns:
-            df_features['Llamadas_discador'] = 0
-        
-        # 5. Categorizar Programas
-        def categorizar_programa(programa):
-            programa_str = str(programa).upper()
-            
-            # Casos especiales primero
-            if programa_str in ['NO ESPECIFICADO', 'NAN', 'NONE', '']:
-                return 'NO_ESPECIFICADO'
-            
-            # Tecnología
-            if 'TECNOLOGÍA' in programa_str or 'TECNOLOGIA' in programa_str:
-                return 'TECNOLOGIA'
-            
-            # Posgrados
-            elif 'ESPECIALIZACIÓN' in programa_str or 'ESPECIALIZACION' in programa_str:
-                return 'ESPECIALIZACION'
-            elif 'MAESTRÍA' in programa_str or 'MAESTRIA' in programa_str:
-                return 'MAESTRIA'
-            elif 'DOCTORADO' in programa_str:
-                return 'DOCTORADO'
-            
-            # Áreas específicas
-            elif 'DERECHO' in programa_str:
-                return 'DERECHO'
-            elif 'ADMINISTR' in programa_str or 'NEGOCIO' in programa_str or 'CONTAD' in programa_str or 'EMPRESA' in programa_str:
-                return 'NEGOCIOS'
-            elif 'SALUD' in programa_str or 'FARMACIA' in programa_str or 'EPIDEMIO' in programa_str or 'MEDICINA' in programa_str or 'ENFERM' in programa_str:
-                return 'SALUD'
-            elif 'INGENIER' in programa_str:
-                return 'INGENIERIA'
-            elif 'EDUCAC' in programa_str or 'PEDAGOG' in programa_str:
-                return 'EDUCACION'
-            elif 'ARTE' in programa_str or 'DISEÑO' in programa_str or 'DISENO' in programa_str or 'AUDIOVISUAL' in programa_str or 'LITERATURA' in programa_str:
-                return 'ARTE_DISENO'
-            elif 'PSICOLOG' in programa_str or 'SOCIAL' in programa_str:
-                return 'CIENCIAS_SOCIALES'
-            else:
-                return 'OTROS'
-        
-        if 'Programa interes' in df_features.columns:
-            df_features['programa_categoria'] = df_features['Programa interes'].apply(categorizar_programa)
-        else:
-            df_features['programa_categoria'] = 'OTROS'
-        
-        # 6. Categorizar Base de Datos
-        def categorizar_base(base):
-            base_str = str(base).upper()
-            
-            # Casos especiales
-            if base_str in ['NAN', 'NONE', '']:
-                return 'NO_ESPECIFICADO'
-            
-            # NUEVO: Detectar tipo de programa (GMP, DIPLOMADO, EVENTO)
-            # Esto es especialmente útil para UEES que tiene bases como:
-            # "57 - GMP Nuevos - noviembre", "51 - DIPLOMADOS FORM NATIVO", "53 - EVENTOS"
-            if 'GMP' in base_str:
-                return 'GMP'
-            elif 'DIPLOMADO' in base_str:
-                return 'DIPLOMADO'
-            elif 'EVENTO' in base_str:
-                return 'EVENTO'
-            
-            # Categorías principales (UNAB/Otras universidades)
-            elif 'PREGRADO' in base_str:
-                return 'PREGRADO'
-            elif 'POSGRADO' in base_str or 'POSTGRADO' in base_str:
-                return 'POSGRADO'
-            elif 'LETO' in base_str:
-                return 'LETO'
-            
-            # Detectar características especiales
-            elif 'CONSOLIDADO' in base_str or 'CONSOLIDADA' in base_str:
-                return 'BASE_CONSOLIDADA'
-            elif 'PRUEBA' in base_str or 'TEST' in base_str:
-                return 'BASE_PRUEBA'
-            elif 'RMK' in base_str or 'REMARKETING' in base_str:
-                return 'REMARKETING'
-            
-            # Detectar bases numeradas (ej: "101 - BBDD")
-            elif any(num in base_str for num in ['101', '102', '103', '104', '105']):
-                return 'BASE_PRINCIPAL'
-            elif any(num in base_str for num in ['22', '23', '24', '25']):
-                return 'BASE_SECUNDARIA'
-            
-            else:
-                return 'OTRO'
-        
-        if 'Base de datos' in df_features.columns:
-            df_features['base_categoria'] = df_features['Base de datos'].apply(categorizar_base)
-        else:
-            df_features['base_categoria'] = 'OTRO'
-        
-        # 7. Limpiar UTM Source
-        def limpiar_utm_source(source):
-            source_str = str(source).lower().strip()
-            
-            # Valores vacíos o no disponibles
-            if source_str in ['no_disponible', 'nan', 'none', '', 'no disponible']:
-                return 'no_disponible'
-            
-            # Fuentes conocidas
-            if 'google' in source_str:
-                return 'google'
-            elif 'fb' in source_str or 'facebook' in source_str:
-                return 'facebook'
-            elif 'instagram' in source_str or 'ig' in source_str:
-                return 'instagram'
-            elif 'linkedin' in source_str:
-                return 'linkedin'
-            elif 'twitter' in source_str or 'x.com' in source_str:
-                return 'twitter'
-            elif 'tiktok' in source_str:
-                return 'tiktok'
-            elif 'youtube' in source_str or 'yt' in source_str:
-                return 'youtube'
-            elif 'email' in source_str or 'correo' in source_str:
-                return 'email'
-            elif 'direct' in source_str or 'directo' in source_str:
-                return 'directo'
-            else:
-                return 'otros'
-        
-        if 'UTM Source' in df_features.columns:
-            df_features['utm_source_clean'] = df_features['UTM Source'].apply(limpiar_utm_source)
-        else:
-            df_features['utm_source_clean'] = 'otros'
-        
-        # 8. Limpiar UTM Medium
-        def limpiar_utm_medium(medium):
-            medium_str = str(medium).lower().strip()
-            
-            # Valores vacíos o no disponibles
-            if medium_str in ['no_disponible', 'nan', 'none', '', 'no disponible', 'test']:
-                return 'no_disponible'
-            
-            # Medios conocidos
-            if 'paid' in medium_str:
-                return 'paid'
-            elif 'social' in medium_str:
-                return 'social'
-            elif 'organic' in medium_str or 'organico' in medium_str:
-                return 'organic'
-            elif 'cpc' in medium_str or 'ppc' in medium_str:
-                return 'cpc'
-            elif 'email' in medium_str or 'correo' in medium_str:
-                return 'email'
-            elif 'referral' in medium_str or 'referido' in medium_str:
-                return 'referral'
-            elif 'display' in medium_str or 'banner' in medium_str:
-                return 'display'
-            else:
-                return 'otros'
-        
-        if 'UTM Medium' in df_features.columns:
-            df_features['utm_medium_clean'] = df_features['UTM Medium'].apply(limpiar_utm_medium)
-        else:
-            df_features['utm_medium_clean'] = 'otros'
-        
-        st.success("✅ Features creadas exitosamente!")
+        reporte.exito('features', "✅ Features creadas exitosamente!")
+        mostrar_reporte(reporte)
     
     return df_features
 
-def detectar_tipo_archivo(df):
-    """
-    Detecta si el archivo ya está procesado o si es del CRM original
-    Returns: 'procesado', 'crm_original', 'desconocido'
-    """
-    # Columnas que debe tener un archivo procesado
-    columnas_procesadas = [
-        'programa_categoria', 'base_categoria', 
-        'utm_source_clean', 'utm_medium_clean',
-        'ratio_llamadas_dias'
-    ]
+def preparar_datos_prediccion_integrado(df, encoders, perfil=None):
+    """Prepara los datos para prediccion mostrando avisos en la interfaz"""
+    perfil = perfil if perfil is not None else Perfil()
     
-    # Columnas típicas del CRM original
-    columnas_crm = ['dcontacto', 'Nombre y Apellido', 'TELTELEFONO', 'Resolución']
+    with perfil.medir('codificacion', filas=len(df)):
+        X, reporte = preparar_datos_prediccion(df, encoders)
+    mostrar_reporte(reporte)
     
-    tiene_procesadas = all(col in df.columns for col in columnas_procesadas)
-    tiene_crm = any(col in df.columns for col in columnas_crm)
+    if X is None:
+        st.info("💡 Asegurate de que el archivo esté en el formato correcto.")
     
-    if tiene_procesadas:
-        return 'procesado'
-    elif tiene_crm:
-        return 'crm_original'
-    else:
-        return 'desconocido'
+    return X
 
-def preparar_datos_prediccion(df, encoders):
+def procesar_crm_integrado(df, clave_archivo, universidad=None, omitir_vistos=False):
     """
-    Prepara los datos para prediccion (mismo proceso que entrenamiento)
-    IMPORTANTE: El orden de las columnas debe coincidir EXACTAMENTE con el entrenamiento
+    Limpieza + features de un archivo del CRM
+    omitir_vistos: descartar los leads del dataset y de cargas de OTROS archivos
+        (el índice no se modifica acá: ver registrar_carga)
+    Returns: (df_procesado, mediciones de rendimiento de ambas etapas,
+        claves nuevas a registrar cuando haya scores o None)
     """
-    # Codificar categoricas PRIMERO (incluye universidad)
-    columnas_categoricas = ['universidad', 'programa_categoria', 'base_categoria', 'utm_source_clean', 'utm_medium_clean']
-    
-    df_encoded = df.copy()
-    
-    for col in columnas_categoricas:
-        if col in df_encoded.columns and col in encoders:
-            le = encoders[col]
-            # Manejar categorias nuevas
-            df_encoded[col] = df_encoded[col].apply(
-                lambda x: x if x in le.classes_ else le.classes_[0]
-            )
-            df_encoded[col] = le.transform(df_encoded[col])
-        elif col not in df_encoded.columns:
-            st.warning(f"⚠️ Columna {col} no encontrada, usando valor por defecto")
-            df_encoded[col] = 0
-    
-    # ORDEN EXACTO de columnas como en el entrenamiento
-    # Este orden fue extraído directamente del modelo entrenado
-    columnas_modelo_orden = [
-        'universidad',
-        'CONTADOR_LLAMADOS_TEL',
-        'Llamadas_discador',
-        'dias_gestion',
-        'ratio_llamadas_dias',
-        'alta_actividad_llamadas',  # IMPORTANTE: va aquí, no al final
-        'lead_reciente',
-        'lead_antiguo',
-        'tiene_email',
-        'whatsapp_entrante_flag',
-        'programa_categoria',
-        'base_categoria',
-        'utm_source_clean',
-        'utm_medium_clean'
-    ]
-    
-    # Verificar que todas las columnas existen
-    columnas_faltantes = [col for col in columnas_modelo_orden if col not in df_encoded.columns]
-    if columnas_faltantes:
-        st.error(f"❌ Faltan columnas necesarias: {columnas_faltantes}")
-        st.info("💡 Asegurate de que el archivo esté en el formato correcto.")
-        return None
-    
-    # Seleccionar columnas EN EL ORDEN CORRECTO
-    X = df_encoded[columnas_modelo_orden].copy()
+    perfil = Perfil()
+    claves_vistas = claves_previas(clave_archivo) if omitir_vistos else None
+    previas = claves_vistas.hashes if claves_vistas is not None else None
+    df_limpio = limpiar_datos_integrado(df, perfil, universidad, claves_vistas)
+    if claves_vistas is not None:
+        st.info(f"🔁 Leads comparados contra {len(previas):,} claves del dataset y de cargas anteriores")
+    df_procesado = crear_features_integrado(df_limpio, universidad, perfil)
+    claves_nuevas = claves_vistas.diferencia(previas) if claves_vistas is not None else None
+    return df_procesado, perfil.mediciones, claves_nuevas
+
+def generar_scores_integrado(df_procesado, mediciones_proceso, contexto):
+    """
+    Scores, orden por probabilidad y CSV de descarga (se cachean juntos)
     
-    return X
+    Returns: (df_sorted, csv, perfil) o None si faltan columnas
+    """
+    # La limpieza y las features se midieron al procesar (otra interacción)
+    perfil = Perfil(mediciones=mediciones_proceso)
+    
+    with st.spinner("🤖 Modelo trabajando..."):
+        # Cargar modelo
+        modelo, encoders = cargar_modelo()
+        
+        # Preparar datos
+        X = preparar_datos_prediccion_integrado(df_procesado, encoders, perfil)
+        if X is None:
+            return None
+        
+        # Predecir y agregar scores (sobre una copia: el procesado queda intacto en la caché)
+        df_scores = df_procesado.copy()
+        with perfil.medir('prediccion', filas=len(X)):
+            asignar_scores(df_scores, modelo.predict_proba(X)[:, 1])
+        
+        # Ordenar por probabilidad
+        df_sorted = df_scores.sort_values('Probabilidad_Matricula', ascending=False)
+        
+        with perfil.medir('exportacion', filas=len(df_sorted)):
+            csv = df_sorted.to_csv(index=False, encoding='utf-8-sig')
+    
+    universidades = df_sorted['universidad'].unique().tolist() if 'universidad' in df_sorted.columns else []
+    perfil.registrar_log(
+        modo='completo', **contexto,
+        universidad=universidades[0] if len(universidades) == 1 else universidades,
+        leads=len(df_sorted)
+    )
+    return df_sorted, csv, perfil
 
-def generar_visualizaciones_y_resultados(df):
+def generar_visualizaciones_y_resultados(df_sorted, csv):
     """Genera métricas, gráficos y tablas de resultados"""
+    # plotly se importa recién cuando hay resultados para graficar
+    import plotly.express as px
     
-    # Ordenar por probabilidad
-    df_sorted = df.sort_values('Probabilidad_Matricula', ascending=False)
+    df = df_sorted
     
     st.success("✅ Scores generados exitosamente!")
     
@@ -700,8 +378,6 @@ def generar_visualizaciones_y_resultados(df):
     st.markdown("---")
     st.markdown("### 💾 Descargar Resultados")
     
-    csv = df_sorted.to_csv(index=False, encoding='utf-8-sig')
-    
     st.download_button(
         label="📥 Descargar CSV con Scores",
         data=csv,
@@ -710,7 +386,174 @@ def generar_visualizaciones_y_resultados(df):
         use_container_width=True
     )
 
+def destino_lotes(clave_resultado):
+    """
+    CSV de salida del modo por lotes: uno solo por sesión, dentro de un
+    directorio temporal de la sesión (se borra cuando la sesión se descarta).
+    Cada corrida lo reescribe, así que se olvida el resultado anterior
+    """
+    directorio = st.session_state.get('directorio_lotes')
+    if directorio is None:
+        directorio = tempfile.TemporaryDirectory(prefix='smart_scoring_lotes_')
+        st.session_state['directorio_lotes'] = directorio
+    
+    anterior = st.session_state.get('clave_lotes')
+    if anterior is not None:
+        st.session_state.pop(anterior, None)
+    st.session_state['clave_lotes'] = clave_resultado
+    
+    return Path(directorio.name) / "leads_con_scores.csv"
+
+def generar_scores_por_lotes(uploaded_file, tamano_lote, universidad=None, omitir_vistos=False):
+    """Modo por lotes: limpieza, features y scores por partes, escritos directo a un CSV"""
+    
+    st.markdown("<p class='processing-badge'>⚡ Modo por lotes - Los scores se escriben a disco a medida que se calculan</p>", unsafe_allow_html=True)
+    
+    if not es_csv(uploaded_file):
+        st.warning("⚠️ Los archivos Excel no se pueden leer por partes: se cargan completos y luego se procesan por lotes. Para archivos muy grandes exportá el CRM como CSV.")
+    
+    try:
+        # Vista previa sin cargar el archivo completo
+        with st.expander("👁️ Vista Previa de Datos Originales"):
+            vista_previa = next(leer_por_lotes(uploaded_file, 5)) if es_csv(uploaded_file) else leer_excel_columnas(uploaded_file, solo_utiles=False, nrows=5)
+            st.dataframe(vista_previa, use_container_width=True)
+            uploaded_file.seek(0)
+        
+        clave_resultado = f"lotes_{hash_archivo_subido(uploaded_file)}_{universidad}_{tamano_lote}_{omitir_vistos}_{version_modelo()}"
+        
+        if st.button("🚀 GENERAR SCORES POR LOTES", use_container_width=True, type="primary"):
+            modelo, encoders = cargar_modelo()
+            
+            destino = destino_lotes(clave_resultado)
+            
+            estado = st.empty()
+            
+            def mostrar_avance(resumen):
+                estado.info(f"⚙️ Lote {resumen.lotes}: {resumen.total:,} leads con score")
+            
+            perfil = Perfil()
+            claves_vistas = claves_previas(hash_archivo_subido(uploaded_file)) if omitir_vistos else None
+            previas = claves_vistas.hashes if claves_vistas is not None else None
+            with st.spinner("🤖 Modelo trabajando por lotes..."):
+                uploaded_file.seek(0)
+                resumen = puntuar_por_lotes(
+                    uploaded_file, destino, modelo, encoders,
+                    tamano_lote=tamano_lote,
+                    universidad=universidad,
+                    al_procesar_lote=mostrar_avance,
+                    perfil=perfil,
+                    claves_vistas=claves_vistas
+                )
+            estado.empty()
+            # Recién con todos los lotes puntuados se registran los leads del archivo
+            if claves_vistas is not None:
+                registrar_carga(claves_vistas.diferencia(previas), hash_archivo_subido(uploaded_file))
+            
+            perfil.registrar_log(
+                modo='lotes', archivo=uploaded_file.name, universidad=universidad,
+                leads=resumen.total, lotes=resumen.lotes
+            )
+            st.session_state[clave_resultado] = (destino, resumen, perfil)
+        
+        if clave_resultado in st.session_state:
+            destino, resumen, perfil = st.session_state[clave_resultado]
+            mostrar_resultados_por_lotes(resumen, destino)
+            mostrar_rendimiento(perfil)
+    
+    except Exception as e:
+        st.error(f"❌ Error al procesar el archivo por lotes: {str(e)}")
+        st.info("💡 Asegurate de que el archivo esté en el formato correcto.")
+
+def mostrar_resultados_por_lotes(resumen, destino):
+    """Métricas, gráficos y descarga a partir del resumen acumulado del modo por lotes"""
+    import plotly.express as px
+    import plotly.graph_objects as go
+    
+    if resumen.total == 0:
+        st.warning("⚠️ No quedaron leads para puntuar después de la limpieza")
+        return
+    
+    st.success(f"✅ Scores generados exitosamente en {resumen.lotes} lotes!")
+    if resumen.duplicados:
+        st.warning(f"🗑️ {resumen.duplicados} duplicados eliminados (mismo email + programa)")
+    
+    st.markdown("## 📊 Resumen de Resultados")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Total Leads", f"{resumen.total:,}")
+    
+    with col2:
+        st.metric("Alto Potencial", f"{resumen.altos:,}", delta=f"{(resumen.altos/resumen.total*100):.1f}%")
+    
+    with col3:
+        st.metric("Score Promedio", f"{resumen.promedio:.1f}%")
+    
+    with col4:
+        st.metric("Score Máximo", f"{resumen.maximo:.1f}%")
+    
+    st.markdown("---")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### 📊 Distribución de Scores")
+        fig_hist = go.Figure(go.Bar(
+            x=(resumen.bordes[:-1] + resumen.bordes[1:]) / 2,
+            y=resumen.histograma,
+            marker_color='#00d9ff'
+        ))
+        fig_hist.update_layout(
+            template='plotly_dark',
+            xaxis_title="Probabilidad de Matrícula (%)",
+            yaxis_title="Cantidad de Leads",
+            bargap=0,
+            showlegend=False
+        )
+        st.plotly_chart(fig_hist, use_container_width=True)
+    
+    with col2:
+        st.markdown("### 🎯 Distribución por Categoría")
+        fig_pie = px.pie(
+            values=list(resumen.categorias.values()), names=list(resumen.categorias.keys()),
+            color_discrete_sequence=['#ff6b6b', '#feca57', '#48dbfb'],
+            template='plotly_dark'
+        )
+        st.plotly_chart(fig_pie, use_container_width=True)
+    
+    st.markdown("---")
+    st.markdown("### 🏆 Top 20 Leads con Mayor Probabilidad")
+    
+    columnas_mostrar = [
+        'dcontacto', 'Nombre y Apellido', 'TELTELEFONO', 
+        'Programa interes', 'Probabilidad_Matricula', 'Score_Categoria'
+    ]
+    columnas_disponibles = [col for col in columnas_mostrar if col in resumen.top.columns]
+    
+    st.dataframe(
+        resumen.top[columnas_disponibles],
+        use_container_width=True,
+        hide_index=True
+    )
+    
+    st.markdown("---")
+    st.markdown("### 💾 Descargar Resultados")
+    st.caption("En modo por lotes el CSV conserva el orden original del archivo.")
+    
+    with open(destino, 'rb') as f:
+        st.download_button(
+            label="📥 Descargar CSV con Scores",
+            data=f,
+            file_name="leads_con_scores.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
+
 def main():
+    # El modelo se carga en segundo plano mientras se dibuja la interfaz
+    precargar_modelo()
+    
     # Header con animacion
     st.markdown("<h1 style='text-align: center;'>🎓 Smart Scoring Grupo Nods</h1>", unsafe_allow_html=True)
     st.markdown("<p style='text-align: center; color: #00d9ff; font-size: 1.2rem;'>Sistema Automatizado de Lead Scoring Predictivo</p>", unsafe_allow_html=True)
@@ -732,12 +575,40 @@ def main():
             help="Seleccioná manualmente la universidad o dejá que el sistema la detecte automáticamente"
         )
         
-        # Guardar en session state
-        st.session_state['universidad_manual'] = universidad_manual
-        
+        # None = detección automática en el pipeline
+        universidad_seleccionada = None
         if universidad_manual != "Detección Automática":
+            universidad_seleccionada = universidad_manual
             st.info(f"✅ Universidad seleccionada: **{universidad_manual}**")
         
+        st.markdown("---")
+        st.markdown("### ⚡ Archivos Grandes")
+        
+        modo_lotes = st.toggle(
+            "Modo por lotes",
+            value=False,
+            help="Procesa el archivo por partes con memoria acotada y escribe los scores directo a un CSV. Recomendado para exportaciones de millones de filas."
+        )
+        
+        tamano_lote = TAMANO_LOTE_DEFAULT
+        if modo_lotes:
+            tamano_lote = int(st.number_input(
+                "Leads por lote",
+                min_value=1_000,
+                max_value=1_000_000,
+                value=TAMANO_LOTE_DEFAULT,
+                step=10_000
+            ))
+        
+        st.markdown("---")
+        st.markdown("### 🔁 Leads Repetidos")
+        
+        omitir_vistos = st.toggle(
+            "Omitir leads de cargas anteriores",
+            value=False,
+            help="Descarta los leads (mismo email + programa) que ya aparecieron en archivos subidos antes o en el dataset de entrenamiento, de cualquier universidad. Los leads nuevos se registran al generar los scores."
+        )
+        
         st.markdown("---")
         st.markdown("### 📊 Universidades Soportadas")
         st.markdown("""
@@ -781,13 +652,18 @@ def main():
             help="Archivo del CRM Neotel o CSV ya procesado"
         )
         
-        if uploaded_file is not None:
+        if uploaded_file is not None and modo_lotes:
+            generar_scores_por_lotes(uploaded_file, tamano_lote, universidad_seleccionada, omitir_vistos)
+        
+        elif uploaded_file is not None:
             # Cargar datos (detectar tipo de archivo)
             try:
-                if uploaded_file.name.endswith('.csv'):
-                    df = pd.read_csv(uploaded_file)
-                else:
-                    df = pd.read_excel(uploaded_file)
+                # Todo se cachea por contenido: los reruns no vuelven a parsear ni a procesar
+                clave_archivo = hash_archivo_subido(uploaded_file)
+                df = leer_archivo_subido(uploaded_file, clave_archivo)
+                
+                # Pasos pedidos por esta sesión (si se desalojaron de la caché, se recalculan)
+                pedidos = st.session_state.setdefault('pasos_pedidos', set())
                 
                 st.success(f"✅ Archivo cargado: {len(df)} leads")
                 
@@ -797,6 +673,10 @@ def main():
                 if tipo_archivo == 'procesado':
                     st.markdown("<p class='ready-badge'>✅ Archivo YA procesado - Listo para predecir</p>", unsafe_allow_html=True)
                     df_procesado = df
+                    mediciones_proceso = None
+                    claves_nuevas = None
+                    clave_procesado = ('archivo', clave_archivo, uploaded_file.name)
+                    clave_cache_procesado = clave_procesado
                     mostrar_predicciones = True
                     
                 elif tipo_archivo == 'crm_original':
@@ -806,22 +686,25 @@ def main():
                     with st.expander("👁️ Vista Previa de Datos Originales"):
                         st.dataframe(df.head(5), use_container_width=True)
                     
+                    clave_procesado = ('proceso', clave_archivo, universidad_seleccionada, omitir_vistos, cargar_config()['version'])
+                    
                     # Botón para procesar
                     if st.button("🔧 PROCESAR DATOS", use_container_width=True, type="primary"):
-                        # Procesar datos
-                        df_limpio = limpiar_datos_integrado(df)
-                        df_procesado = crear_features_integrado(df_limpio)
-                        
-                        # Guardar en session state
-                        st.session_state['df_procesado'] = df_procesado
-                        st.session_state['mostrar_predicciones'] = True
-                        st.rerun()
+                        pedidos.add(clave_procesado)
                     
                     mostrar_predicciones = False
                     
-                    # Si ya está en session state
-                    if 'df_procesado' in st.session_state and st.session_state.get('mostrar_predicciones', False):
-                        df_procesado = st.session_state['df_procesado']
+                    # Procesado para este archivo y esta universidad (de la caché o recién calculado)
+                    if clave_procesado in pedidos:
+                        # Omitiendo leads vistos el resultado depende del índice de duplicados:
+                        # su sello entra en la clave de caché (no en el pedido, que sigue en pie)
+                        clave_cache_procesado = (
+                            clave_procesado + (estado_previas(clave_archivo),) if omitir_vistos else clave_procesado
+                        )
+                        df_procesado, mediciones_proceso, claves_nuevas = cache_resultados().obtener_o_calcular(
+                            clave_cache_procesado,
+                            lambda: procesar_crm_integrado(df, clave_archivo, universidad_seleccionada, omitir_vistos)
+                        )
                         mostrar_predicciones = True
                         st.success("✅ Datos procesados correctamente!")
                     
@@ -837,28 +720,33 @@ def main():
                     with st.expander("👁️ Vista Previa de Datos Procesados"):
                         st.dataframe(df_procesado.head(10), use_container_width=True)
                     
+                    clave_scores = ('scores', clave_procesado, version_modelo())
+                    
                     if st.button("🚀 GENERAR SCORES", use_container_width=True, type="primary"):
-                        with st.spinner("🤖 Modelo trabajando..."):
-                            # Cargar modelo
-                            modelo, encoders = cargar_modelo()
+                        pedidos.add(clave_scores)
+                    
+                    if clave_scores in pedidos:
+                        contexto = {'archivo': uploaded_file.name, 'tipo_archivo': tipo_archivo}
+                        resultado = cache_resultados().obtener_o_calcular(
+                            ('scores', clave_cache_procesado, version_modelo()),
+                            lambda: generar_scores_integrado(df_procesado, mediciones_proceso, contexto)
+                        )
+                        
+                        if resultado is None:
+                            pedidos.discard(clave_scores)
+                        else:
+                            df_sorted, csv, perfil = resultado
                             
-                            # Preparar datos
-                            X = preparar_datos_prediccion(df_procesado, encoders)
+                            # Los leads del archivo se registran solo con los scores listos
+                            # (una vez por sesión; volver a registrarlos no cambia el índice)
+                            registrados = st.session_state.setdefault('cargas_registradas', set())
+                            if claves_nuevas is not None and clave_procesado not in registrados:
+                                registrar_carga(claves_nuevas, clave_archivo)
+                                registrados.add(clave_procesado)
                             
-                            if X is not None:
-                                # Predecir
-                                probabilidades = modelo.predict_proba(X)[:, 1]
-                                
-                                # Agregar scores
-                                df_procesado['Probabilidad_Matricula'] = (probabilidades * 100).round(2)
-                                df_procesado['Score_Categoria'] = pd.cut(
-                                    df_procesado['Probabilidad_Matricula'],
-                                    bins=[0, 30, 60, 100],
-                                    labels=['⭐ Bajo', '⭐⭐ Medio', '⭐⭐⭐ Alto']
-                                )
-                                
-                                # Generar visualizaciones
-                                generar_visualizaciones_y_resultados(df_procesado)
+                            # Generar visualizaciones
+                            generar_visualizaciones_y_resultados(df_sorted, csv)
+                            mostrar_rendimiento(perfil)
                 
             except Exception as e:
                 st.error(f"❌ Error al cargar el archivo: {str(e)}")
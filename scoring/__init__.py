@@ -0,0 +1,4 @@
+"""
+Smart Scoring - Núcleo compartido
+Módulos de procesamiento reutilizados por app.py y por los scripts batch
+"""
@@ -0,0 +1,263 @@
+"""
+Modelo Compacto - Smart Scoring
+Random Forest aplanado en arrays NumPy (.npz) y su evaluador sin scikit-learn
+
+El pickle del modelo (~2 MB) obliga a importar scikit-learn y a des-serializar
+100 objetos de árbol en cada arranque de la app o de un worker. Acá el bosque
+se exporta como arrays contiguos (un nodo por posición, todos los árboles
+concatenados) junto con las clases de los LabelEncoders, y se evalúa con NumPy.
+
+Formato (.npz sin comprimir, se abre con memory-map):
+- feature, umbral, izquierdo, derecho, faltante_izquierda: un valor por nodo.
+  Los hijos son índices globales; las hojas apuntan a sí mismas.
+- proba: probabilidad de cada clase por nodo (tree_.value)
+- raices, profundidades: nodo raíz y profundidad máxima de cada árbol
+- features: orden de columnas del entrenamiento
+- clases__<columna>: classes_ de cada LabelEncoder
+"""
+
+import zipfile
+
+import numpy as np
+
+VERSION_FORMATO = 1
+
+# Filas por lote del motor de inferencia: los buffers (filas × árboles) quedan en caché
+TAMANO_LOTE_INFERENCIA = 2048
+
+PREFIJO_CLASES = 'clases__'
+
+def aplanar_bosque(modelo):
+    """Convierte un RandomForestClassifier entrenado en el dict de arrays del formato"""
+    features, umbrales, izquierdos, derechos, faltantes, probas = [], [], [], [], [], []
+    raices, profundidades = [], []
+    desplazamiento = 0
+
+    for estimador in modelo.estimators_:
+        arbol = estimador.tree_
+        nodos = np.arange(arbol.node_count)
+        es_hoja = arbol.children_left == -1
+
+        # Las hojas apuntan a sí mismas: recorrer de más no cambia el resultado
+        izquierdo = np.where(es_hoja, nodos, arbol.children_left) + desplazamiento
+        derecho = np.where(es_hoja, nodos, arbol.children_right) + desplazamiento
+
+        features.append(np.where(es_hoja, 0, arbol.feature))
+        umbrales.append(arbol.threshold)
+        izquierdos.append(izquierdo)
+        derechos.append(derecho)
+        faltantes.append(arbol.missing_go_to_left.astype(bool))
+        # Desde scikit-learn 1.4 tree_.value ya guarda fracciones por clase,
+        # que es exactamente lo que devuelve DecisionTreeClassifier.predict_proba
+        probas.append(arbol.value[:, 0, :])
+        raices.append(desplazamiento)
+        profundidades.append(arbol.max_depth)
+        desplazamiento += arbol.node_count
+
+    return {
+        'version': np.array(VERSION_FORMATO),
+        'feature': np.concatenate(features).astype(np.int32),
+        'umbral': np.concatenate(umbrales).astype(np.float64),
+        'izquierdo': np.concatenate(izquierdos).astype(np.int32),
+        'derecho': np.concatenate(derechos).astype(np.int32),
+        'faltante_izquierda': np.concatenate(faltantes),
+        'proba': np.concatenate(probas).astype(np.float64),
+        'raices': np.array(raices, dtype=np.int32),
+        'profundidades': np.array(profundidades, dtype=np.int32),
+        'features': np.array(getattr(modelo, 'feature_names_in_', []), dtype=str),
+    }
+
+def exportar_bosque(modelo, encoders, ruta):
+    """
+    Guarda el modelo y las clases de los encoders en un .npz sin comprimir
+
+    Args:
+        modelo: RandomForestClassifier entrenado
+        encoders: dict columna → LabelEncoder
+        ruta: destino (.npz)
+    """
+    arrays = aplanar_bosque(modelo)
+    for columna, encoder in encoders.items():
+        arrays[PREFIJO_CLASES + columna] = np.asarray(encoder.classes_, dtype=str)
+
+    # np.savez no comprime: cada array queda contiguo dentro del zip
+    np.savez(ruta, **arrays)
+    return ruta
+
+def _abrir_npz_mapeado(ruta):
+    """
+    Abre cada array del .npz con np.memmap (solo lectura)
+    np.load ignora mmap_mode para .npz, así que se ubica el .npy dentro del zip
+    """
+    arrays = {}
+    with zipfile.ZipFile(ruta) as zf, open(ruta, 'rb') as f:
+        for info in zf.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{info.filename} está comprimido y no se puede mapear")
+
+            # Encabezado local del zip: 30 bytes fijos + nombre + campo extra
+            f.seek(info.header_offset + 26)
+            largo_nombre, largo_extra = np.frombuffer(f.read(4), dtype='<u2')
+            f.seek(info.header_offset + 30 + int(largo_nombre) + int(largo_extra))
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+            nombre = info.filename[:-len('.npy')]
+
+            if dtype.hasobject:
+                raise ValueError(f"{nombre} contiene objetos Python (no soportado)")
+            if 0 in shape:
+                arrays[nombre] = np.empty(shape, dtype=dtype)
+            else:
+                arrays[nombre] = np.memmap(
+                    ruta, dtype=dtype, mode='r', offset=f.tell(),
+                    shape=shape, order='F' if fortran else 'C'
+                )
+    return arrays
+
+class BosqueCompacto:
+    """
+    Motor de inferencia NumPy del bosque exportado (misma interfaz que predict_proba)
+
+    Evalúa todos los árboles a la vez, nivel por nivel, sobre lotes de filas:
+    unas pocas operaciones vectorizadas por nivel en lugar del recorrido
+    genérico de scikit-learn con su validación por llamada.
+    """
+
+    def __init__(self, arrays):
+        if int(arrays['version']) != VERSION_FORMATO:
+            raise ValueError(f"Versión de modelo compacto no soportada: {int(arrays['version'])}")
+
+        # np.asarray quita la subclase memmap (sigue apuntando al archivo)
+        self.feature = np.asarray(arrays['feature'])
+        self.umbral = np.asarray(arrays['umbral'])
+        self.izquierdo = np.asarray(arrays['izquierdo'])
+        self.derecho = np.asarray(arrays['derecho'])
+        self.faltante_izquierda = np.asarray(arrays['faltante_izquierda'])
+        self.proba = np.asarray(arrays['proba'])
+        self.raices = np.asarray(arrays['raices'])
+        self.profundidades = np.asarray(arrays['profundidades'])
+        self.feature_names_in_ = np.asarray(arrays['features'])
+        self.clases = {
+            nombre[len(PREFIJO_CLASES):]: np.asarray(valores, dtype=object)
+            for nombre, valores in arrays.items() if nombre.startswith(PREFIJO_CLASES)
+        }
+        self.classes_ = np.arange(self.proba.shape[1])
+        self._compilar()
+
+    def _compilar(self):
+        """
+        Arrays de trabajo del motor de inferencia (se arman una vez al cargar)
+
+        - _hijos: [derecho, izquierdo] intercalados, así el siguiente nodo es
+          _hijos[2*nodo + va_izquierda] (un solo take por nivel)
+        - _umbral: umbrales en float32 redondeados hacia abajo. Para x float32,
+          x <= t (float64) equivale exactamente a x <= mayor_float32_<=_t, y la
+          comparación float32/float32 mueve la mitad de memoria
+        - índices en intp: take() no tiene que convertirlos en cada nivel
+        """
+        self._feature = self.feature.astype(np.intp)
+        self._hijos = np.column_stack([self.derecho, self.izquierdo]).ravel().astype(np.intp)
+        self._raices = self.raices.astype(np.intp)
+        self._profundidad = int(self.profundidades.max(initial=0))
+
+        umbral32 = self.umbral.astype(np.float32)
+        redondeado_arriba = umbral32.astype(np.float64) > self.umbral
+        self._umbral = np.where(
+            redondeado_arriba, np.nextafter(umbral32, np.float32(-np.inf)), umbral32
+        ).astype(np.float32)
+
+        # Una fila por clase para sumar cada clase con takes contiguos
+        self._proba_clase = np.ascontiguousarray(self.proba.T)
+
+    @classmethod
+    def cargar(cls, ruta, mmap=True):
+        """Abre el .npz exportado (memory-map por defecto: arranque casi instantáneo)"""
+        if mmap:
+            return cls(_abrir_npz_mapeado(ruta))
+        with np.load(ruta, allow_pickle=False) as npz:
+            return cls(dict(npz))
+
+    @property
+    def n_arboles(self):
+        return len(self.raices)
+
+    def _recorrer(self, X, nodos, buffers):
+        """
+        Baja todas las filas por todos los árboles a la vez, nivel por nivel
+
+        nodos: (filas, árboles) con la raíz de cada árbol; se actualiza in-place
+        hasta quedar en las hojas (las hojas apuntan a sí mismas, así que los
+        árboles menos profundos simplemente se quedan quietos)
+        """
+        n_filas, n_features = X.shape
+        indices, valores, umbrales, va_izquierda = buffers
+        # Posición de cada fila en X aplanado: X.ravel()[inicio_fila + feature]
+        inicio_fila = (np.arange(n_filas, dtype=np.intp) * n_features)[:, np.newaxis]
+        valores_x = X.ravel()
+        hay_nulos = np.isnan(valores_x).any()
+
+        for _ in range(self._profundidad):
+            self._feature.take(nodos, out=indices)
+            indices += inicio_fila
+            valores_x.take(indices, out=valores)
+            self._umbral.take(nodos, out=umbrales)
+            np.less_equal(valores, umbrales, out=va_izquierda)
+            if hay_nulos:
+                va_izquierda |= np.isnan(valores) & self.faltante_izquierda.take(nodos)
+            nodos *= 2
+            nodos += va_izquierda
+            self._hijos.take(nodos, out=nodos)
+
+        return nodos
+
+    def _lotes(self, X, tamano_lote):
+        """Itera (inicio, fin, nodos) con buffers reutilizados entre lotes"""
+        forma = (min(len(X), tamano_lote), self.n_arboles)
+        nodos = np.empty(forma, dtype=np.intp)
+        buffers = (
+            np.empty(forma, dtype=np.intp),
+            np.empty(forma, dtype=np.float32),
+            np.empty(forma, dtype=np.float32),
+            np.empty(forma, dtype=bool),
+        )
+
+        for inicio in range(0, len(X), tamano_lote):
+            fin = min(len(X), inicio + tamano_lote)
+            n = fin - inicio
+            nodos_lote = nodos[:n]
+            nodos_lote[...] = self._raices
+            self._recorrer(X[inicio:fin], nodos_lote, tuple(b[:n] for b in buffers))
+            yield inicio, fin, nodos_lote
+
+    def aplicar(self, X, tamano_lote=TAMANO_LOTE_INFERENCIA):
+        """Hoja (índice global) de cada fila en cada árbol: (n_filas, n_arboles)"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        hojas = np.empty((len(X), self.n_arboles), dtype=np.intp)
+        for inicio, fin, nodos in self._lotes(X, tamano_lote):
+            hojas[inicio:fin] = nodos
+        return hojas
+
+    def predict_proba(self, X, tamano_lote=TAMANO_LOTE_INFERENCIA):
+        """
+        Probabilidades (n_filas, n_clases); bit a bit iguales a
+        RandomForestClassifier.predict_proba: mismas hojas, suma árbol por árbol
+        en float64 (en el orden de estimators_) y división final por la
+        cantidad de árboles
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        proba = np.zeros((len(X), len(self.classes_)), dtype=np.float64)
+
+        for inicio, fin, nodos in self._lotes(X, tamano_lote):
+            for clase, proba_nodo in enumerate(self._proba_clase):
+                proba_hojas = proba_nodo.take(nodos)
+                acumulado = proba[inicio:fin, clase]
+                # Suma secuencial (no np.sum, que suma por pares y cambia el redondeo)
+                for arbol in range(self.n_arboles):
+                    acumulado += proba_hojas[:, arbol]
+
+        proba /= self.n_arboles
+        return proba
@@ -0,0 +1,223 @@
+"""
+Búsqueda de Hiperparámetros - Smart Scoring
+Validación cruzada estratificada de varias configuraciones en paralelo
+
+Se evalúan Random Forest de distintos tamaños y profundidades y un
+HistGradientBoosting (con las categóricas codificadas como categóricas
+nativas). Cada tarea es una configuración × un fold y se reparte en un pool
+de procesos (un núcleo por tarea; las más caras primero).
+
+La matriz codificada, el target y la asignación de folds se copian UNA vez a
+memoria compartida (multiprocessing.shared_memory): cada worker la adjunta al
+arrancar y las tareas solo viajan como (configuración, fold), en lugar de
+pickle-ar la matriz en cada tarea.
+
+La búsqueda solo ve el conjunto de entrenamiento: el test queda para la
+evaluación final del mejor modelo.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+from threadpoolctl import threadpool_limits
+
+FOLDS_DEFAULT = 5
+
+# Parámetros fijos del Random Forest original (hojas mínimas y balanceo)
+PARAMETROS_BOSQUE = {
+    'min_samples_split': 20,
+    'min_samples_leaf': 10,
+    'class_weight': 'balanced',
+}
+
+# Grilla: tamaño y profundidad del bosque + alternativa de gradient boosting
+CONFIGURACIONES = (
+    [
+        ('random_forest', {'n_estimators': arboles, 'max_depth': profundidad})
+        for arboles in (100, 300)
+        for profundidad in (8, 10, 14, None)
+    ]
+    + [
+        ('hist_gradient_boosting', {'learning_rate': tasa, 'max_leaf_nodes': hojas})
+        for tasa in (0.05, 0.1)
+        for hojas in (15, 31)
+    ]
+)
+
+# Máximo de categorías que HistGradientBoosting acepta como categóricas nativas
+MAX_CATEGORIAS_NATIVAS = 255
+
+# Arrays compartidos adjuntados en cada worker (ver _inicializar_worker)
+_DATOS = None
+_MEMORIAS = []
+
+def nombre_configuracion(tipo, parametros):
+    """Nombre legible: 'random_forest(n_estimators=100, max_depth=8)'"""
+    return f"{tipo}({', '.join(f'{clave}={valor}' for clave, valor in parametros.items())})"
+
+def crear_estimador(tipo, parametros, categoricas=None, n_jobs=1, random_state=42):
+    """
+    Estimador sin entrenar para una configuración de la grilla
+
+    Args:
+        categoricas: máscara booleana de columnas categóricas (solo la usa
+            HistGradientBoosting)
+        n_jobs: núcleos del Random Forest (1 dentro del pool)
+    """
+    if tipo == 'random_forest':
+        return RandomForestClassifier(
+            **parametros, **PARAMETROS_BOSQUE, random_state=random_state, n_jobs=n_jobs
+        )
+    if tipo == 'hist_gradient_boosting':
+        return HistGradientBoostingClassifier(
+            **parametros,
+            max_iter=500,
+            early_stopping=True,
+            categorical_features=categoricas if categoricas is not None and categoricas.any() else None,
+            class_weight='balanced',
+            random_state=random_state
+        )
+    raise ValueError(f"Tipo de modelo desconocido: {tipo}")
+
+def columnas_categoricas_nativas(X, codificadas):
+    """Máscara de las columnas codificadas con pocas categorías (aptas para HGB)"""
+    return np.array([
+        columna in codificadas and X[columna].max() < MAX_CATEGORIAS_NATIVAS
+        for columna in X.columns
+    ])
+
+def asignar_folds(y, folds=FOLDS_DEFAULT, random_state=42):
+    """Fold de test de cada fila (StratifiedKFold), como int8"""
+    asignacion = np.empty(len(y), dtype=np.int8)
+    divisor = StratifiedKFold(n_splits=folds, shuffle=True, random_state=random_state)
+    for fold, (_, test) in enumerate(divisor.split(np.zeros(len(y)), y)):
+        asignacion[test] = fold
+    return asignacion
+
+def _costo_estimado(configuracion):
+    """Orden de las tareas: los bosques grandes y profundos primero"""
+    tipo, parametros = configuracion
+    if tipo == 'random_forest':
+        return parametros['n_estimators'] * (parametros['max_depth'] or 30)
+    return 1000
+
+class MatricesCompartidas:
+    """Copia arrays a bloques de memoria compartida y los libera al salir"""
+
+    def __init__(self, **arrays):
+        self.memorias = []
+        self.especificacion = {}
+        for nombre, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            memoria = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=memoria.buf)[...] = array
+            self.memorias.append(memoria)
+            self.especificacion[nombre] = (memoria.name, array.shape, array.dtype.str)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        for memoria in self.memorias:
+            memoria.close()
+            memoria.unlink()
+
+def _inicializar_worker(especificacion, categoricas):
+    """Adjunta los arrays compartidos (sin copiarlos) y limita cada worker a un hilo"""
+    global _DATOS
+    _DATOS = {'categoricas': categoricas}
+    for nombre, (memoria_nombre, forma, tipo) in especificacion.items():
+        memoria = shared_memory.SharedMemory(name=memoria_nombre)
+        _MEMORIAS.append(memoria)
+        _DATOS[nombre] = np.ndarray(forma, dtype=tipo, buffer=memoria.buf)
+    # El pool ya reparte los núcleos: sin hilos de OpenMP/BLAS anidados
+    threadpool_limits(1)
+
+def evaluar_tarea(tarea):
+    """
+    Entrena una configuración en los folds de train y mide AUC en el de test
+
+    Returns: (indice_configuracion, fold, auc, segundos)
+    """
+    indice, fold = tarea
+    tipo, parametros = CONFIGURACIONES[indice]
+    X, y, asignacion = _DATOS['X'], _DATOS['y'], _DATOS['folds']
+    test = asignacion == fold
+
+    inicio = time.perf_counter()
+    estimador = crear_estimador(tipo, parametros, _DATOS['categoricas'])
+    estimador.fit(X[~test], y[~test])
+    auc = roc_auc_score(y[test], estimador.predict_proba(X[test])[:, 1])
+    return indice, fold, float(auc), time.perf_counter() - inicio
+
+def buscar_hiperparametros(X, y, categoricas=None, folds=FOLDS_DEFAULT, workers=None):
+    """
+    Validación cruzada de todas las CONFIGURACIONES
+
+    Args:
+        X: matriz codificada (DataFrame o array numérico)
+        y: target binario
+        categoricas: máscara de columnas categóricas para HistGradientBoosting
+        folds: folds de StratifiedKFold
+        workers: procesos del pool (None = todos los núcleos; 1 = secuencial)
+
+    Returns:
+        dict con 'resultados' (uno por configuración, ordenados por AUC media
+        descendente: tipo, parametros, nombre, auc_media, auc_std,
+        auc_por_fold, segundos_por_fold, segundos_total), 'folds', 'workers'
+        y 'segundos' (tiempo de pared)
+    """
+    global _DATOS
+    workers = workers or os.cpu_count() or 1
+    matriz = np.asarray(X, dtype=np.float32)
+    objetivo = np.asarray(y, dtype=np.int8)
+    asignacion = asignar_folds(objetivo, folds)
+
+    tareas = sorted(
+        ((indice, fold) for indice in range(len(CONFIGURACIONES)) for fold in range(folds)),
+        key=lambda tarea: -_costo_estimado(CONFIGURACIONES[tarea[0]])
+    )
+
+    inicio = time.perf_counter()
+    if workers <= 1:
+        # En el mismo proceso no hace falta memoria compartida
+        _DATOS = {'X': matriz, 'y': objetivo, 'folds': asignacion, 'categoricas': categoricas}
+        salidas = [evaluar_tarea(tarea) for tarea in tareas]
+    else:
+        with MatricesCompartidas(X=matriz, y=objetivo, folds=asignacion) as compartidas:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_inicializar_worker,
+                initargs=(compartidas.especificacion, categoricas)
+            ) as pool:
+                salidas = list(pool.map(evaluar_tarea, tareas))
+    segundos = time.perf_counter() - inicio
+
+    aucs = np.zeros((len(CONFIGURACIONES), folds))
+    tiempos = np.zeros((len(CONFIGURACIONES), folds))
+    for indice, fold, auc, duracion in salidas:
+        aucs[indice, fold] = auc
+        tiempos[indice, fold] = duracion
+
+    resultados = [
+        {
+            'tipo': tipo,
+            'parametros': parametros,
+            'nombre': nombre_configuracion(tipo, parametros),
+            'auc_media': float(aucs[indice].mean()),
+            'auc_std': float(aucs[indice].std()),
+            'auc_por_fold': aucs[indice].tolist(),
+            'segundos_por_fold': tiempos[indice].tolist(),
+            'segundos_total': float(tiempos[indice].sum()),
+        }
+        for indice, (tipo, parametros) in enumerate(CONFIGURACIONES)
+    ]
+    resultados.sort(key=lambda resultado: -resultado['auc_media'])
+
+    return {'resultados': resultados, 'folds': folds, 'workers': workers, 'segundos': segundos}
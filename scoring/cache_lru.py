@@ -0,0 +1,92 @@
+"""
+Caché LRU en Memoria - Smart Scoring
+Resultados de la app (archivo parseado, procesado, con scores) por clave
+
+Streamlit re-ejecuta el script en cada interacción: sin caché, cada clic
+vuelve a parsear el Excel y a recalcular todo. Las claves incluyen el hash del
+contenido subido y las versiones de config/modelo, así que un archivo distinto
+(o un modelo re-entrenado) nunca reutiliza resultados viejos.
+
+La memoria está acotada: al superar max_mb o max_entradas se descartan las
+entradas usadas hace más tiempo. Los valores guardados se comparten entre
+sesiones y no se deben modificar in-place.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+MB = 1024 * 1024
+
+def estimar_mb(valor):
+    """Memoria aproximada de un valor cacheado (DataFrames con el contenido de los textos)"""
+    if isinstance(valor, pd.DataFrame):
+        return valor.memory_usage(index=True, deep=True).sum() / MB
+    if isinstance(valor, (tuple, list)):
+        return sum(estimar_mb(v) for v in valor)
+    return sys.getsizeof(valor) / MB
+
+class CacheLRU:
+    """Diccionario acotado por memoria y cantidad, con desalojo LRU (thread-safe)"""
+
+    def __init__(self, max_mb=1024, max_entradas=16):
+        self.max_mb = max_mb
+        self.max_entradas = max_entradas
+        self._entradas = OrderedDict()  # clave → (valor, mb)
+        self._lock = threading.Lock()
+        self.mb = 0.0
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __contains__(self, clave):
+        with self._lock:
+            return clave in self._entradas
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def obtener(self, clave, default=None):
+        """Valor guardado (y lo marca como usado recientemente)"""
+        with self._lock:
+            if clave not in self._entradas:
+                self.fallos += 1
+                return default
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return self._entradas[clave][0]
+
+    def guardar(self, clave, valor):
+        """Guarda el valor y desaloja lo menos usado si se pasa de los límites"""
+        mb = estimar_mb(valor)
+        with self._lock:
+            if clave in self._entradas:
+                self.mb -= self._entradas.pop(clave)[1]
+            self._entradas[clave] = (valor, mb)
+            self.mb += mb
+
+            # La entrada recién guardada se conserva aunque sola supere max_mb
+            while len(self._entradas) > 1 and (
+                self.mb > self.max_mb or len(self._entradas) > self.max_entradas
+            ):
+                _, (_, mb_desalojado) = self._entradas.popitem(last=False)
+                self.mb -= mb_desalojado
+        return valor
+
+    def obtener_o_calcular(self, clave, calcular):
+        """
+        Valor cacheado o, si no está, el resultado de calcular() (que se guarda)
+        Un resultado None no se guarda: se vuelve a calcular la próxima vez
+        """
+        valor = self.obtener(clave)
+        if valor is None:
+            valor = calcular()
+            if valor is not None:
+                self.guardar(clave, valor)
+        return valor
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+            self.mb = 0.0
@@ -0,0 +1,71 @@
+"""
+Categorizador Compilado - Smart Scoring
+Clasifica columnas de texto según las reglas de 'category_rules' del config
+
+Cada tabla de reglas (patrón → categoría, en orden de prioridad) se compila en
+una única regex y cada valor distinto de la columna se clasifica una sola vez:
+la columna se factoriza y los códigos se mapean de vuelta con np.take.
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .config import cargar_config
+
+class CategorizadorCompilado:
+    """Tabla de reglas ordenada compilada en una sola expresión regular"""
+
+    def __init__(self, columna, reglas, default, case='upper'):
+        self.columna = columna
+        self.default = default
+        self.case = case
+        self.categorias = [regla['category'] for regla in reglas]
+
+        # Una alternativa anclada por regla, cada una con un lookahead sobre
+        # todo el texto: la alternancia se prueba en orden, así que la primera
+        # regla que coincide gana (mismo criterio que un if/elif).
+        alternativas = [
+            f"(?=.*(?:{'|'.join(re.escape(p) for p in regla['patterns'])}))(?P<r{i}>)"
+            for i, regla in enumerate(reglas)
+        ]
+        self.patron = re.compile('|'.join(alternativas), re.DOTALL) if alternativas else None
+
+    @classmethod
+    def desde_config(cls, definicion):
+        return cls(
+            columna=definicion['source_column'],
+            reglas=definicion['rules'],
+            default=definicion['default'],
+            case=definicion.get('case', 'upper')
+        )
+
+    def clasificar(self, valor):
+        """Clasifica un único valor (mismo tratamiento que str(valor))"""
+        texto = str(valor)
+        texto = texto.upper() if self.case == 'upper' else texto.lower()
+
+        match = self.patron.match(texto) if self.patron is not None else None
+        if match is None:
+            return self.default
+        return self.categorias[int(match.lastgroup[1:])]
+
+    def categorizar(self, serie):
+        """Categoriza una columna completa clasificando solo sus valores distintos"""
+        codigos, unicos = pd.factorize(serie, use_na_sentinel=False)
+        etiquetas = np.array([self.clasificar(valor) for valor in unicos], dtype=object)
+        return np.take(etiquetas, codigos)
+
+@lru_cache(maxsize=None)
+def cargar_categorizadores():
+    """
+    Compila las tablas de 'category_rules' (una vez por proceso)
+    Returns: dict columna_destino -> CategorizadorCompilado
+    """
+    reglas = cargar_config()['category_rules']
+    return {
+        destino: CategorizadorCompilado.desde_config(definicion)
+        for destino, definicion in reglas.items()
+    }
@@ -0,0 +1,17 @@
+"""
+Configuración de Normalización - Smart Scoring
+Carga única de config/normalization_config.json compartida por app y scripts
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+CONFIG_PATH = BASE_DIR / "config" / "normalization_config.json"
+
+@lru_cache(maxsize=None)
+def cargar_config(ruta=CONFIG_PATH):
+    """Lee la configuración de normalización (se parsea una sola vez por proceso)"""
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,184 @@
+"""
+Dataset Multi-Universidad - Smart Scoring
+Lectura/escritura del dataset normalizado en formato columnar (Parquet)
+
+prepare_multi_university_data.py guarda cada dataset en Parquet (con tipos
+reales: categóricas y fechas) además del CSV. Los scripts downstream leen el
+Parquet con proyección de columnas y solo caen al CSV si el Parquet no existe.
+
+Con --particionado el dataset se escribe por partes en un directorio
+data/<nombre>/universidad=<U>/mes=<AAAA-MM>/ (mes de 'Fecha insert Lead').
+cargar_dataset lee ese directorio como un único DataFrame, unificando los
+esquemas de las partes (columnas que faltan en alguna universidad → nulos).
+"""
+
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from .config import BASE_DIR, cargar_config
+from .features import COLUMNAS_CATEGORICAS
+
+DATA_DIR = BASE_DIR / "data"
+
+DATASET_LIMPIOS = "datos_multi_universidad_limpios"
+DATASET_FEATURES = "datos_multi_universidad_features"
+
+# Particiones del dataset particionado (directorios hive universidad=/mes=)
+COLUMNAS_PARTICION = ['universidad', 'mes']
+COLUMNA_FECHA_PARTICION = 'Fecha insert Lead'
+MES_SIN_FECHA = 'sin_fecha'
+
+def ruta_dataset(nombre, formato='parquet'):
+    """Ruta del dataset en data/ para el formato indicado ('parquet' o 'csv')"""
+    return DATA_DIR / f"{nombre}.{formato}"
+
+def ruta_particionado(nombre):
+    """Directorio del dataset particionado en data/"""
+    return DATA_DIR / nombre
+
+def existe_dataset(nombre):
+    """True si el dataset existe particionado, en Parquet o en CSV"""
+    return (
+        ruta_particionado(nombre).is_dir()
+        or ruta_dataset(nombre).exists()
+        or ruta_dataset(nombre, 'csv').exists()
+    )
+
+def _columnas_fecha():
+    """Columnas declaradas como datetime en 'data_types' del config"""
+    return [
+        col for col, tipo in cargar_config()['data_types'].items()
+        if tipo.startswith('datetime64')
+    ]
+
+def tipar_dataset(df):
+    """
+    Devuelve una copia superficial (solo se copian las columnas que cambian
+    de tipo) con tipos columnares:
+    - universidad y categorías de features → category
+    - columnas de fecha del config → datetime64
+    - columnas de texto con tipos mezclados → str (Parquet exige un tipo por columna)
+    """
+    df_tipado = df.copy(deep=False)
+
+    for col in COLUMNAS_CATEGORICAS:
+        if col in df_tipado.columns:
+            df_tipado[col] = df_tipado[col].astype('category')
+
+    for col in _columnas_fecha():
+        if col in df_tipado.columns and not pd.api.types.is_datetime64_any_dtype(df_tipado[col]):
+            df_tipado[col] = pd.to_datetime(df_tipado[col], errors='coerce')
+
+    for col in df_tipado.columns[df_tipado.dtypes == object]:
+        if pd.api.types.infer_dtype(df_tipado[col], skipna=True) not in ('string', 'empty'):
+            valores = df_tipado[col]
+            df_tipado[col] = valores.where(valores.isna(), valores.astype(str))
+
+    return df_tipado
+
+def guardar_dataset(df, nombre, csv=True):
+    """
+    Guarda el dataset en Parquet (y opcionalmente en CSV para uso manual)
+    Returns: lista de rutas escritas
+    """
+    ruta_parquet = ruta_dataset(nombre)
+    tipar_dataset(df).to_parquet(ruta_parquet, index=False)
+    rutas = [ruta_parquet]
+
+    # Un particionado anterior taparía al archivo nuevo en cargar_dataset
+    shutil.rmtree(ruta_particionado(nombre), ignore_errors=True)
+
+    if csv:
+        ruta_csv = ruta_dataset(nombre, 'csv')
+        df.to_csv(ruta_csv, index=False, encoding='utf-8-sig')
+        rutas.append(ruta_csv)
+
+    return rutas
+
+def iniciar_particionado(nombre):
+    """Borra el particionado anterior y las versiones en archivo único del dataset"""
+    shutil.rmtree(ruta_particionado(nombre), ignore_errors=True)
+    for formato in ('parquet', 'csv'):
+        ruta_dataset(nombre, formato).unlink(missing_ok=True)
+
+def mes_particion(fechas):
+    """'AAAA-MM' de cada fecha ('sin_fecha' para las nulas)"""
+    fechas = pd.to_datetime(fechas, errors='coerce')
+    return fechas.dt.strftime('%Y-%m').fillna(MES_SIN_FECHA)
+
+def agregar_particion(df, nombre):
+    """
+    Agrega las filas de df al dataset particionado (una parte por universidad/mes)
+    Cada llamada escribe archivos nuevos: no se relee nada de lo ya escrito
+    Returns: cantidad de particiones universidad/mes escritas
+    """
+    df_tipado = tipar_dataset(df)
+    if COLUMNA_FECHA_PARTICION in df_tipado.columns:
+        df_tipado['mes'] = mes_particion(df_tipado[COLUMNA_FECHA_PARTICION])
+    else:
+        df_tipado['mes'] = MES_SIN_FECHA
+    # Solo las universidades presentes (no las categorías vacías de la categórica)
+    df_tipado['universidad'] = df_tipado['universidad'].astype(str)
+
+    df_tipado.to_parquet(ruta_particionado(nombre), partition_cols=COLUMNAS_PARTICION, index=False)
+    return int(df_tipado.groupby(COLUMNAS_PARTICION, sort=False).ngroups)
+
+def _tipo_plano(tipo):
+    """Tipo Arrow sin diccionario (las categóricas de cada parte tienen categorías distintas)"""
+    return tipo.value_type if pa.types.is_dictionary(tipo) else tipo
+
+def _cargar_particionado(nombre, columnas=None):
+    """
+    Lee el dataset particionado como un DataFrame
+    Los esquemas de las partes se unifican (int8 + float32 → float, columnas
+    ausentes → nulos); las columnas categóricas en alguna parte vuelven como
+    categóricas. Las filas quedan agrupadas por universidad y mes.
+    """
+    particionado = ds.dataset(ruta_particionado(nombre), format='parquet', partitioning='hive')
+    esquemas = [fragmento.physical_schema for fragmento in particionado.get_fragments()]
+    esquema = pa.unify_schemas(
+        [pa.schema([pa.field(campo.name, _tipo_plano(campo.type)) for campo in esquema_parte])
+         for esquema_parte in esquemas]
+        + [particionado.partitioning.schema],
+        promote_options='permissive'
+    ).remove_metadata()
+
+    if columnas is None:
+        columnas = [columna for columna in esquema.names if columna != 'mes']
+    tabla = ds.dataset(
+        ruta_particionado(nombre), format='parquet', partitioning='hive', schema=esquema
+    ).to_table(columns=columnas)
+    df = tabla.to_pandas()
+
+    categoricas = {'universidad'} | {
+        campo.name for esquema_parte in esquemas for campo in esquema_parte
+        if pa.types.is_dictionary(campo.type)
+    }
+    for columna in df.columns.intersection(list(categoricas)):
+        df[columna] = df[columna].astype('category')
+    return df
+
+def cargar_dataset(nombre, columnas=None):
+    """
+    Carga el dataset leyendo solo las columnas pedidas
+
+    Args:
+        nombre: DATASET_LIMPIOS o DATASET_FEATURES
+        columnas: lista de columnas a cargar (None = todas)
+    """
+    if ruta_particionado(nombre).is_dir():
+        return _cargar_particionado(nombre, columnas)
+
+    ruta_parquet = ruta_dataset(nombre)
+    if ruta_parquet.exists():
+        return pd.read_parquet(ruta_parquet, columns=columnas)
+
+    ruta_csv = ruta_dataset(nombre, 'csv')
+    if not ruta_csv.exists():
+        raise FileNotFoundError(
+            f"No se encontró {ruta_parquet.name} ni {ruta_csv.name} en {DATA_DIR}"
+        )
+    return pd.read_csv(ruta_csv, usecols=columnas, low_memory=False)
@@ -0,0 +1,265 @@
+"""
+Índice de Duplicados - Smart Scoring
+Claves de lead (email + programa, opcionalmente teléfono) como hashes de 64 bits
+
+Las columnas de la clave salen de 'duplicate_keys' del config. Cada una se
+normaliza (email sin espacios y en minúsculas, programa como lo deja la
+limpieza, teléfono solo dígitos) y se reduce a un hash uint64 con
+pd.util.hash_array, que usa una clave fija: el mismo valor da el mismo hash en
+todas las corridas. Cada valor distinto se normaliza una sola vez.
+
+Las claves vistas se guardan en un array uint64 ordenado (8 bytes por lead):
+buscar n claves cuesta O(n log N) con searchsorted y agregarlas es intercalar
+dos tramos ordenados. En data/cache/duplicados/ se guardan dos índices:
+
+- dataset_indice_*.npy (IndiceDuplicados): las claves del dataset de
+  entrenamiento; cada preparación lo reconstruye desde cero.
+- cargas_indice_*.npz (IndiceCargas): las claves de los archivos subidos a la
+  app, cada una con el hash del archivo que la registró. Al reprocesar ese
+  mismo archivo sus propias claves no cuentan como vistas, así que el
+  resultado no depende de si ya se había registrado antes.
+
+claves_previas() une los dos para reconocer leads de cargas anteriores, de
+cualquier universidad, sin releer el historial.
+
+La probabilidad de que dos claves distintas colisionen es del orden de
+n²/2^65 (menos de 1 en 10^7 con un millón de leads).
+"""
+
+import hashlib
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .config import cargar_config
+from .dataset import DATA_DIR
+
+CACHE_DIR = DATA_DIR / "cache" / "duplicados"
+
+# Subirla si cambia la normalización: los hashes guardados dejan de servir
+VERSION_CLAVE = 1
+
+# Mezcla de los hashes de cada columna (FNV-1a de 64 bits)
+PRIMO_FNV = np.uint64(0x100000001B3)
+
+def _normalizar_email(valores):
+    return valores.astype(str).str.strip().str.casefold()
+
+def _normalizar_programa(valores):
+    return valores.fillna('NO ESPECIFICADO').astype(str).str.strip().str.upper()
+
+def _normalizar_telefono(valores):
+    # Los teléfonos numéricos llegan como float (3001234567.0)
+    if pd.api.types.is_numeric_dtype(valores):
+        valores = valores.round().astype('Int64')
+    return valores.astype(str).str.replace(r'\D', '', regex=True)
+
+def _normalizar_texto(valores):
+    return valores.astype(str).str.strip()
+
+NORMALIZADORES = {
+    'EMLMAIL': _normalizar_email,
+    'Programa interes': _normalizar_programa,
+    'TELTELEFONO': _normalizar_telefono,
+}
+
+def columnas_clave():
+    """Columnas de 'duplicate_keys' del config"""
+    return list(cargar_config()['duplicate_keys'])
+
+def _hash_columna(serie, normalizar):
+    """Hash uint64 por fila del valor normalizado (se normalizan solo los distintos)"""
+    codigos, unicos = pd.factorize(serie)
+    valores = pd.Series(unicos)
+    if isinstance(valores.dtype, pd.CategoricalDtype):
+        valores = valores.astype(object)
+
+    hashes = pd.util.hash_array(normalizar(valores).to_numpy(dtype=object))
+    # El nulo se normaliza como object: un NaN no entra en columnas int64/bool
+    nulo = normalizar(pd.Series([np.nan], dtype=object)).to_numpy(dtype=object)
+
+    # Los nulos (código -1) toman el hash del nulo normalizado, al final
+    return np.append(hashes, pd.util.hash_array(nulo))[codigos]
+
+def hash_claves(df, columnas=None):
+    """
+    Hash uint64 por fila de la clave de duplicados
+
+    Args:
+        columnas: columnas de la clave (None = 'duplicate_keys'); las que no
+            están en df cuentan como nulas
+    """
+    columnas = columnas_clave() if columnas is None else columnas
+    combinado = np.zeros(len(df), dtype=np.uint64)
+    for columna in columnas:
+        serie = df[columna] if columna in df.columns else pd.Series(np.nan, index=df.index)
+        combinado = (combinado * PRIMO_FNV) ^ _hash_columna(serie, NORMALIZADORES.get(columna, _normalizar_texto))
+    return combinado
+
+class ConjuntoHashes:
+    """Claves ya vistas como array uint64 ordenado y sin repetidos"""
+
+    def __init__(self, hashes=None):
+        self.hashes = np.unique(np.asarray(hashes if hashes is not None else [], dtype=np.uint64))
+
+    def __len__(self):
+        return len(self.hashes)
+
+    @property
+    def nbytes(self):
+        return self.hashes.nbytes
+
+    def contiene(self, hashes):
+        """Máscara booleana: True si el hash ya estaba en el conjunto"""
+        if len(self.hashes) == 0:
+            return np.zeros(len(hashes), dtype=bool)
+        posiciones = np.searchsorted(self.hashes, hashes)
+        posiciones[posiciones == len(self.hashes)] = 0
+        return self.hashes[posiciones] == hashes
+
+    def agregar(self, hashes):
+        nuevos = np.unique(np.asarray(hashes, dtype=np.uint64))
+        nuevos = nuevos[~self.contiene(nuevos)]
+        if len(nuevos):
+            # Dos tramos ya ordenados: el sort estable (timsort) los intercala en tiempo lineal
+            self.hashes = np.sort(np.concatenate([self.hashes, nuevos]), kind='stable')
+
+    def diferencia(self, hashes):
+        """Claves del conjunto que no están en hashes (p. ej. las agregadas desde una copia anterior)"""
+        return np.setdiff1d(self.hashes, hashes, assume_unique=True)
+
+    def marcar_vistos(self, hashes):
+        """
+        Marca los hashes ya vistos (en partes anteriores o antes en el mismo
+        array) y los agrega al conjunto
+        Returns: máscara booleana alineada con hashes (True = duplicado)
+        """
+        vistos = self.contiene(hashes) | pd.Series(hashes).duplicated(keep='first').to_numpy()
+        self.agregar(hashes)
+        return vistos
+
+# Serializa los registros de cargas de las sesiones de la app (mismo proceso)
+_BLOQUEO_CARGAS = threading.Lock()
+
+def ruta_indice(tipo='dataset', columnas=None):
+    """
+    Archivo del índice para esas columnas de clave (y esta VERSION_CLAVE)
+    tipo: 'dataset' (IndiceDuplicados) o 'cargas' (IndiceCargas)
+    """
+    columnas = columnas_clave() if columnas is None else columnas
+    firma = hashlib.sha256('\n'.join([str(VERSION_CLAVE)] + list(columnas)).encode('utf-8')).hexdigest()[:8]
+    extension = 'npz' if tipo == 'cargas' else 'npy'
+    return CACHE_DIR / f"{tipo}_indice_{firma}.{extension}"
+
+def _reemplazar(ruta, escribir):
+    """Escribe en un temporal y lo renombra: el índice nunca queda a medias"""
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    temporal = ruta.with_name(f"{ruta.stem}.tmp{ruta.suffix}")
+    with open(temporal, 'wb') as archivo:
+        escribir(archivo)
+    temporal.replace(ruta)
+    return ruta
+
+class IndiceDuplicados(ConjuntoHashes):
+    """ConjuntoHashes guardado en disco: claves del dataset de entrenamiento"""
+
+    def __init__(self, ruta=None, cargar=True):
+        super().__init__()
+        self.ruta = Path(ruta) if ruta is not None else ruta_indice()
+        if cargar and self.ruta.exists():
+            # Se guarda ordenado y sin repetidos
+            self.hashes = np.load(self.ruta)
+
+    def guardar(self):
+        """Escribe el índice (archivo temporal + replace: nunca queda a medias)"""
+        return _reemplazar(self.ruta, lambda archivo: np.save(archivo, self.hashes))
+
+def origen_archivo(clave_archivo):
+    """Origen uint64 a partir del hash hexadecimal del contenido del archivo"""
+    return np.uint64(int(clave_archivo[:16], 16))
+
+class IndiceCargas:
+    """
+    Claves de los archivos subidos a la app con el archivo que las registró
+
+    hashes (uint64 ordenados, sin repetidos) y origenes (origen_archivo de la
+    primera carga que trajo cada clave) van alineados en un .npz.
+    """
+
+    def __init__(self, ruta=None):
+        self.ruta = Path(ruta) if ruta is not None else ruta_indice('cargas')
+        self.hashes = np.empty(0, dtype=np.uint64)
+        self.origenes = np.empty(0, dtype=np.uint64)
+        if self.ruta.exists():
+            with np.load(self.ruta) as datos:
+                self.hashes, self.origenes = datos['hashes'], datos['origenes']
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def previas(self, origen):
+        """Claves registradas por otros archivos (las del propio origen no cuentan)"""
+        return self.hashes[self.origenes != origen]
+
+    def registrar(self, hashes, origen):
+        """Agrega las claves nuevas con su origen; las ya registradas conservan el primero"""
+        nuevos = np.unique(np.asarray(hashes, dtype=np.uint64))
+        nuevos = nuevos[~ConjuntoHashes(self.hashes).contiene(nuevos)]
+        if len(nuevos):
+            hashes = np.concatenate([self.hashes, nuevos])
+            orden = np.argsort(hashes, kind='stable')
+            self.hashes = hashes[orden]
+            self.origenes = np.concatenate([self.origenes, np.full(len(nuevos), origen, dtype=np.uint64)])[orden]
+        return len(nuevos)
+
+    def guardar(self):
+        return _reemplazar(
+            self.ruta, lambda archivo: np.savez(archivo, hashes=self.hashes, origenes=self.origenes)
+        )
+
+def claves_previas(clave_archivo):
+    """
+    ConjuntoHashes con las claves ya vistas para un archivo subido: las del
+    dataset de entrenamiento y las registradas por OTROS archivos
+    """
+    dataset = IndiceDuplicados()
+    cargas = IndiceCargas()
+    return ConjuntoHashes(np.concatenate([dataset.hashes, cargas.previas(origen_archivo(clave_archivo))]))
+
+def _mtime(ruta):
+    return ruta.stat().st_mtime_ns if ruta.exists() else 0
+
+@lru_cache(maxsize=64)
+def _claves_de_otros(ruta, mtime, clave_archivo):
+    """Claves de cargas de otros archivos (memoizado por versión del archivo del índice)"""
+    return len(IndiceCargas(ruta).previas(origen_archivo(clave_archivo))) if mtime else 0
+
+def estado_previas(clave_archivo):
+    """
+    Sello de lo que devolvería claves_previas(clave_archivo), para claves de caché
+
+    Cambia cuando se reconstruye el índice del dataset o cuando OTRO archivo
+    registra claves; las que registra el propio archivo no lo cambian (no
+    cuentan como vistas para él).
+    """
+    dataset, cargas = ruta_indice('dataset'), ruta_indice('cargas')
+    return _mtime(dataset), _claves_de_otros(cargas, _mtime(cargas), clave_archivo)
+
+def registrar_carga(hashes, clave_archivo):
+    """
+    Agrega al índice de cargas las claves de un archivo ya puntuado
+
+    Se relee el índice bajo el bloqueo antes de agregar: dos sesiones que
+    registran a la vez no se pisan. Registrar dos veces el mismo archivo no
+    cambia nada.
+    Returns: claves nuevas registradas
+    """
+    with _BLOQUEO_CARGAS:
+        cargas = IndiceCargas()
+        nuevas = cargas.registrar(hashes, origen_archivo(clave_archivo))
+        if nuevas:
+            cargas.guardar()
+    return nuevas
@@ -0,0 +1,35 @@
+"""
+Validación de Emails - Smart Scoring
+Validador por lotes compartido por app.py y el pipeline batch
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+PATRON_EMAIL = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+def validar_email(email):
+    """Valida si un email tiene formato correcto"""
+    if pd.isna(email):
+        return False
+    return PATRON_EMAIL.fullmatch(str(email).strip()) is not None
+
+def validar_emails(serie):
+    """
+    Valida una columna completa de emails
+    Cada email distinto se valida una sola vez (la columna se factoriza primero)
+
+    Returns: np.ndarray booleano alineado con la serie
+    """
+    codigos, unicos = pd.factorize(serie)
+    validos_unicos = np.fromiter(
+        (validar_email(email) for email in unicos), dtype=bool, count=len(unicos)
+    )
+
+    # Los nulos quedan con código -1 y son inválidos
+    validos = np.zeros(len(codigos), dtype=bool)
+    presentes = codigos >= 0
+    validos[presentes] = validos_unicos[codigos[presentes]]
+    return validos
@@ -0,0 +1,156 @@
+"""
+Lectura de Excel del CRM - Smart Scoring
+Ingesta de los exports .xls/.xlsx leyendo solo las columnas que usa el pipeline
+
+Parsear el Excel es la etapa más cara (UNAB ~57k filas, Crexe ~31k). Acá:
+- solo se leen las columnas de required_columns/optional_columns, sus alias
+  de column_mappings y las features del modelo (no los textos libres). Los
+  caminos que exportan los leads con su score (app, score_leads) leen con
+  solo_utiles=False: el archivo de salida conserva todas las columnas del
+  CRM, igual que con un CSV
+- se aplican los tipos de data_types (por nombre estándar, también a los alias)
+- los archivos en disco se guardan la primera vez como Parquet en
+  data/cache/excel/, con clave hash del contenido + columnas leídas +
+  VERSION_LECTURA y 'version' del config; las siguientes lecturas no vuelven
+  a pasar por el parser de Excel
+- si está instalado python-calamine se usa su motor (mucho más rápido que
+  xlrd/openpyxl); si no, el de pandas por defecto
+
+Las columnas de texto con valores mezclados (números y texto en la misma
+columna) se pasan a str, como en la lectura por lotes de CSV: así la limpieza
+puede usar .str sin perder valores y el frame se puede guardar en Parquet.
+"""
+
+import hashlib
+from importlib.util import find_spec
+from pathlib import Path
+
+import pandas as pd
+
+from .config import cargar_config
+from .dataset import DATA_DIR
+from .features import FEATURES_MODELO
+from .ingest_cache import hash_archivo
+
+CACHE_DIR = DATA_DIR / "cache" / "excel"
+
+# Subirla si cambia cómo se lee o se tipa un export: los Parquet guardados dejan de servir
+VERSION_LECTURA = 1
+
+# Columnas que agrega el pipeline (archivos ya procesados exportados a Excel)
+COLUMNAS_PROCESADAS = ['universidad', 'target', 'email_valido']
+
+TIPOS_NUMERICOS = {'int64', 'float64'}
+
+# Resultados de pd.api.types.infer_dtype que ya son homogéneos
+TIPOS_HOMOGENEOS = {'string', 'empty', 'boolean'}
+
+def columnas_utiles():
+    """Nombres de columnas (ya sin espacios) que se leen de un export"""
+    config = cargar_config()
+    return frozenset(
+        [nombre.strip() for nombre in config['column_mappings']]
+        + list(config['column_mappings'].values())
+        + config['required_columns']
+        + config['optional_columns']
+        + list(config['data_types'])
+        + FEATURES_MODELO
+        + COLUMNAS_PROCESADAS
+    )
+
+def motor_excel():
+    """'calamine' si python-calamine está instalado; None = motor por defecto de pandas"""
+    return 'calamine' if find_spec('python_calamine') is not None else None
+
+def _tipo_configurado(columna, alias, tipos):
+    """Tipo de data_types para la columna, buscando también por su nombre estándar"""
+    nombre = str(columna).strip()
+    return tipos.get(nombre, tipos.get(alias.get(nombre)))
+
+def _convertir_numerica(serie, tipo):
+    """Numérica según data_types, sin perder valores que no sean números"""
+    convertida = pd.to_numeric(serie, errors='coerce')
+    if convertida.isna().sum() > serie.isna().sum():
+        return serie
+    if tipo == 'int64' and not convertida.isna().any():
+        return convertida.astype('int64')
+    return convertida.astype('float64')
+
+def tipar_columnas(df):
+    """
+    Aplica data_types (numéricas) y deja las columnas de texto homogéneas
+    Las fechas que Excel entrega como fecha quedan datetime; las que vienen
+    como texto las interpreta la limpieza
+    """
+    config = cargar_config()
+    tipos = config['data_types']
+    alias = {origen.strip(): estandar for origen, estandar in config['column_mappings'].items()}
+
+    for columna in df.columns:
+        tipo = _tipo_configurado(columna, alias, tipos)
+        if tipo in TIPOS_NUMERICOS and not pd.api.types.is_numeric_dtype(df[columna]):
+            df[columna] = _convertir_numerica(df[columna], tipo)
+
+        serie = df[columna]
+        if serie.dtype == object and pd.api.types.infer_dtype(serie, skipna=True) not in TIPOS_HOMOGENEOS:
+            df[columna] = serie.where(serie.isna(), serie.astype(str))
+
+    return df
+
+def _firma_columnas(solo_utiles=True):
+    """
+    Hash corto de las columnas leídas y las versiones de lectura y del config
+    (entra en la clave de caché)
+    """
+    columnas = sorted(columnas_utiles()) if solo_utiles else ['*']
+    versiones = [f"lectura={VERSION_LECTURA}", f"config={cargar_config()['version']}"]
+    return hashlib.sha256('\n'.join(versiones + columnas).encode('utf-8')).hexdigest()[:8]
+
+def ruta_cache(ruta_archivo, solo_utiles=True, clave=None):
+    """clave: hash_archivo ya calculado del archivo (None = se calcula)"""
+    digest = (clave or hash_archivo(ruta_archivo))[:16]
+    return CACHE_DIR / f"{Path(ruta_archivo).stem}_{digest}_{_firma_columnas(solo_utiles)}.parquet"
+
+def leer_excel_columnas(origen, solo_utiles=True, **kwargs):
+    """
+    read_excel con tipos aplicados (origen: ruta o archivo subido)
+    solo_utiles: False lee todas las columnas del export
+    """
+    utiles = columnas_utiles()
+    df = pd.read_excel(
+        origen,
+        usecols=(lambda columna: str(columna).strip() in utiles) if solo_utiles else None,
+        engine=motor_excel(),
+        **kwargs
+    )
+    return tipar_columnas(df)
+
+def leer_excel(origen, usar_cache=True, solo_utiles=True, clave=None):
+    """
+    Lee un export del CRM en Excel
+
+    Args:
+        origen: ruta a .xls/.xlsx o archivo subido (los subidos no se cachean en disco)
+        usar_cache: False ignora el Parquet guardado y lo regenera
+        solo_utiles: False conserva todas las columnas (exportación con scores)
+        clave: hash_archivo de origen si ya se calculó (no se vuelve a leer el archivo para hashearlo)
+
+    Returns: DataFrame con las columnas leídas y sus tipos
+    """
+    if not isinstance(origen, (str, Path)):
+        return leer_excel_columnas(origen, solo_utiles)
+
+    entrada = ruta_cache(origen, solo_utiles, clave)
+    if usar_cache and entrada.exists():
+        return pd.read_parquet(entrada)
+
+    df = leer_excel_columnas(origen, solo_utiles)
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Solo se conserva la versión vigente de cada archivo (por conjunto de columnas)
+    for anterior in CACHE_DIR.glob(f"{Path(origen).stem}_*.parquet"):
+        nombre, _, firma = anterior.stem.rsplit('_', 2)
+        if nombre == Path(origen).stem and firma == _firma_columnas(solo_utiles):
+            anterior.unlink()
+    df.to_parquet(entrada, index=False)
+    return df
@@ -0,0 +1,97 @@
+"""
+Motor de Features - Smart Scoring
+Calcula las 14 features del modelo con operaciones columnares (NumPy/pandas)
+Compartido por app.py y scripts/prepare_multi_university_data.py
+"""
+
+import numpy as np
+
+from .categorizer import cargar_categorizadores
+
+# ORDEN EXACTO de columnas como en el entrenamiento
+FEATURES_MODELO = [
+    'universidad',
+    'CONTADOR_LLAMADOS_TEL',
+    'Llamadas_discador',
+    'dias_gestion',
+    'ratio_llamadas_dias',
+    'alta_actividad_llamadas',
+    'lead_reciente',
+    'lead_antiguo',
+    'tiene_email',
+    'whatsapp_entrante_flag',
+    'programa_categoria',
+    'base_categoria',
+    'utm_source_clean',
+    'utm_medium_clean'
+]
+
+COLUMNAS_CATEGORICAS = [
+    'universidad',
+    'programa_categoria',
+    'base_categoria',
+    'utm_source_clean',
+    'utm_medium_clean'
+]
+
+def crear_features(df, universidad=None):
+    """
+    Crea las features del modelo sobre un DataFrame limpio
+
+    Args:
+        df: DataFrame con las columnas normalizadas del CRM
+        universidad: valor a usar si el DataFrame no trae columna 'universidad'
+
+    Returns:
+        DataFrame con las features agregadas. Es una copia superficial: las
+        columnas originales se comparten con df y las features se agregan
+        como columnas nuevas, así que df no se modifica
+    """
+    df_features = df.copy(deep=False)
+
+    if 'universidad' not in df_features.columns and universidad is not None:
+        df_features['universidad'] = universidad
+
+    # 1. Features de Email
+    if 'email_valido' in df_features.columns:
+        df_features['tiene_email'] = df_features['email_valido'].astype(int)
+    else:
+        df_features['tiene_email'] = 0
+
+    # 2. Features de WhatsApp
+    if 'WhatsApp entrante' in df_features.columns:
+        df_features['whatsapp_entrante_flag'] = df_features['WhatsApp entrante'].notna().astype(int)
+    else:
+        df_features['whatsapp_entrante_flag'] = 0
+
+    # 3. Features Temporales
+    if 'dias_gestion' in df_features.columns:
+        dias = df_features['dias_gestion']
+        df_features['lead_reciente'] = (dias < 7).astype(int)
+        df_features['lead_antiguo'] = (dias > 30).astype(int)
+    else:
+        df_features['dias_gestion'] = 0
+        df_features['lead_reciente'] = 0
+        df_features['lead_antiguo'] = 0
+
+    # 4. Features de Comportamiento
+    if 'CONTADOR_LLAMADOS_TEL' in df_features.columns:
+        llamadas = df_features['CONTADOR_LLAMADOS_TEL']
+        df_features['ratio_llamadas_dias'] = llamadas / np.maximum(df_features['dias_gestion'], 1)
+        df_features['alta_actividad_llamadas'] = (llamadas > 5).astype(int)
+    else:
+        df_features['CONTADOR_LLAMADOS_TEL'] = 0
+        df_features['ratio_llamadas_dias'] = 0
+        df_features['alta_actividad_llamadas'] = 0
+
+    if 'Llamadas_discador' not in df_features.columns:
+        df_features['Llamadas_discador'] = 0
+
+    # 5-8. Categorías de programa, base y UTMs (reglas de 'category_rules')
+    for destino, categorizador in cargar_categorizadores().items():
+        if categorizador.columna in df_features.columns:
+            df_features[destino] = categorizador.categorizar(df_features[categorizador.columna])
+        else:
+            df_features[destino] = categorizador.default
+
+    return df_features
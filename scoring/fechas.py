@@ -0,0 +1,131 @@
+"""
+Fechas del CRM - Smart Scoring
+Parseo de las fechas de gestión con formatos conocidos por universidad
+
+Cada CRM exporta las fechas como texto en su propio formato (UNAB ISO, Crexe
+y Anáhuac día/mes...). pd.to_datetime sin formato adivina uno a partir del
+primer valor y anula el resto: con fechas día/mes se pierde más de la mitad.
+Acá cada columna se parsea con los formatos de 'date_formats' del config, en
+orden (primero los de la universidad, después los generales), y solo lo que
+no coincide con ninguno pasa por la inferencia elemento a elemento.
+
+Las fechas que ya vienen como datetime (celdas de fecha de Excel) no se tocan.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .config import cargar_config
+
+COLUMNAS_FECHA_GESTION = ['Fecha insert Lead', 'Fecha y hora de actualización']
+
+# Valores con los que se ordenan los formatos antes de parsear la columna
+TAMANO_MUESTRA = 200
+
+@lru_cache(maxsize=None)
+def formatos_universidad(universidad=None):
+    """Formatos a probar para una universidad: los propios primero, después los generales"""
+    catalogo = cargar_config()['date_formats']
+    propios = catalogo.get(universidad, []) if universidad else []
+    return tuple(dict.fromkeys(propios + catalogo['default']))
+
+def parsear_fechas(serie, formatos, dayfirst=False):
+    """
+    Convierte una columna a datetime64 probando los formatos en orden
+
+    Args:
+        formatos: formatos strptime; cada uno se aplica solo a lo que sigue sin parsear
+        dayfirst: para la inferencia de lo que no coincide con ningún formato
+
+    Returns:
+        (fechas, fallidas) - Serie datetime64 alineada y cantidad de valores no
+        nulos que no se pudieron interpretar (quedan NaT)
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie, 0
+
+    fechas = np.full(len(serie), np.datetime64('NaT'), dtype='datetime64[ns]')
+    pendientes = serie.notna().to_numpy(copy=True)
+
+    # Cada pasada que no coincide cuesta casi lo mismo que una que sí: se
+    # prueban primero los formatos que más coinciden en una muestra
+    muestra = serie.iloc[np.flatnonzero(pendientes)[:TAMANO_MUESTRA]]
+    aciertos = {
+        formato: pd.to_datetime(muestra, format=formato, errors='coerce').notna().sum()
+        for formato in formatos
+    }
+    formatos = sorted(formatos, key=lambda formato: -aciertos[formato])
+
+    # Formatos conocidos (vectorizado) y después inferencia de lo que sobra
+    intentos = [{'format': formato} for formato in formatos] + [{'format': 'mixed', 'dayfirst': dayfirst}]
+    for intento in intentos:
+        posiciones = np.flatnonzero(pendientes)
+        if len(posiciones) == 0:
+            break
+        parseadas = pd.to_datetime(serie.iloc[posiciones], errors='coerce', **intento).to_numpy(dtype='datetime64[ns]')
+        ok = ~np.isnat(parseadas)
+        fechas[posiciones[ok]] = parseadas[ok]
+        pendientes[posiciones[ok]] = False
+
+    return pd.Series(fechas, index=serie.index, name=serie.name), int(pendientes.sum())
+
+def _parsear_columna(serie, universidades):
+    """
+    Parsea con los formatos de cada universidad (universidades: Serie alineada o None)
+    Returns: (fechas, {universidad: (fallidas, con_valor)})
+    """
+    if universidades is None:
+        codigos, unicos = np.zeros(len(serie), dtype=np.intp), [None]
+    else:
+        codigos, unicos = pd.factorize(universidades, use_na_sentinel=False)
+        unicos = [None if pd.isna(universidad) else universidad for universidad in unicos]
+
+    fechas = np.full(len(serie), np.datetime64('NaT'), dtype='datetime64[ns]')
+    fallos = {}
+    for codigo, universidad in enumerate(unicos):
+        posiciones = np.flatnonzero(codigos == codigo)
+        parte = serie.iloc[posiciones]
+        formatos = formatos_universidad(universidad)
+        parseadas, fallidas = parsear_fechas(parte, formatos, dayfirst=formatos[0].startswith('%d'))
+        fechas[posiciones] = parseadas.to_numpy(dtype='datetime64[ns]')
+        fallos[universidad] = (fallidas, int(parte.notna().sum()))
+
+    return pd.Series(fechas, index=serie.index, name=serie.name), fallos
+
+def procesar_fechas(df, universidad=None):
+    """
+    Parsea las fechas de gestión y calcula dias_gestion (modifica df)
+
+    Args:
+        df: DataFrame con columnas normalizadas
+        universidad: formatos a priorizar cuando df no tiene columna 'universidad'
+
+    Returns:
+        {universidad: {columna: (fallidas, con_valor)}} para informar la tasa
+        de fechas no interpretadas (universidad None = sin universidad conocida)
+    """
+    if 'universidad' in df.columns:
+        universidades = df['universidad']
+    elif universidad is not None:
+        universidades = pd.Series(universidad, index=df.index)
+    else:
+        universidades = None
+
+    fallos = {}
+    for columna in COLUMNAS_FECHA_GESTION:
+        if columna in df.columns:
+            df[columna], por_universidad = _parsear_columna(df[columna], universidades)
+            for uni, conteo in por_universidad.items():
+                fallos.setdefault(uni, {})[columna] = conteo
+
+    if all(columna in df.columns for columna in COLUMNAS_FECHA_GESTION):
+        dias = (df['Fecha y hora de actualización'] - df['Fecha insert Lead']).dt.days
+        df['dias_gestion'] = dias.fillna(0).clip(lower=0).astype('int32')
+
+    return fallos
+
+def tasa_fallos(fallidas, con_valor):
+    """Proporción de fechas con valor que quedaron NaT"""
+    return fallidas / con_valor if con_valor else 0.0
@@ -0,0 +1,11 @@
+"""Hash de contenido de los archivos fuente (clave de las cachés en disco)"""
+
+import hashlib
+
+def hash_archivo(ruta, tamano_bloque=1 << 20):
+    """SHA-256 del contenido del archivo (lectura por bloques)"""
+    sha = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(tamano_bloque), b''):
+            sha.update(bloque)
+    return sha.hexdigest()
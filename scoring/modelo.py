@@ -0,0 +1,84 @@
+"""
+Artefactos del Modelo - Smart Scoring
+Carga del modelo y de los label encoders sin depender de Streamlit
+
+Si existe models/modelo_scoring_sin_leakage.npz (lo genera guardar_modelo en
+train_model_sin_leakage.py) se usa el modelo compacto de scoring.bosque: se
+abre con memory-map y no requiere importar scikit-learn ni des-serializar el
+pickle. Si no existe, se cargan los pickles como antes.
+"""
+
+import pickle
+
+import pandas as pd
+
+from .bosque import BosqueCompacto
+from .config import BASE_DIR
+from .ingest_cache import hash_archivo
+
+MODELS_DIR = BASE_DIR / "models"
+
+ARCHIVO_MODELO = "modelo_scoring_sin_leakage.pkl"
+ARCHIVO_ENCODERS = "label_encoders_sin_leakage.pkl"
+ARCHIVO_MODELO_COMPACTO = "modelo_scoring_sin_leakage.npz"
+
+class CodificadorCategorias:
+    """
+    Tablas categoría → código precalculadas a partir de las clases de los LabelEncoders
+
+    LabelEncoder guarda classes_ ordenadas y transform() devuelve la posición
+    en classes_, así que la tabla es simplemente un Index sobre classes_. Las
+    categorías nuevas (o nulas) reciben el código de classes_[0], igual que
+    el manejo que se hacía fila a fila con le.transform.
+    """
+
+    def __init__(self, clases):
+        """clases: dict columna → classes_ del LabelEncoder"""
+        self.categorias = {col: pd.Index(valores) for col, valores in clases.items()}
+
+    @classmethod
+    def desde_encoders(cls, encoders):
+        """Construye el codificador desde el dict de LabelEncoders del entrenamiento"""
+        return cls({col: le.classes_ for col, le in encoders.items()})
+
+    def __contains__(self, columna):
+        return columna in self.categorias
+
+    def codificar(self, serie):
+        """Códigos enteros (int8/int16) de la serie; desconocidos → 0 (classes_[0])"""
+        codigos = pd.Categorical(serie, categories=self.categorias[serie.name]).codes
+        return codigos.clip(min=0)
+
+def cargar_artefactos(models_dir=MODELS_DIR, compacto=True):
+    """
+    Carga el modelo limpio multi-universidad (SIN data leakage) y sus encoders
+    
+    Args:
+        compacto: usar el .npz si existe (False = forzar los pickles de scikit-learn)
+    
+    Returns: (modelo, CodificadorCategorias) - el modelo expone predict_proba
+    """
+    ruta_compacto = models_dir / ARCHIVO_MODELO_COMPACTO
+    if compacto and ruta_compacto.exists():
+        modelo = BosqueCompacto.cargar(ruta_compacto)
+        return modelo, CodificadorCategorias(modelo.clases)
+    
+    with open(models_dir / ARCHIVO_MODELO, 'rb') as f:
+        modelo = pickle.load(f)
+    
+    with open(models_dir / ARCHIVO_ENCODERS, 'rb') as f:
+        encoders = pickle.load(f)
+    
+    return modelo, CodificadorCategorias.desde_encoders(encoders)
+
+def version_artefactos(models_dir=MODELS_DIR, compacto=True):
+    """
+    Identificador de los artefactos que cargaría cargar_artefactos (hash del
+    contenido): cambia al re-entrenar, así que sirve como parte de claves de caché
+    """
+    ruta_compacto = models_dir / ARCHIVO_MODELO_COMPACTO
+    if compacto and ruta_compacto.exists():
+        archivos = [ruta_compacto]
+    else:
+        archivos = [models_dir / ARCHIVO_MODELO, models_dir / ARCHIVO_ENCODERS]
+    return '-'.join(hash_archivo(ruta)[:12] for ruta in archivos)
@@ -0,0 +1,423 @@
+"""
+Pipeline de Scoring - Smart Scoring
+Procesamiento puro (sin Streamlit) de archivos del CRM: normalización,
+limpieza, codificación y scores. Lo usan app.py y el scoring por lotes.
+
+Las funciones devuelven sus resultados junto con un Reporte (scoring.reporte)
+con los conteos en 'datos' y los mensajes para el usuario en 'eventos'. Se
+puede pasar el mismo Reporte a varias etapas para acumular una corrida completa.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .duplicados import hash_claves
+from .emails import validar_emails
+from .fechas import procesar_fechas, tasa_fallos
+from .features import FEATURES_MODELO, COLUMNAS_CATEGORICAS, crear_features
+from .modelo import CodificadorCategorias
+from .reporte import Reporte
+from .resoluciones import cargar_clasificador_resoluciones
+
+# Columnas con información del futuro (se eliminan después de crear el target)
+COLUMNAS_LEAKAGE = [
+    'Resolución',
+    'Ultima resolución',
+    'Estado principal',
+    'Fecha y hora del proximo llamado',
+    'Contador de Llamadas'  # Si existe (es diferente a CONTADOR_LLAMADOS_TEL)
+]
+
+# Columnas de texto que se leen siempre como str (un lote puede venir todo vacío)
+COLUMNAS_TEXTO = [
+    'Resolución', 'Resolucion', 'Base de datos', 'Canal', 'EMLMAIL',
+    'Programa interes', 'UTM Source', 'UTM Origen', 'UTM Medium',
+    'UTM Campaing', 'UTM Content'
+]
+
+def detectar_universidad(df):
+    """
+    Detecta automáticamente la universidad basándose en características del dataset
+    Returns: 'UNAB', 'Crexe', 'UEES', 'Anahuac', 'Unisangil', 'Desconocido'
+    """
+    # Método 0: Analizar columna "Base de datos" (MÁS CONFIABLE)
+    if 'Base de datos' in df.columns:
+        bases_str = ' '.join(df['Base de datos'].astype(str).str.upper().unique())
+        
+        # Buscar nombres de universidades en las bases de datos
+        # Orden de prioridad: buscar patrones más específicos primero
+        if 'UNAB' in bases_str:
+            return 'UNAB'
+        elif 'CREXE' in bases_str:
+            return 'Crexe'
+        elif 'UEES' in bases_str:
+            return 'UEES'
+        elif 'ANAHUAC' in bases_str or 'ANÁHUAC' in bases_str:
+            return 'Anahuac'
+        elif 'UNISANGIL' in bases_str or 'SANGIL' in bases_str:
+            return 'Unisangil'
+    
+    # Método 1: Analizar características específicas de columnas
+    col_names = [str(c).lower() for c in df.columns]
+    
+    # UEES tiene columnas únicas
+    if 'operador' in col_names and 'nombre operador' in col_names:
+        return 'UEES'
+    
+    # Crexe tiene CHKENTRANTEWHATSAPP antes de normalizar
+    if 'chkentrantewhatsapp' in col_names or 'txtestadoprincipal' in col_names:
+        return 'Crexe'
+    
+    # Método 2: Analizar programas únicos
+    if 'Programa interes' in df.columns or 'programa interes' in col_names:
+        programas = df['Programa interes'].astype(str).str.upper() if 'Programa interes' in df.columns else []
+        programas_str = ' '.join(programas.unique())
+        
+        # Programas específicos de cada universidad
+        if 'NEUROCIENCIA' in programas_str or 'MINDFULNESS' in programas_str:
+            return 'Crexe'
+        elif 'ANAHUAC' in programas_str:
+            return 'Anahuac'
+        elif 'UNISANGIL' in programas_str:
+            return 'Unisangil'
+    
+    # Método 3: Por cantidad de leads (ÚLTIMO RECURSO - menos confiable)
+    # Solo usar si ningún otro método funcionó
+    if len(df) > 40000:
+        return 'Crexe'  # Crexe tiene ~44K leads
+    elif len(df) > 25000:
+        return 'UEES'  # UEES tiene ~27K leads
+    elif len(df) > 10000:
+        return 'Anahuac'  # Anahuac tiene ~15K leads
+    elif len(df) > 5000:
+        return 'UNAB'  # UNAB tiene ~6K leads
+    else:
+        return 'Unisangil'  # Unisangil tiene ~4K leads
+
+# Nombres de columnas que cambian entre CRMs -> nombre estándar (UNAB)
+MAPEO_COLUMNAS = {
+    # Crexe/UEES -> UNAB (estandar)
+    'Idcontacto': 'dcontacto',
+    'Lamadas_discador': 'Llamadas_discador',  # Typo en Crexe/UEES
+    'CHKENTRANTEWHATSAPP': 'WhatsApp entrante',
+    'TXTESTADOPRINCIPAL': 'Estado principal',
+    'Ultima resolucion': 'Ultima resolución',
+    
+    # UEES específico
+    'Contador de Llamadas': 'CONTADOR_LLAMADOS_TEL',
+    'Fecha Inserción Leads': 'Fecha insert Lead',
+    'UTM Origen': 'UTM Source',  # UEES usa "Origen" en vez de "Source"
+    
+    # Otras variaciones comunes
+    'Resolucion': 'Resolución',
+    'Fecha y hora de actualizacion': 'Fecha y hora de actualización',
+    'Programa interes': 'Programa interes',  # Ya normalizado
+}
+
+def normalizar_columnas(df):
+    """
+    Normaliza nombres de columnas para compatibilidad entre universidades
+    - Elimina espacios al inicio/final
+    - Mapea nombres comunes entre diferentes CRMs
+    - Soporta: UNAB, Crexe, UEES y otras instituciones
+    """
+    # 1. Eliminar espacios en nombres de columnas
+    df.columns = df.columns.str.strip()
+    
+    # 2. Mapeo de columnas con nombres diferentes
+    df = df.rename(columns=MAPEO_COLUMNAS)
+    
+    # 3. Convertir CHKENTRANTEWHATSAPP (Si/No) a formato booleano
+    if 'WhatsApp entrante' in df.columns:
+        # Si es texto "Si"/"No", convertir
+        if df['WhatsApp entrante'].dtype == 'object':
+            df['WhatsApp entrante'] = df['WhatsApp entrante'].apply(
+                lambda x: 'entrante' if str(x).lower() in ['si', 'sí', 'yes', '1'] else None
+            )
+    
+    return df
+
+# ===== FUNCIONES DE PROCESAMIENTO INTEGRADAS =====
+
+def es_resolucion_positiva(resolucion):
+    """Detecta si una resolución indica matrícula (mismo criterio que el target de entrenamiento)"""
+    return cargar_clasificador_resoluciones().es_positiva(resolucion)
+
+def marcar_duplicados(df, claves_vistas=None):
+    """
+    Marca duplicados por misma clave email + programa (solo emails válidos)
+    La clave son las columnas de 'duplicate_keys' normalizadas y reducidas a
+    un hash de 64 bits (ver scoring.duplicados)
+    
+    Args:
+        claves_vistas: ConjuntoHashes (o IndiceDuplicados) opcional con las
+            claves de lotes o cargas anteriores; se actualiza in-place
+    
+    Returns: máscara booleana alineada con df (True = duplicado a eliminar)
+    """
+    posiciones = np.flatnonzero(df['email_valido'].to_numpy(dtype=bool))
+    hashes = hash_claves(df.iloc[posiciones])
+    
+    mascara = np.zeros(len(df), dtype=bool)
+    if claves_vistas is None:
+        mascara[posiciones] = pd.Series(hashes).duplicated(keep='first').to_numpy()
+    else:
+        mascara[posiciones] = claves_vistas.marcar_vistos(hashes)
+    
+    return mascara
+
+def limpiar_datos(df, eliminar_columnas_vacias=True, claves_vistas=None, reporte=None,
+                  eliminar_duplicados=True, normalizar=True, universidad=None):
+    """
+    Limpia los datos del CRM
+    
+    Args:
+        df: DataFrame tal cual sale del CRM
+        eliminar_columnas_vacias: False en el modo por lotes, para que todos los
+            lotes conserven el mismo esquema
+        claves_vistas: ConjuntoHashes/IndiceDuplicados, ver marcar_duplicados
+        reporte: Reporte a completar (None = uno nuevo)
+        eliminar_duplicados: False conserva una fila por lead de entrada (servicio
+            de scoring, donde cada fila es un pedido distinto)
+        normalizar: False si df ya pasó por normalizar_columnas
+        universidad: sus formatos de fecha se prueban primero (None = formatos generales)
+    
+    Returns:
+        (df_limpio, reporte) - reporte.datos tiene columnas_vacias, target_creado,
+        columnas_leakage, emails_invalidos, duplicados y fechas_fallidas
+    """
+    reporte = reporte if reporte is not None else Reporte()
+    resumen = reporte.datos
+    resumen.update({
+        'columnas_vacias': [],
+        'target_creado': False,
+        'columnas_leakage': [],
+        'emails_invalidos': None,
+        'duplicados': 0,
+        'fechas_fallidas': {}
+    })
+    
+    # 0. NORMALIZAR COLUMNAS (Multi-universidad)
+    if normalizar:
+        reporte.info('limpieza', "🔄 Normalizando formato de columnas...")
+        df_limpio = normalizar_columnas(df.copy(deep=False))
+    else:
+        df_limpio = df.copy(deep=False)
+    
+    # 1. Eliminar columnas completamente vacías
+    if eliminar_columnas_vacias:
+        columnas_vacias = df_limpio.columns[df_limpio.isnull().all()].tolist()
+        if columnas_vacias:
+            df_limpio = df_limpio.drop(columns=columnas_vacias)
+            resumen['columnas_vacias'] = columnas_vacias
+            reporte.info('limpieza', f"✂️ Columnas vacías eliminadas: {', '.join(map(str, columnas_vacias))}")
+    
+    # 2. Crear variable objetivo (TARGET)
+    if 'Resolución' in df_limpio.columns:
+        _, target = cargar_clasificador_resoluciones().clasificar_columna(df_limpio['Resolución'])
+        df_limpio['target'] = target
+        resumen['target_creado'] = True
+        
+        # 🔒 ELIMINAR COLUMNAS DE DATA LEAKAGE DESPUÉS DE CREAR TARGET
+        columnas_eliminadas = [col for col in COLUMNAS_LEAKAGE if col in df_limpio.columns]
+        if columnas_eliminadas:
+            df_limpio = df_limpio.drop(columns=columnas_eliminadas)
+            resumen['columnas_leakage'] = columnas_eliminadas
+            reporte.aviso('limpieza', f"🔒 Columnas de data leakage eliminadas: {', '.join(columnas_eliminadas)}")
+    else:
+        reporte.aviso('limpieza', "⚠️ No se encontró columna 'Resolución' - creando target = 0")
+    
+    # 3. Validar y limpiar emails
+    if 'EMLMAIL' in df_limpio.columns:
+        df_limpio['email_valido'] = validar_emails(df_limpio['EMLMAIL'])
+        resumen['emails_invalidos'] = int((~df_limpio['email_valido']).sum())
+        reporte.info('limpieza', f"📧 Emails validados: {resumen['emails_invalidos']} inválidos detectados")
+    
+    # 4. Detectar y eliminar duplicados (mismo email + mismo programa)
+    if eliminar_duplicados and 'EMLMAIL' in df_limpio.columns and 'Programa interes' in df_limpio.columns:
+        duplicados = marcar_duplicados(df_limpio, claves_vistas)
+        if duplicados.any():
+            df_limpio = df_limpio[~duplicados]
+            resumen['duplicados'] = int(duplicados.sum())
+            reporte.aviso('limpieza', f"🗑️ {resumen['duplicados']} duplicados eliminados (mismo email + programa)")
+    
+    # 5. Normalizar campos de texto
+    if 'Programa interes' in df_limpio.columns:
+        df_limpio['Programa interes'] = df_limpio['Programa interes'].fillna('NO ESPECIFICADO')
+        df_limpio['Programa interes'] = df_limpio['Programa interes'].str.strip().str.upper()
+    
+    if 'Base de datos' in df_limpio.columns:
+        df_limpio['Base de datos'] = df_limpio['Base de datos'].str.strip()
+    
+    for col in ['UTM Medium', 'UTM Source', 'UTM Campaing', 'UTM Content']:
+        if col in df_limpio.columns:
+            df_limpio[col] = df_limpio[col].fillna('no_disponible')
+            df_limpio[col] = df_limpio[col].str.strip().str.lower()
+    
+    # 6. Procesar fechas (formatos del config) y días de gestión
+    fallos = procesar_fechas(df_limpio, universidad)
+    for columnas in fallos.values():
+        for columna, (fallidas, con_valor) in columnas.items():
+            if fallidas:
+                resumen['fechas_fallidas'][columna] = resumen['fechas_fallidas'].get(columna, 0) + fallidas
+                reporte.aviso('limpieza', f"📅 {fallidas} fechas no interpretadas en '{columna}' ({tasa_fallos(fallidas, con_valor)*100:.1f}%)")
+    
+    # Conteo del target sobre los leads que quedaron (sin duplicados)
+    if resumen['target_creado']:
+        reporte.exito('limpieza', f"✅ Variable objetivo creada: {df_limpio['target'].sum()} matriculados ({df_limpio['target'].mean()*100:.2f}%)")
+    
+    reporte.exito('limpieza', f"✅ Limpieza completada: {len(df_limpio)} leads listos")
+    
+    return df_limpio, reporte
+
+def resolver_universidad(df, universidad=None, reporte=None):
+    """
+    Universidad a usar para las features de un archivo sin columna 'universidad'
+    
+    Args:
+        universidad: selección manual (tiene prioridad); None = detección automática
+    
+    Returns: nombre de la universidad, o None si el archivo ya trae la columna
+    """
+    reporte = reporte if reporte is not None else Reporte()
+    
+    if 'universidad' in df.columns:
+        universidad = None
+    elif universidad is not None:
+        reporte.exito('features', f"🎓 Universidad seleccionada manualmente: **{universidad}**")
+    else:
+        universidad = detectar_universidad(df)
+        reporte.info('features', f"🎓 Universidad detectada automáticamente: **{universidad}**")
+    
+    reporte.datos['universidad'] = universidad
+    return universidad
+
+def detectar_tipo_archivo(df):
+    """
+    Detecta si el archivo ya está procesado o si es del CRM original
+    Returns: 'procesado', 'crm_original', 'desconocido'
+    """
+    # Columnas que debe tener un archivo procesado
+    columnas_procesadas = [
+        'programa_categoria', 'base_categoria', 
+        'utm_source_clean', 'utm_medium_clean',
+        'ratio_llamadas_dias'
+    ]
+    
+    # Columnas típicas del CRM original
+    columnas_crm = ['dcontacto', 'Nombre y Apellido', 'TELTELEFONO', 'Resolución']
+    
+    tiene_procesadas = all(col in df.columns for col in columnas_procesadas)
+    tiene_crm = any(col in df.columns for col in columnas_crm)
+    
+    if tiene_procesadas:
+        return 'procesado'
+    elif tiene_crm:
+        return 'crm_original'
+    else:
+        return 'desconocido'
+
+def preparar_datos_prediccion(df, encoders, reporte=None):
+    """
+    Prepara los datos para prediccion (mismo proceso que entrenamiento)
+    IMPORTANTE: El orden de las columnas debe coincidir EXACTAMENTE con el entrenamiento
+    
+    Args:
+        encoders: CodificadorCategorias (de cargar_artefactos) o el dict de LabelEncoders
+    
+    Returns:
+        (X | None, reporte) - X es None si faltan columnas necesarias; si no, un
+        DataFrame sobre una matriz float32 contigua (sin copias al predecir).
+        reporte.datos tiene columnas_por_defecto y columnas_faltantes
+    """
+    reporte = reporte if reporte is not None else Reporte()
+    resumen = reporte.datos
+    resumen.update({'columnas_por_defecto': [], 'columnas_faltantes': []})
+    
+    if not isinstance(encoders, CodificadorCategorias):
+        encoders = CodificadorCategorias.desde_encoders(encoders)
+    
+    for col in COLUMNAS_CATEGORICAS:
+        if col not in df.columns:
+            resumen['columnas_por_defecto'].append(col)
+            reporte.aviso('codificacion', f"⚠️ Columna {col} no encontrada, usando valor por defecto")
+    
+    # Verificar que todas las columnas existen
+    resumen['columnas_faltantes'] = [
+        col for col in FEATURES_MODELO
+        if col not in df.columns and col not in resumen['columnas_por_defecto']
+    ]
+    if resumen['columnas_faltantes']:
+        reporte.error('codificacion', f"❌ Faltan columnas necesarias: {resumen['columnas_faltantes']}")
+        return None, reporte
+    
+    # Matriz EN EL ORDEN CORRECTO (las categóricas faltantes quedan en 0)
+    X = np.zeros((len(df), len(FEATURES_MODELO)), dtype=np.float32)
+    
+    for j, col in enumerate(FEATURES_MODELO):
+        if col in resumen['columnas_por_defecto']:
+            continue
+        if col in COLUMNAS_CATEGORICAS and col in encoders:
+            # Codificar categoricas con la tabla precalculada (incluye universidad)
+            X[:, j] = encoders.codificar(df[col])
+        else:
+            X[:, j] = df[col].to_numpy(dtype=np.float32, na_value=np.nan)
+    
+    return pd.DataFrame(X, columns=FEATURES_MODELO, index=df.index, copy=False), reporte
+
+def asignar_scores(df, probabilidades):
+    """Agrega Probabilidad_Matricula (0-100) y Score_Categoria al DataFrame (in-place)"""
+    df['Probabilidad_Matricula'] = (probabilidades * 100).round(2)
+    df['Score_Categoria'] = pd.cut(
+        df['Probabilidad_Matricula'],
+        bins=[0, 30, 60, 100],
+        labels=['⭐ Bajo', '⭐⭐ Medio', '⭐⭐⭐ Alto']
+    )
+    return df
+
+def procesar_crm(df, universidad=None, reporte=None):
+    """
+    Archivo del CRM original → DataFrame con features (limpieza + features)
+    
+    Returns:
+        (df_features, reporte)
+    """
+    reporte = reporte if reporte is not None else Reporte()
+    
+    df_limpio, reporte = limpiar_datos(df, reporte=reporte, universidad=universidad)
+    universidad = resolver_universidad(df_limpio, universidad, reporte)
+    df_features = crear_features(df_limpio, universidad=universidad)
+    reporte.exito('features', "✅ Features creadas exitosamente!")
+    
+    return df_features, reporte
+
+def puntuar_leads(df, modelo, encoders, universidad=None):
+    """
+    Pipeline completo en memoria: archivo del CRM (o ya procesado) → scores
+    
+    Args:
+        df: DataFrame del CRM original o con features ya calculadas
+        modelo, encoders: artefactos del modelo
+        universidad: universidad fija; None = detección automática
+    
+    Returns:
+        (df_scores ordenado por probabilidad, reporte)
+    """
+    reporte = Reporte()
+    tipo_archivo = detectar_tipo_archivo(df)
+    reporte.datos['tipo_archivo'] = tipo_archivo
+    
+    if tipo_archivo == 'crm_original':
+        df_features, reporte = procesar_crm(df, universidad, reporte)
+    elif tipo_archivo == 'procesado':
+        df_features = df.copy()
+    else:
+        raise ValueError("No se pudo detectar el formato del archivo (ni CRM Neotel ni procesado)")
+    
+    X, reporte = preparar_datos_prediccion(df_features, encoders, reporte)
+    if X is None:
+        raise ValueError(f"Faltan columnas necesarias: {reporte.datos['columnas_faltantes']}")
+    
+    asignar_scores(df_features, modelo.predict_proba(X)[:, 1])
+    
+    return df_features.sort_values('Probabilidad_Matricula', ascending=False), reporte
@@ -0,0 +1,192 @@
+"""
+Medición de Rendimiento - Smart Scoring
+Tiempo, filas por segundo y memoria de cada etapa del pipeline
+
+Perfil.medir() envuelve una etapa y guarda una MedicionEtapa:
+- segundos y filas/s (time.perf_counter)
+- RSS actual y pico de RSS del proceso al terminar la etapa (una lectura de
+  /proc y una syscall: se puede dejar prendido en producción)
+- memoria del DataFrame resultante, sin recorrer los strings (deep=False)
+- opcional: pico de memoria asignada DURANTE la etapa con tracemalloc
+  (preciso pero lento; lo usa el benchmark, no la app)
+
+Perfil.registrar_log() escribe la corrida como una línea JSON en
+data/logs/rendimiento.jsonl para comparar archivos y universidades.
+"""
+
+import sys
+import json
+import time
+import logging
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows: sin getrusage
+    resource = None
+
+from .dataset import DATA_DIR
+
+MB = 1024 * 1024
+
+ARCHIVO_LOG = DATA_DIR / "logs" / "rendimiento.jsonl"
+
+logger = logging.getLogger('smart_scoring.rendimiento')
+
+def configurar_log(ruta=ARCHIVO_LOG):
+    """Envía el log de rendimiento a un archivo JSON Lines (una vez por proceso)"""
+    if logger.handlers:
+        return logger
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    handler = logging.FileHandler(ruta, encoding='utf-8')
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+def rss_mb():
+    """Memoria residente actual del proceso (None fuera de Linux)"""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            paginas = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return paginas * resource.getpagesize() / MB
+
+def pico_rss_mb():
+    """Pico de memoria residente del proceso hasta ahora (None si no se puede medir)"""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa KB; macOS, bytes
+    return pico / MB if sys.platform == 'darwin' else pico / 1024
+
+class MedicionEtapa:
+    """Resultado de medir una etapa"""
+
+    __slots__ = ('etapa', 'segundos', 'filas', 'rss_mb', 'pico_rss_mb', 'memoria_pico_mb', 'memoria_df_mb')
+
+    def __init__(self, etapa, filas=None):
+        self.etapa = etapa
+        self.filas = filas
+        self.segundos = None
+        self.rss_mb = None
+        self.pico_rss_mb = None
+        self.memoria_pico_mb = None
+        self.memoria_df_mb = None
+
+    @property
+    def filas_por_segundo(self):
+        if not self.filas or not self.segundos:
+            return None
+        return self.filas / self.segundos
+
+    def registrar_df(self, df):
+        """Memoria del DataFrame que produjo la etapa (sin medir el contenido de los strings)"""
+        self.memoria_df_mb = df.memory_usage(index=True, deep=False).sum() / MB
+
+    def como_dict(self):
+        return {
+            'etapa': self.etapa,
+            'segundos': self.segundos,
+            'filas': self.filas,
+            'filas_por_segundo': self.filas_por_segundo,
+            'rss_mb': self.rss_mb,
+            'pico_rss_mb': self.pico_rss_mb,
+            'memoria_pico_mb': self.memoria_pico_mb,
+            'memoria_df_mb': self.memoria_df_mb,
+        }
+
+class Perfil:
+    """Mediciones de una corrida del pipeline, en orden"""
+
+    def __init__(self, trazar_memoria=False, mediciones=None):
+        """
+        Args:
+            trazar_memoria: mide con tracemalloc la memoria que asigna cada
+                etapa (multiplica el tiempo de las etapas con muchos objetos)
+            mediciones: mediciones previas de la misma corrida (la app procesa
+                y puntúa en interacciones distintas)
+        """
+        self.trazar_memoria = trazar_memoria
+        self.mediciones = list(mediciones or [])
+
+    @contextmanager
+    def medir(self, etapa, filas=None):
+        """
+        Mide el bloque como una etapa
+
+            with perfil.medir('limpieza', filas=len(df)) as medicion:
+                df_limpio, _ = limpiar_datos(df)
+        """
+        medicion = MedicionEtapa(etapa, filas)
+        iniciado_aca = self.trazar_memoria and not tracemalloc.is_tracing()
+        if iniciado_aca:
+            tracemalloc.start()
+        if self.trazar_memoria:
+            tracemalloc.reset_peak()
+            memoria_inicial, _ = tracemalloc.get_traced_memory()
+
+        inicio = time.perf_counter()
+        try:
+            yield medicion
+        finally:
+            medicion.segundos = time.perf_counter() - inicio
+            medicion.rss_mb = rss_mb()
+            medicion.pico_rss_mb = pico_rss_mb()
+            if self.trazar_memoria:
+                _, pico = tracemalloc.get_traced_memory()
+                medicion.memoria_pico_mb = (pico - memoria_inicial) / MB
+            if iniciado_aca:
+                tracemalloc.stop()
+            self.mediciones.append(medicion)
+
+    @property
+    def segundos_total(self):
+        return sum(m.segundos for m in self.mediciones)
+
+    def como_dict(self):
+        return [medicion.como_dict() for medicion in self.mediciones]
+
+    def por_etapa(self):
+        """
+        Una medición por etapa, en orden de aparición. En el modo por lotes cada
+        etapa se mide una vez por lote: se suman tiempos y filas y se toma el
+        máximo de memoria
+        """
+        etapas = {}
+        for m in self.mediciones:
+            total = etapas.get(m.etapa)
+            if total is None:
+                total = etapas[m.etapa] = MedicionEtapa(m.etapa, 0)
+                total.segundos = 0.0
+            total.segundos += m.segundos
+            total.filas += m.filas or 0
+            for campo in ('rss_mb', 'pico_rss_mb', 'memoria_pico_mb', 'memoria_df_mb'):
+                valores = [v for v in (getattr(total, campo), getattr(m, campo)) if v is not None]
+                setattr(total, campo, max(valores) if valores else None)
+        return list(etapas.values())
+
+    def registrar_log(self, **contexto):
+        """
+        Escribe la corrida en el log de rendimiento como una línea JSON
+        contexto: archivo, universidad, modo... (lo que identifique la corrida)
+        """
+        registro = {
+            'fecha': datetime.now().isoformat(timespec='seconds'),
+            **contexto,
+            'segundos_total': self.segundos_total,
+            'etapas': [m.como_dict() for m in self.por_etapa()],
+        }
+        logger.info(json.dumps(registro, ensure_ascii=False, default=str))
+        return registro
+
+    def imprimir(self):
+        """Tabla por consola (scripts y benchmark)"""
+        for m in self.por_etapa():
+            filas_s = f"{m.filas_por_segundo:>12,.0f} filas/s" if m.filas_por_segundo else " " * 19
+            memoria = f" | {m.memoria_pico_mb:>8.1f} MB asignados" if m.memoria_pico_mb is not None else ""
+            print(f"   {m.etapa:<13} {m.segundos*1000:>10.1f} ms | {filas_s}{memoria}")
@@ -0,0 +1,63 @@
+"""
+Reporte de Pipeline - Smart Scoring
+Eventos estructurados que el pipeline emite en lugar de escribir en la interfaz
+
+Las funciones de scoring.pipeline no conocen Streamlit: registran lo que
+hicieron (columnas eliminadas, duplicados, universidad detectada...) en un
+Reporte, y cada capa decide cómo mostrarlo. La app lo renderiza con
+st.info/st.success/st.warning/st.error; los scripts lo imprimen.
+"""
+
+NIVELES = ('info', 'exito', 'aviso', 'error')
+
+class Evento:
+    """Un mensaje del pipeline con su nivel y la etapa que lo generó"""
+
+    __slots__ = ('nivel', 'etapa', 'mensaje')
+
+    def __init__(self, nivel, etapa, mensaje):
+        if nivel not in NIVELES:
+            raise ValueError(f"Nivel de evento desconocido: {nivel}")
+        self.nivel = nivel
+        self.etapa = etapa
+        self.mensaje = mensaje
+
+    def __repr__(self):
+        return f"Evento({self.nivel!r}, {self.etapa!r}, {self.mensaje!r})"
+
+class Reporte:
+    """
+    Resultado estructurado de una corrida del pipeline
+
+    - datos: conteos y decisiones (duplicados, universidad, columnas...) para
+      uso programático
+    - eventos: mensajes en orden, listos para mostrar al usuario
+    """
+
+    def __init__(self):
+        self.datos = {}
+        self.eventos = []
+
+    def registrar(self, nivel, etapa, mensaje):
+        self.eventos.append(Evento(nivel, etapa, mensaje))
+
+    def info(self, etapa, mensaje):
+        self.registrar('info', etapa, mensaje)
+
+    def exito(self, etapa, mensaje):
+        self.registrar('exito', etapa, mensaje)
+
+    def aviso(self, etapa, mensaje):
+        self.registrar('aviso', etapa, mensaje)
+
+    def error(self, etapa, mensaje):
+        self.registrar('error', etapa, mensaje)
+
+    def eventos_de(self, etapa):
+        """Eventos de una etapa ('limpieza', 'features', 'codificacion'...)"""
+        return [evento for evento in self.eventos if evento.etapa == etapa]
+
+    def imprimir(self, etapa=None):
+        """Muestra los eventos por consola (scripts y jobs batch)"""
+        for evento in (self.eventos if etapa is None else self.eventos_de(etapa)):
+            print(f"[{evento.etapa}] {evento.mensaje}")
@@ -0,0 +1,98 @@
+"""
+Clasificador de Resoluciones - Smart Scoring
+Categoría y target binario de la columna Resolución, compartido por app y scripts
+
+Las resoluciones tienen unas decenas de valores distintos en más de 100k filas:
+la columna se factoriza, cada valor distinto se clasifica una sola vez y los
+resultados se expanden con los códigos (categórica + int8).
+
+Orden de clasificación de cada valor (sin espacios y sin distinguir mayúsculas):
+1. 'resolution_mappings' del config, coincidencia exacta
+2. 'resolution_patterns', la primera categoría con un patrón contenido en el
+   valor (variantes que el CRM escribe distinto: 'Matriculado 2024'...)
+3. 'unknown' (target 0)
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .config import cargar_config
+
+CATEGORIA_DESCONOCIDA = 'unknown'
+
+def normalizar_resolucion(valor):
+    """Clave de comparación: sin espacios ni tabs a los lados y en minúsculas"""
+    return str(valor).strip().casefold()
+
+class ClasificadorResoluciones:
+    """Mapeo exacto + patrones de resolution_mappings/resolution_patterns"""
+
+    def __init__(self, mapeo, a_binario, patrones=None):
+        self.categorias = list(mapeo) + [CATEGORIA_DESCONOCIDA]
+        self.exactos = {
+            normalizar_resolucion(valor): categoria
+            for categoria, valores in mapeo.items()
+            for valor in valores
+        }
+        self.patrones = [
+            (categoria, [normalizar_resolucion(patron) for patron in lista])
+            for categoria, lista in (patrones or {}).items()
+        ]
+        self.binario = np.array(
+            [a_binario.get(categoria, 0) for categoria in self.categorias], dtype=np.int8
+        )
+
+    @classmethod
+    def desde_config(cls, config):
+        return cls(
+            mapeo=config['resolution_mappings'],
+            a_binario=config['resolution_to_binary'],
+            patrones=config.get('resolution_patterns')
+        )
+
+    def clasificar(self, resolucion):
+        """Categoría de un único valor"""
+        if pd.isna(resolucion):
+            return CATEGORIA_DESCONOCIDA
+
+        texto = normalizar_resolucion(resolucion)
+        categoria = self.exactos.get(texto)
+        if categoria is not None:
+            return categoria
+
+        for categoria, patrones in self.patrones:
+            if any(patron in texto for patron in patrones):
+                return categoria
+        return CATEGORIA_DESCONOCIDA
+
+    def es_positiva(self, resolucion):
+        """1 si la resolución cuenta como matrícula, 0 si no"""
+        return int(self.binario[self.categorias.index(self.clasificar(resolucion))])
+
+    def clasificar_columna(self, serie):
+        """
+        Clasifica una columna completa clasificando solo sus valores distintos
+
+        Returns:
+            (categorias, binaria) - pd.Categorical con todas las categorías del
+            config y np.ndarray int8 con el target, alineados con la serie
+        """
+        codigos, unicos = pd.factorize(serie)
+        indice = {categoria: i for i, categoria in enumerate(self.categorias)}
+        codigos_unicos = np.fromiter(
+            (indice[self.clasificar(valor)] for valor in unicos), dtype=np.int16, count=len(unicos)
+        )
+
+        # Los nulos (código -1) van a 'unknown', la última categoría
+        codigos_unicos = np.append(codigos_unicos, indice[CATEGORIA_DESCONOCIDA]).astype(np.int16)
+        codigos_filas = codigos_unicos[codigos]
+
+        categorias = pd.Categorical.from_codes(codigos_filas, categories=self.categorias)
+        return categorias, self.binario[codigos_filas]
+
+@lru_cache(maxsize=None)
+def cargar_clasificador_resoluciones():
+    """Clasificador armado desde el config (una vez por proceso)"""
+    return ClasificadorResoluciones.desde_config(cargar_config())
@@ -0,0 +1,261 @@
+"""
+Servicio de Scoring por Lead - Smart Scoring
+Servidor HTTP asíncrono (Tornado) con el modelo cargado una sola vez
+
+Cada pedido entra a una cola; un agrupador junta los pedidos concurrentes en
+micro-lotes (hasta max_lote leads o max_espera_ms de espera) y los pasa por la
+misma cadena que la app: limpieza → crear_features → preparar_datos_prediccion
+→ predict_proba. El cálculo corre en un hilo aparte para que el event loop
+siga aceptando pedidos mientras tanto (el siguiente lote se arma solo).
+
+Endpoints:
+    GET  /salud        → estado del servicio y parámetros del agrupador
+    POST /score        → un lead (objeto JSON con las columnas del CRM)
+    POST /score/lote   → lista de leads (o {"leads": [...]})
+"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import pandas as pd
+import tornado.web
+
+from .features import crear_features
+from .pipeline import (
+    MAPEO_COLUMNAS, asignar_scores, detectar_universidad, limpiar_datos, preparar_datos_prediccion
+)
+
+MAX_LOTE_DEFAULT = 64
+MAX_ESPERA_MS_DEFAULT = 5
+
+# Esquema fijo de entrada (nombres estándar) y valor de las claves que el lead
+# no trae: el mismo resultado que da crear_features cuando falta la columna
+# (contadores en 0; categorías y email nulos caen en su valor por defecto; las
+# fechas nulas, como una celda vacía del CRM). Así un lead arma las mismas
+# columnas solo que en cualquier micro-lote y su score no depende de con quién
+# lo comparte
+ENTRADA_SERVICIO = {
+    'EMLMAIL': None,
+    'Programa interes': None,
+    'Base de datos': None,
+    'UTM Source': None,
+    'UTM Medium': None,
+    'WhatsApp entrante': None,
+    'Fecha insert Lead': None,
+    'Fecha y hora de actualización': None,
+    'CONTADOR_LLAMADOS_TEL': 0,
+    'Llamadas_discador': 0,
+}
+COLUMNAS_NUMERICAS = ('CONTADOR_LLAMADOS_TEL', 'Llamadas_discador')
+
+def registro_normalizado(lead):
+    """Lead con claves estándar (MAPEO_COLUMNAS) y las de ENTRADA_SERVICIO completas"""
+    normalizado = dict(ENTRADA_SERVICIO)
+    for clave, valor in lead.items():
+        clave = str(clave).strip()
+        normalizado[MAPEO_COLUMNAS.get(clave, clave)] = valor
+    return normalizado
+
+@lru_cache(maxsize=4096)
+def _detectar_universidad_lead(columnas, base, programa):
+    """
+    detectar_universidad sobre un solo lead, memoizado: solo depende de los
+    nombres de columnas, 'Base de datos' y 'Programa interes'
+    """
+    fila = dict.fromkeys(columnas)
+    if 'Base de datos' in fila:
+        fila['Base de datos'] = base
+    if 'Programa interes' in fila:
+        fila['Programa interes'] = programa
+    return detectar_universidad(pd.DataFrame([fila], columns=list(columnas)))
+
+def puntuar_registros(registros, modelo, encoders, universidad=None):
+    """
+    Scores de una lista de leads (dicts con columnas del CRM), en el mismo orden
+
+    La universidad de cada lead sale de su campo 'universidad', si no de la
+    universidad por defecto del servicio y, como último recurso, de
+    detectar_universidad sobre ese lead.
+
+    Returns: lista de dicts {probabilidad, categoria, universidad}
+    """
+    normalizados = [registro_normalizado(lead) for lead in registros]
+    df = pd.DataFrame.from_records(normalizados)
+    # El dtype de cada columna no puede depender del resto del lote:
+    # normalizar_columnas convierte el Si/No de WhatsApp solo en columnas object
+    # y los contadores nulos tienen que ser NaN (no None) también en un lead solo
+    df['WhatsApp entrante'] = pd.Series(
+        [lead['WhatsApp entrante'] for lead in normalizados], index=df.index, dtype=object
+    )
+    for columna in COLUMNAS_NUMERICAS:
+        df[columna] = pd.to_numeric(df[columna], errors='coerce').astype('float64')
+    df['universidad'] = [
+        lead.get('universidad') or universidad or _detectar_universidad_lead(
+            tuple(lead), str(lead.get('Base de datos')), str(lead.get('Programa interes'))
+        )
+        for lead in registros
+    ]
+
+    # Cada fila es un pedido distinto: no se eliminan duplicados ni columnas vacías
+    df_limpio, _ = limpiar_datos(df, eliminar_columnas_vacias=False, eliminar_duplicados=False)
+    df_features = crear_features(df_limpio)
+
+    X, reporte = preparar_datos_prediccion(df_features, encoders)
+    if X is None:
+        raise ValueError(f"Faltan columnas necesarias: {reporte.datos['columnas_faltantes']}")
+    asignar_scores(df_features, modelo.predict_proba(X)[:, 1])
+
+    categorias = df_features['Score_Categoria'].astype(object).where(df_features['Score_Categoria'].notna(), None)
+    return [
+        {'probabilidad': float(probabilidad), 'categoria': categoria, 'universidad': uni}
+        for probabilidad, categoria, uni in zip(
+            df_features['Probabilidad_Matricula'], categorias, df_features['universidad']
+        )
+    ]
+
+class AgrupadorLotes:
+    """Junta pedidos concurrentes en micro-lotes para una sola llamada al modelo"""
+
+    def __init__(self, puntuar, max_lote=MAX_LOTE_DEFAULT, max_espera_ms=MAX_ESPERA_MS_DEFAULT):
+        """
+        Args:
+            puntuar: función (lista de leads) -> lista de resultados, en orden
+            max_lote: máximo de leads por llamada al modelo
+            max_espera_ms: cuánto se espera a que lleguen más pedidos antes de puntuar
+        """
+        self.puntuar = puntuar
+        self.max_lote = max_lote
+        self.max_espera = max_espera_ms / 1000
+        self.cola = None
+        self.ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scoring')
+        self.lotes = 0
+        self.leads = 0
+
+    def iniciar(self):
+        """Crea la cola y la tarea del agrupador (llamar con el event loop corriendo)"""
+        self.cola = asyncio.Queue()
+        return asyncio.create_task(self._bucle())
+
+    async def puntuar_leads(self, leads):
+        """Encola los leads y espera sus resultados"""
+        loop = asyncio.get_running_loop()
+        futuros = []
+        for lead in leads:
+            futuro = loop.create_future()
+            self.cola.put_nowait((lead, futuro))
+            futuros.append(futuro)
+        return await asyncio.gather(*futuros)
+
+    async def _armar_lote(self):
+        """Primer pedido disponible + los que lleguen dentro de max_espera"""
+        loop = asyncio.get_running_loop()
+        lote = [await self.cola.get()]
+        limite = loop.time() + self.max_espera
+
+        while len(lote) < self.max_lote:
+            if not self.cola.empty():
+                lote.append(self.cola.get_nowait())
+                continue
+            restante = limite - loop.time()
+            if restante <= 0:
+                break
+            try:
+                lote.append(await asyncio.wait_for(self.cola.get(), restante))
+            except asyncio.TimeoutError:
+                break
+
+        return lote
+
+    async def _bucle(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = await self._armar_lote()
+            leads = [lead for lead, _ in lote]
+
+            try:
+                resultados = await loop.run_in_executor(self.ejecutor, self.puntuar, leads)
+            except Exception:
+                # Un lead malformado no debe tirar el lote completo: se reintenta uno por uno
+                resultados = [
+                    await loop.run_in_executor(self.ejecutor, self._puntuar_uno, lead)
+                    for lead in leads
+                ]
+
+            self.lotes += 1
+            self.leads += len(lote)
+            for (_, futuro), resultado in zip(lote, resultados):
+                if futuro.done():
+                    continue
+                if isinstance(resultado, Exception):
+                    futuro.set_exception(resultado)
+                else:
+                    futuro.set_result(resultado)
+
+    def _puntuar_uno(self, lead):
+        """Resultado de un lead o la excepción que produjo"""
+        try:
+            return self.puntuar([lead])[0]
+        except Exception as e:
+            return e
+
+class _ManejadorBase(tornado.web.RequestHandler):
+    def initialize(self, agrupador):
+        self.agrupador = agrupador
+
+    def responder_error(self, codigo, mensaje):
+        self.set_status(codigo)
+        self.finish({'error': mensaje})
+
+    def leer_json(self):
+        """Cuerpo del pedido como JSON (None si no es válido)"""
+        try:
+            return json.loads(self.request.body)
+        except (ValueError, UnicodeDecodeError):
+            return None
+
+    def write_error(self, status_code, **kwargs):
+        self.finish({'error': self._reason})
+
+class ManejadorSalud(_ManejadorBase):
+    def get(self):
+        self.write({
+            'estado': 'ok',
+            'max_lote': self.agrupador.max_lote,
+            'max_espera_ms': self.agrupador.max_espera * 1000,
+            'lotes': self.agrupador.lotes,
+            'leads': self.agrupador.leads,
+        })
+
+class ManejadorScore(_ManejadorBase):
+    async def post(self):
+        lead = self.leer_json()
+        if not isinstance(lead, dict):
+            return self.responder_error(400, "Se esperaba un objeto JSON con los datos del lead")
+        try:
+            resultado, = await self.agrupador.puntuar_leads([lead])
+        except Exception as e:
+            return self.responder_error(422, f"No se pudo puntuar el lead: {e}")
+        self.write(resultado)
+
+class ManejadorScoreLote(_ManejadorBase):
+    async def post(self):
+        cuerpo = self.leer_json()
+        leads = cuerpo.get('leads') if isinstance(cuerpo, dict) else cuerpo
+        if not isinstance(leads, list) or not all(isinstance(lead, dict) for lead in leads):
+            return self.responder_error(400, "Se esperaba una lista de leads (objetos JSON)")
+        try:
+            resultados = await self.agrupador.puntuar_leads(leads)
+        except Exception as e:
+            return self.responder_error(422, f"No se pudo puntuar el lote: {e}")
+        self.write({'resultados': resultados})
+
+def crear_aplicacion(agrupador):
+    """Aplicación Tornado con las rutas del servicio"""
+    rutas = {'agrupador': agrupador}
+    return tornado.web.Application([
+        (r"/salud", ManejadorSalud, rutas),
+        (r"/score", ManejadorScore, rutas),
+        (r"/score/lote", ManejadorScoreLote, rutas),
+    ])
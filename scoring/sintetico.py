@@ -0,0 +1,239 @@
+"""
+CRM Sintético - Smart Scoring
+Genera exports del CRM con el esquema de cada universidad, para benchmarks
+
+Los archivos reales no se pueden compartir (datos personales), así que el
+benchmark corre sobre DataFrames con la misma forma: los nombres de columnas
+de cada CRM (validados contra column_mappings de la configuración), las
+resoluciones de resolution_mappings, emails inválidos y duplicados, fechas
+como texto y nulos en proporciones parecidas a las reales.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .config import cargar_config
+
+# Columnas del export en su nombre estándar (el que deja normalizar_columnas)
+COLUMNAS_ESTANDAR = [
+    'dcontacto', 'Nombre y Apellido', 'Resolución', 'Ultima resolución',
+    'Estado principal', 'Base de datos', 'Canal', 'EMLMAIL', 'TELTELEFONO',
+    'WhatsApp', 'WhatsApp entrante', 'CONTADOR_LLAMADOS_TEL', 'Llamadas_discador',
+    'Fecha insert Lead', 'Fecha y hora de actualización',
+    'Fecha y hora del próximo llamado', 'Programa interes',
+    'UTM Source', 'UTM Medium', 'UTM Campaing', 'UTM Content',
+]
+
+# Nombres propios de cada CRM (estándar → nombre en el export)
+_ALIAS_CREXE = {
+    'dcontacto': 'Idcontacto',
+    'Resolución': 'Resolucion',
+    'Ultima resolución': 'Ultima resolucion',
+    'Estado principal': 'TXTESTADOPRINCIPAL',
+    'Llamadas_discador': 'Lamadas_discador',
+    'WhatsApp entrante': 'CHKENTRANTEWHATSAPP',
+    'WhatsApp': 'TELWHATSAPP',
+}
+
+ESQUEMAS = {
+    'UNAB': {},
+    'Unisangil': {},
+    'Crexe': _ALIAS_CREXE,
+    'Anahuac': _ALIAS_CREXE,
+    'UEES': {
+        **_ALIAS_CREXE,
+        'CONTADOR_LLAMADOS_TEL': 'Contador de Llamadas',
+        'Fecha insert Lead': 'Fecha Inserción Leads',
+        'UTM Source': 'UTM Origen',
+    },
+}
+
+# Columnas que solo existen en algunos CRMs
+COLUMNAS_EXTRA = {
+    'UEES': ['Operador', 'Nombre Operador'],
+}
+
+# Formato de las fechas exportadas como texto
+FORMATOS_FECHA = {
+    'UNAB': '%Y-%m-%d %H:%M:%S',
+    'Unisangil': '%Y-%m-%d %H:%M:%S',
+    'Crexe': '%d/%m/%Y %H:%M',
+    'Anahuac': '%d/%m/%Y %H:%M',
+    'UEES': '%d/%m/%Y %H:%M:%S',
+}
+
+# Texto que identifica a cada universidad en 'Base de datos'
+NOMBRE_EN_BASE = {
+    'UNAB': 'UNAB',
+    'Unisangil': 'UNISANGIL',
+    'Crexe': 'CREXE',
+    'Anahuac': 'ANAHUAC',
+    'UEES': 'UEES',
+}
+
+# Proporción de cada grupo de resolution_mappings (~3% de matriculados)
+PESOS_RESOLUCION = {
+    'success': 0.03,
+    'in_progress': 0.06,
+    'rejected_enrolled_elsewhere': 0.02,
+    'rejected_no_contact': 0.45,
+    'rejected_phone_issue': 0.05,
+    'rejected_whatsapp_issue': 0.07,
+    'rejected_not_interested': 0.12,
+    'rejected_other': 0.05,
+    'informational': 0.15,
+}
+
+PROGRAMAS = [
+    'MAESTRÍA EN DERECHO PENAL', 'Maestría en Administración de Empresas',
+    'ESPECIALIZACIÓN EN GERENCIA DE LA SALUD', 'Especializacion en Epidemiologia',
+    'TECNOLOGÍA EN DESARROLLO DE SOFTWARE', 'Administración de Negocios Internacionales',
+    'Contaduría Pública', 'DERECHO', 'Psicología', 'Ingeniería de Sistemas',
+    'Licenciatura en Educación', 'Neurociencia aplicada', 'Mindfulness y bienestar',
+]
+
+TIPOS_BASE = ['Pregrado', 'Posgrado', 'Postgrado Virtual', 'LETO', 'Consolidado', 'Eventos']
+CANALES = ['Web', 'WSP', 'Facebook Lead Ads', 'Llamada entrante', 'Referido']
+UTM_SOURCE = ['google', 'facebook', 'fb', 'instagram', 'tiktok', 'bing', 'Google', 'Facebook']
+UTM_MEDIUM = ['paid_social', 'cpc', 'organic', 'social', 'email', 'referral', 'Paid']
+NOMBRES = ['María', 'José', 'Ana', 'Juan', 'Lucía', 'Carlos', 'Sofía', 'Andrés', 'Valentina', 'Diego']
+APELLIDOS = ['González', 'Rodríguez', 'Pérez', 'Gómez', 'Martínez', 'López', 'Díaz', 'Torres']
+DOMINIOS = ['gmail.com', 'hotmail.com', 'outlook.com', 'yahoo.com', 'unab.edu.co', 'uees.edu.ec']
+EMAILS_INVALIDOS = ['sin correo', 'no tiene', 'correo@', '@gmail.com', 'nombre@dominio', '0']
+
+def esquema_universidad(universidad):
+    """
+    Nombres de columnas del export de una universidad (estándar → origen)
+    Cada alias tiene que estar en column_mappings: si no, la normalización no
+    lo reconocería y el benchmark mediría un esquema que no existe
+    """
+    if universidad not in ESQUEMAS:
+        raise ValueError(f"Universidad sin esquema sintético: {universidad}")
+
+    mapeos = cargar_config()['column_mappings']
+    alias = ESQUEMAS[universidad]
+    for estandar, origen in alias.items():
+        if mapeos.get(origen) != estandar:
+            raise ValueError(f"'{origen}' no está mapeado a '{estandar}' en column_mappings")
+
+    return {col: alias.get(col, col) for col in COLUMNAS_ESTANDAR}
+
+def _elegir(rng, valores, n, nulos=0.0):
+    """Muestra de valores (object) con una proporción de nulos"""
+    muestra = rng.choice(np.array(valores, dtype=object), size=n)
+    if nulos:
+        muestra[rng.random(n) < nulos] = None
+    return muestra
+
+def _resoluciones(rng, n):
+    """Resoluciones reales de la configuración con pesos por grupo"""
+    grupos = cargar_config()['resolution_mappings']
+    nombres = [grupo for grupo in PESOS_RESOLUCION if grupo in grupos]
+    pesos = np.array([PESOS_RESOLUCION[grupo] for grupo in nombres])
+
+    grupo_fila = rng.choice(len(nombres), size=n, p=pesos / pesos.sum())
+    resoluciones = np.empty(n, dtype=object)
+    for i, grupo in enumerate(nombres):
+        filas = np.flatnonzero(grupo_fila == i)
+        resoluciones[filas] = rng.choice(np.array(grupos[grupo], dtype=object), size=len(filas))
+    return resoluciones
+
+def _emails(rng, n, tasa_invalidos=0.05, tasa_nulos=0.04):
+    """Un email por lead, con inválidos y nulos"""
+    dominios = rng.choice(np.array(DOMINIOS, dtype=object), size=n)
+    emails = ('lead' + pd.Series(rng.permutation(n)).astype(str) + '@' + dominios).to_numpy(dtype=object, copy=True)
+
+    # Espacios y mayúsculas como vienen del formulario
+    sucios = rng.random(n) < 0.03
+    emails[sucios] = [' ' + e.upper() + ' ' for e in emails[sucios]]
+
+    tipo = rng.random(n)
+    invalidos = tipo < tasa_invalidos
+    emails[invalidos] = rng.choice(np.array(EMAILS_INVALIDOS, dtype=object), size=invalidos.sum())
+    emails[(tipo >= tasa_invalidos) & (tipo < tasa_invalidos + tasa_nulos)] = None
+    return emails
+
+def _repetir_leads(rng, emails, programas, tasa):
+    """Algunos leads se cargan otra vez con el mismo email y programa (duplicados)"""
+    repetidos = np.flatnonzero(rng.random(len(emails)) < tasa)
+    originales = rng.integers(0, len(emails), size=len(repetidos))
+    emails[repetidos] = emails[originales]
+    programas[repetidos] = programas[originales]
+
+def _fechas_texto(fechas, formato, faltantes):
+    """Fechas como texto en el formato del CRM (None donde faltan)"""
+    texto = fechas.strftime(formato).to_numpy(dtype=object, copy=True)
+    texto[faltantes] = None
+    return texto
+
+def generar_crm(universidad, n_filas, semilla=0, tasa_duplicados=0.06):
+    """
+    DataFrame con la forma del export del CRM de una universidad
+
+    Args:
+        universidad: una de config['universities']
+        n_filas: cantidad de leads (incluye duplicados)
+        semilla: para que dos corridas generen exactamente lo mismo
+        tasa_duplicados: proporción de leads repetidos (mismo email + programa)
+
+    Returns: DataFrame con los nombres de columnas de ese CRM (sin normalizar)
+    """
+    esquema = esquema_universidad(universidad)
+    rng = np.random.default_rng([semilla, list(ESQUEMAS).index(universidad)])
+    n = n_filas
+    estilo_crexe = esquema['WhatsApp entrante'] == 'CHKENTRANTEWHATSAPP'
+
+    # Fechas: alta en los últimos 18 meses, actualización días después
+    alta = pd.Timestamp('2024-06-01') + pd.to_timedelta(rng.integers(0, 540 * 86400, size=n), unit='s')
+    actualizacion = alta + pd.to_timedelta(rng.exponential(12 * 86400, size=n).astype(np.int64), unit='s')
+    proximo = actualizacion + pd.to_timedelta(rng.integers(3600, 15 * 86400, size=n), unit='s')
+    formato = FORMATOS_FECHA[universidad]
+
+    resoluciones = _resoluciones(rng, n)
+    llamadas = rng.poisson(3.0, size=n).astype(float)
+    llamadas[rng.random(n) < 0.05] = np.nan
+    discador = rng.poisson(1.5, size=n).astype(float)
+    discador[rng.random(n) < 0.10] = np.nan
+
+    if estilo_crexe:
+        whatsapp_entrante = _elegir(rng, ['Si', 'No'], n, nulos=0.3)
+    else:
+        whatsapp_entrante = np.where(rng.random(n) < 0.35, 'entrante', None).astype(object)
+
+    emails = _emails(rng, n)
+    programas = _elegir(rng, PROGRAMAS, n, nulos=0.03)
+    _repetir_leads(rng, emails, programas, tasa_duplicados)
+
+    nombre_base = NOMBRE_EN_BASE[universidad]
+    bases = np.array([f"{i} - {nombre_base} {tipo}" for i, tipo in enumerate(TIPOS_BASE, start=101)], dtype=object)
+
+    columnas = {
+        'dcontacto': np.arange(1_000_000, 1_000_000 + n, dtype=np.int64),
+        'Nombre y Apellido': _elegir(rng, NOMBRES, n) + ' ' + _elegir(rng, APELLIDOS, n),
+        'Resolución': resoluciones,
+        'Ultima resolución': np.where(rng.random(n) < 0.7, resoluciones, _resoluciones(rng, n)),
+        'Estado principal': _elegir(rng, ['Abierto', 'Cerrado', 'En gestión'], n, nulos=0.05),
+        'Base de datos': rng.choice(bases, size=n),
+        'Canal': _elegir(rng, CANALES, n, nulos=0.05),
+        'EMLMAIL': emails,
+        'TELTELEFONO': rng.integers(3_000_000_000, 3_999_999_999, size=n).astype(float),
+        'WhatsApp': np.where(rng.random(n) < 0.6, rng.integers(3_000_000_000, 3_999_999_999, size=n), np.nan),
+        'WhatsApp entrante': whatsapp_entrante,
+        'CONTADOR_LLAMADOS_TEL': llamadas,
+        'Llamadas_discador': discador,
+        'Fecha insert Lead': _fechas_texto(alta, formato, rng.random(n) < 0.01),
+        'Fecha y hora de actualización': _fechas_texto(actualizacion, formato, rng.random(n) < 0.04),
+        'Fecha y hora del próximo llamado': _fechas_texto(proximo, formato, rng.random(n) < 0.6),
+        'Programa interes': programas,
+        'UTM Source': _elegir(rng, UTM_SOURCE, n, nulos=0.25),
+        'UTM Medium': _elegir(rng, UTM_MEDIUM, n, nulos=0.25),
+        'UTM Campaing': _elegir(rng, ['matriculas_2025', 'posgrados_q3', 'retargeting', 'brand'], n, nulos=0.3),
+        'UTM Content': _elegir(rng, ['video', 'carrusel', 'imagen', 'texto'], n, nulos=0.4),
+    }
+
+    df = pd.DataFrame({esquema[col]: columnas[col] for col in COLUMNAS_ESTANDAR})
+
+    for col in COLUMNAS_EXTRA.get(universidad, []):
+        df[col] = _elegir(rng, ['op01', 'op02', 'op03', 'op04'] if col == 'Operador' else NOMBRES, n)
+
+    return df
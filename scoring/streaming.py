@@ -0,0 +1,163 @@
+"""
+Scoring por Lotes - Smart Scoring
+Procesa archivos del CRM muy grandes en lotes de tamaño fijo
+
+Cada lote pasa por limpieza → features → codificación → predict_proba y sus
+scores se escriben al archivo de salida apenas se calculan, así que la memoria
+queda acotada por el tamaño del lote y no por el del archivo.
+Diferencias con el modo completo:
+- La salida conserva el orden de entrada (no se ordena por probabilidad)
+- No se eliminan columnas vacías (todos los lotes tienen el mismo esquema)
+- La universidad se detecta una sola vez, con el primer lote. El último
+  criterio de detectar_universidad (cantidad de leads) ve el tamaño del lote
+  y no el del archivo, así que conviene indicarla explícitamente
+- Los duplicados (email + programa) se detectan también entre lotes
+"""
+
+import numpy as np
+import pandas as pd
+
+from .duplicados import ConjuntoHashes
+from .excel import leer_excel
+from .features import crear_features
+from .pipeline import (
+    COLUMNAS_TEXTO,
+    asignar_scores,
+    detectar_universidad,
+    limpiar_datos,
+    preparar_datos_prediccion
+)
+from .rendimiento import Perfil
+
+TAMANO_LOTE_DEFAULT = 50_000
+
+def es_csv(origen):
+    """True si el origen (ruta o archivo subido) es un CSV"""
+    nombre = getattr(origen, 'name', origen)
+    return str(nombre).lower().endswith('.csv')
+
+def leer_por_lotes(origen, tamano_lote=TAMANO_LOTE_DEFAULT):
+    """
+    Itera el archivo en DataFrames de a lo sumo tamano_lote filas
+    Los CSV se leen en streaming; los Excel no se pueden leer por partes,
+    así que se cargan una vez (todas las columnas, para que la salida las
+    conserve como con un CSV) y se recorren en porciones.
+    """
+    if es_csv(origen):
+        yield from pd.read_csv(
+            origen,
+            chunksize=tamano_lote,
+            dtype={col: str for col in COLUMNAS_TEXTO},
+            low_memory=False
+        )
+    else:
+        df = leer_excel(origen, solo_utiles=False)
+        for inicio in range(0, len(df), tamano_lote):
+            yield df.iloc[inicio:inicio + tamano_lote]
+
+class ResumenScores:
+    """Acumula métricas de los scores sin guardar todos los leads en memoria"""
+
+    def __init__(self, top_n=20, bins=30):
+        self.top_n = top_n
+        self.bordes = np.linspace(0, 100, bins + 1)
+        self.histograma = np.zeros(bins, dtype=np.int64)
+        self.categorias = {}
+        self.total = 0
+        self.suma = 0.0
+        self.maximo = 0.0
+        self.altos = 0
+        self.duplicados = 0
+        self.lotes = 0
+        self.top = None
+
+    def agregar(self, df_lote):
+        probabilidades = df_lote['Probabilidad_Matricula'].to_numpy()
+
+        self.lotes += 1
+        self.total += len(probabilidades)
+        self.suma += float(probabilidades.sum())
+        self.maximo = max(self.maximo, float(probabilidades.max(initial=0)))
+        self.altos += int((probabilidades > 60).sum())
+        self.histograma += np.histogram(probabilidades, bins=self.bordes)[0]
+
+        for categoria, cantidad in df_lote['Score_Categoria'].value_counts().items():
+            self.categorias[categoria] = self.categorias.get(categoria, 0) + int(cantidad)
+
+        candidatos = df_lote.nlargest(self.top_n, 'Probabilidad_Matricula')
+        if self.top is not None:
+            candidatos = pd.concat([self.top, candidatos])
+        self.top = candidatos.nlargest(self.top_n, 'Probabilidad_Matricula')
+
+    @property
+    def promedio(self):
+        return self.suma / self.total if self.total else 0.0
+
+def puntuar_por_lotes(origen, destino, modelo, encoders, tamano_lote=TAMANO_LOTE_DEFAULT,
+                      universidad=None, al_procesar_lote=None, perfil=None, claves_vistas=None):
+    """
+    Genera scores de un archivo del CRM lote a lote y los escribe en destino (CSV)
+
+    Args:
+        origen: ruta o archivo subido (.csv se lee en streaming)
+        destino: ruta del CSV de salida
+        modelo, encoders: artefactos de cargar_modelo()
+        tamano_lote: filas por lote
+        universidad: universidad fija; None = detectarla con el primer lote
+        al_procesar_lote: callback opcional (resumen) llamado después de cada lote
+        perfil: Perfil donde medir cada etapa de cada lote (ver Perfil.por_etapa)
+        claves_vistas: ConjuntoHashes (claves_previas) para descartar también los
+            leads de cargas anteriores; se le agregan las claves del archivo
+            (None = solo duplicados dentro del archivo)
+
+    Returns:
+        ResumenScores con métricas acumuladas y el top de leads
+    """
+    resumen = ResumenScores()
+    perfil = perfil if perfil is not None else Perfil()
+    claves_vistas = claves_vistas if claves_vistas is not None else ConjuntoHashes()
+    columnas_salida = None
+
+    with open(destino, 'w', encoding='utf-8-sig', newline='') as salida:
+        for lote in leer_por_lotes(origen, tamano_lote):
+            if universidad is None:
+                universidad = detectar_universidad(lote)
+
+            with perfil.medir('limpieza', filas=len(lote)) as medicion:
+                df_limpio, reporte = limpiar_datos(
+                    lote, eliminar_columnas_vacias=False, claves_vistas=claves_vistas,
+                    universidad=universidad
+                )
+                medicion.registrar_df(df_limpio)
+            resumen.duplicados += reporte.datos['duplicados']
+
+            if len(df_limpio) == 0:
+                continue
+
+            with perfil.medir('features', filas=len(df_limpio)) as medicion:
+                df_lote = crear_features(df_limpio, universidad=universidad)
+                medicion.registrar_df(df_lote)
+
+            with perfil.medir('codificacion', filas=len(df_lote)):
+                X, reporte = preparar_datos_prediccion(df_lote, encoders, reporte)
+            if X is None:
+                raise ValueError(
+                    f"Faltan columnas necesarias: {reporte.datos['columnas_faltantes']}"
+                )
+
+            with perfil.medir('prediccion', filas=len(X)):
+                asignar_scores(df_lote, modelo.predict_proba(X)[:, 1])
+
+            # El primer lote fija el esquema de salida
+            with perfil.medir('exportacion', filas=len(df_lote)):
+                if columnas_salida is None:
+                    columnas_salida = df_lote.columns
+                    df_lote.to_csv(salida, index=False)
+                else:
+                    df_lote.reindex(columns=columnas_salida).to_csv(salida, index=False, header=False)
+
+            resumen.agregar(df_lote)
+            if al_procesar_lote is not None:
+                al_procesar_lote(resumen)
+
+    return resumen
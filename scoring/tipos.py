@@ -0,0 +1,147 @@
+"""
+Plan de Tipos - Smart Scoring
+Reduce la memoria del dataset combinado eligiendo el tipo más chico por columna
+
+Después del pd.concat de todas las universidades cada texto es un str de
+Python (object) y los flags/contadores son int64/float64. optimizar_tipos()
+aplica el plan de 'data_types' del config:
+- 'category' → categórica (Canal, Base de datos, Programa interes, UTMs...)
+- 'int8' / 'bool' → flags y target (solo si los valores entran sin pérdida)
+- numéricas ('int64'/'float64' y las no declaradas) → el tipo más chico que
+  conserva los valores: enteros con downcast y contadores float32 cuando
+  todos los valores son enteros (exactos hasta 2^24)
+- columnas de texto no declaradas con pocos valores distintos → categórica
+
+Las columnas de fecha y los textos de alta cardinalidad (emails, nombres,
+mensajes) quedan como están.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .config import cargar_config
+
+MB = 1024 * 1024
+
+# Texto no declarado en data_types: categórica si distintos / filas <= umbral
+UMBRAL_CATEGORIA = 0.5
+
+# Mayor entero que float32 representa exacto
+MAX_ENTERO_FLOAT32 = 2 ** 24
+
+def memoria_mb(df):
+    """Memoria del DataFrame contando el contenido de los strings"""
+    return df.memory_usage(index=True, deep=True).sum() / MB
+
+def _a_categoria(serie):
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie
+    return serie.astype('category')
+
+def _a_flag(serie, tipo):
+    """int8/bool solo si no hay nulos y los valores entran en el tipo"""
+    if serie.isna().any() or not (pd.api.types.is_numeric_dtype(serie) or pd.api.types.is_bool_dtype(serie)):
+        return serie
+    if tipo == 'bool':
+        return serie.astype(bool) if serie.isin([0, 1]).all() else serie
+    limites = np.iinfo(tipo)
+    if serie.min() < limites.min or serie.max() > limites.max:
+        return serie
+    return serie.astype(tipo)
+
+def _reducir_numerica(serie):
+    """Tipo numérico más chico que conserva todos los valores"""
+    if pd.api.types.is_bool_dtype(serie) or not pd.api.types.is_numeric_dtype(serie):
+        return serie
+    if pd.api.types.is_integer_dtype(serie):
+        return pd.to_numeric(serie, downcast='integer')
+
+    valores = serie.to_numpy()
+    validos = valores[~np.isnan(valores)]
+    enteros = np.array_equal(validos, np.round(validos)) and (
+        len(validos) == 0 or np.abs(validos).max() <= MAX_ENTERO_FLOAT32
+    )
+    return serie.astype('float32') if enteros and serie.dtype != np.float32 else serie
+
+def aplicar_por_valor(serie, funcion):
+    """
+    Aplica una transformación de texto (Series → Series, valor a valor)
+
+    En una categórica se transforma solo la lista de valores distintos (más el
+    nulo, como 'nan' de astype(str)) y el resultado sigue siendo categórico;
+    en las demás columnas se transforma la columna entera.
+    """
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        return funcion(serie)
+
+    valores = pd.Series(list(serie.cat.categories) + [np.nan], dtype=object)
+    transformados = funcion(valores).to_numpy()
+    codigos = serie.cat.codes.to_numpy()
+    codigos = np.where(codigos < 0, len(valores) - 1, codigos)
+
+    # Dos valores distintos pueden quedar iguales ('WSP' y 'wsp'): se re-factoriza
+    nuevos_codigos, categorias = pd.factorize(transformados)
+    categorica = pd.Categorical.from_codes(nuevos_codigos[codigos], categorias)
+    return pd.Series(categorica.remove_unused_categories(), index=serie.index, name=serie.name)
+
+def optimizar_tipos(df, tipos=None, umbral_categoria=UMBRAL_CATEGORIA):
+    """
+    Aplica el plan de tipos sobre el DataFrame (lo modifica y lo devuelve)
+
+    Args:
+        df: DataFrame combinado (o con features)
+        tipos: plan columna → tipo (por defecto 'data_types' del config)
+        umbral_categoria: proporción de valores distintos hasta la que un texto
+            no declarado se vuelve categórico
+
+    Returns:
+        (df, reporte) con reporte = {'mb_antes', 'mb_despues', 'columnas':
+        {columna: (tipo_antes, tipo_despues)}} solo para las que cambiaron
+    """
+    tipos = cargar_config()['data_types'] if tipos is None else tipos
+    reporte = {'mb_antes': memoria_mb(df), 'columnas': {}}
+
+    for columna in df.columns:
+        serie = df[columna]
+        tipo = tipos.get(columna)
+
+        if tipo == 'category':
+            nueva = _a_categoria(serie)
+        elif tipo in ('int8', 'int16', 'int32', 'bool'):
+            nueva = _a_flag(serie, tipo)
+        elif tipo is not None and tipo.startswith('datetime64'):
+            continue
+        elif serie.dtype == object:
+            distintos = serie.nunique(dropna=True)
+            nueva = _a_categoria(serie) if len(serie) and distintos / len(serie) <= umbral_categoria else serie
+        else:
+            nueva = _reducir_numerica(serie)
+
+        if nueva.dtype != serie.dtype:
+            reporte['columnas'][columna] = (str(serie.dtype), str(nueva.dtype))
+            df[columna] = nueva
+
+    reporte['mb_despues'] = memoria_mb(df)
+    return df, reporte
+
+def tipo_compatible(dtype, esperado):
+    """
+    True si el dtype cumple el tipo declarado en data_types, aceptando las
+    reducciones de optimizar_tipos (float64 → float32, int64 → int32...),
+    enteros en columnas declaradas float y texto guardado como object o como
+    categórica
+    """
+    if str(dtype) == esperado:
+        return True
+    if esperado == 'category' or isinstance(dtype, pd.CategoricalDtype):
+        return {esperado, str(dtype)} <= {'category', 'object', 'str'}
+    tipos_aceptados = 'iuf' if np.dtype(esperado).kind == 'f' else np.dtype(esperado).kind
+    return np.dtype(dtype).kind in tipos_aceptados
+
+def imprimir_reporte_tipos(reporte, titulo="Memoria"):
+    """Resumen por consola del antes/después"""
+    antes, despues = reporte['mb_antes'], reporte['mb_despues']
+    factor = antes / despues if despues else float('inf')
+    print(f"🧮 {titulo}: {antes:,.1f} MB → {despues:,.1f} MB ({factor:.1f}x menos)")
+    for columna, (tipo_antes, tipo_despues) in reporte['columnas'].items():
+        print(f"      - {columna}: {tipo_antes} → {tipo_despues}")
@@ -6,13 +6,21 @@ Desglose de features y contribución al score
 import pandas as pd
 import pickle
 import numpy as np
+import sys
+from pathlib import Path
+
+# Añadir directorio raíz al path para importar el núcleo compartido
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scoring.dataset import cargar_dataset, DATASET_FEATURES
+from scoring.features import FEATURES_MODELO
 
 # Cargar modelo y encoders
 modelo = pickle.load(open('models/modelo_scoring_sin_leakage.pkl', 'rb'))
 encoders = pickle.load(open('models/label_encoders_sin_leakage.pkl', 'rb'))
 
-# Cargar datos procesados
-df = pd.read_csv('data/datos_multi_universidad_features.csv', low_memory=False)
+# Cargar datos procesados (solo las columnas que usa el análisis)
+df = cargar_dataset(DATASET_FEATURES, columnas=['dcontacto', 'Resolución'] + FEATURES_MODELO)
 
 # Buscar el lead 13535 de Anahuac
 lead = df[(df['dcontacto'] == 13535) & (df['universidad'] == 'Anahuac')]
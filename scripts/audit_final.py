@@ -7,19 +7,22 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 import json
+import sys
+
+# Añadir directorio raíz al path para importar el núcleo compartido
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scoring.dataset import cargar_dataset, DATASET_FEATURES
 
 def verificar_realismo_datos():
     """Verifica que los datos sean realistas y consistentes"""
     
-    BASE_DIR = Path(__file__).parent.parent
-    DATA_DIR = BASE_DIR / "data"
-    
     print("="*80)
     print("AUDITORÍA FINAL DEL SISTEMA - VERIFICACIÓN DE REALISMO")
     print("="*80)
     
-    # Cargar datos
-    df = pd.read_csv(DATA_DIR / "datos_multi_universidad_features.csv", low_memory=False)
+    # Cargar datos (la sección 8 revisa el esquema completo)
+    df = cargar_dataset(DATASET_FEATURES)
     
     problemas = []
     advertencias = []
@@ -52,7 +55,7 @@ def verificar_realismo_datos():
     print("="*80)
     
     if 'resolucion_categoria' in df.columns:
-        dist = df['resolucion_categoria'].value_counts()
+        dist = df['resolucion_categoria'].value_counts().loc[lambda conteo: conteo > 0]
         total = len(df)
         
         print("\nDistribución global:")
@@ -0,0 +1,139 @@
+"""
+Benchmark de Arranque de la App - Smart Scoring
+Mide cuánto tarda app.py en estar usable, siempre en procesos nuevos (en frío)
+
+1. Servidor: `streamlit run app.py` hasta que /_stcore/health responde
+2. Primera página: primera ejecución del script (imports + render) con
+   streamlit.testing.AppTest, es el tiempo hasta la primera interacción
+3. Interacción: una segunda ejecución del script (lo que cuesta cada clic)
+4. Módulos pesados que quedaron cargados después de la primera página
+   (plotly, scikit-learn, openpyxl, xlrd): deberían cargarse recién al subir
+   un archivo o pedir scores
+
+Uso:
+    python scripts/benchmark_arranque.py
+    python scripts/benchmark_arranque.py --repeticiones 5 --salida arranque.json
+"""
+
+import sys
+import io
+import json
+import time
+import socket
+import argparse
+import statistics
+import subprocess
+import urllib.request
+from pathlib import Path
+
+# Configurar encoding UTF-8
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+APP = BASE_DIR / "app.py"
+
+MODULOS_PESADOS = ['plotly.express', 'sklearn', 'openpyxl', 'xlrd']
+
+# Corre en un proceso nuevo y devuelve los tiempos como JSON por stdout
+CODIGO_PRIMERA_PAGINA = f"""
+import json, sys, time, warnings
+warnings.filterwarnings('ignore')
+inicio = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({str(APP)!r}, default_timeout=120)
+at.run()
+primera = time.perf_counter() - inicio
+inicio = time.perf_counter()
+at.run()
+rerun = time.perf_counter() - inicio
+print(json.dumps({{
+    'primera_pagina': primera,
+    'interaccion': rerun,
+    'errores': [str(e.value) for e in at.exception],
+    'modulos_cargados': [m for m in {MODULOS_PESADOS!r} if m in sys.modules],
+}}))
+"""
+
+def puerto_libre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def medir_servidor(timeout=60):
+    """Segundos desde lanzar `streamlit run` hasta que el health check responde"""
+    puerto = puerto_libre()
+    comando = [
+        sys.executable, '-m', 'streamlit', 'run', str(APP),
+        '--server.headless', 'true', '--server.port', str(puerto),
+        '--browser.gatherUsageStats', 'false',
+    ]
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen(comando, cwd=BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - inicio < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{puerto}/_stcore/health", timeout=1) as respuesta:
+                    if respuesta.status == 200:
+                        return time.perf_counter() - inicio
+            except OSError:
+                time.sleep(0.05)
+        raise TimeoutError(f"El servidor no respondió en {timeout} s")
+    finally:
+        proceso.terminate()
+        proceso.wait()
+
+def medir_primera_pagina():
+    """Primera ejecución del script y un rerun, en un proceso Python nuevo"""
+    salida = subprocess.run(
+        [sys.executable, '-c', CODIGO_PRIMERA_PAGINA],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True
+    )
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de arranque de app.py')
+    parser.add_argument('--repeticiones', type=int, default=3, help='Corridas en frío (se informa la mediana)')
+    parser.add_argument('--salida', type=Path, default=None, help='JSON con los resultados')
+    args = parser.parse_args()
+
+    print("="*80)
+    print("🚀 BENCHMARK DE ARRANQUE DE LA APP")
+    print("="*80)
+
+    servidor, primera, interaccion = [], [], []
+    modulos = set()
+    for i in range(args.repeticiones):
+        servidor.append(medir_servidor())
+        pagina = medir_primera_pagina()
+        if pagina['errores']:
+            print(f"❌ La app falló al cargar: {pagina['errores']}")
+            return 1
+        primera.append(pagina['primera_pagina'])
+        interaccion.append(pagina['interaccion'])
+        modulos.update(pagina['modulos_cargados'])
+        print(f"   Corrida {i+1}: servidor {servidor[-1]:.2f} s | primera página {primera[-1]:.2f} s | interacción {interaccion[-1]*1000:.0f} ms")
+
+    resultados = {
+        'servidor_s': statistics.median(servidor),
+        'primera_pagina_s': statistics.median(primera),
+        'interaccion_ms': statistics.median(interaccion) * 1000,
+        'modulos_pesados_al_inicio': sorted(modulos),
+    }
+
+    print(f"\n📊 Mediana de {args.repeticiones} corridas:")
+    print(f"   Servidor listo:               {resultados['servidor_s']:.2f} s")
+    print(f"   Primera página (interactiva): {resultados['primera_pagina_s']:.2f} s")
+    print(f"   Interacción (rerun):          {resultados['interaccion_ms']:.0f} ms")
+    if modulos:
+        print(f"   ⚠️ Módulos pesados cargados al inicio: {', '.join(sorted(modulos))}")
+    else:
+        print("   ✅ Sin módulos pesados al inicio")
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultados guardados en: {args.salida}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""
+Benchmark del Pipeline de Scoring - Smart Scoring
+Mide cada etapa (normalización → limpieza → features → codificación →
+predicción → exportación) sobre exports sintéticos del CRM de cada universidad
+
+Guarda tiempos, filas/s y memoria en JSON y los compara contra un baseline
+guardado en la misma máquina: si una etapa se vuelve más lenta (o usa más
+memoria) que el baseline más la tolerancia, el script termina con código 1.
+
+Uso:
+    python scripts/benchmark_pipeline.py                          # 10k y 100k filas
+    python scripts/benchmark_pipeline.py --filas 10000 100000 1000000
+    python scripts/benchmark_pipeline.py --guardar-baseline       # fijar referencia
+    python scripts/benchmark_pipeline.py --universidades UNAB UEES --tolerancia 0.3
+"""
+
+import numpy as np
+import pandas as pd
+import sys
+import io
+import os
+import gc
+import json
+import platform
+import tempfile
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+# Añadir directorio raíz al path para importar el núcleo compartido
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scoring.config import cargar_config
+from scoring.dataset import DATA_DIR
+from scoring.features import crear_features
+from scoring.modelo import cargar_artefactos
+from scoring.pipeline import (
+    normalizar_columnas, limpiar_datos, resolver_universidad,
+    preparar_datos_prediccion, asignar_scores
+)
+from scoring.rendimiento import Perfil
+from scoring.sintetico import generar_crm
+
+# Configurar encoding UTF-8
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+BENCHMARK_DIR = DATA_DIR / "benchmarks"
+BASELINE_DEFAULT = BENCHMARK_DIR / "baseline.json"
+
+# Etapas más rápidas que esto (en el baseline) son ruido: no se comparan tiempos
+PISO_SEGUNDOS = 0.02
+
+def correr_pipeline(df_crm, modelo, encoders, perfil, destino):
+    """Una corrida completa del scoring, etapa por etapa, midiendo cada una"""
+    with perfil.medir('normalizacion', filas=len(df_crm)):
+        df = normalizar_columnas(df_crm.copy())
+
+    with perfil.medir('limpieza', filas=len(df)):
+        df_limpio, _ = limpiar_datos(df, normalizar=False)
+
+    with perfil.medir('features', filas=len(df_limpio)) as medicion:
+        universidad = resolver_universidad(df_limpio)
+        df_features = crear_features(df_limpio, universidad)
+        medicion.registrar_df(df_features)
+
+    with perfil.medir('codificacion', filas=len(df_features)):
+        X, reporte = preparar_datos_prediccion(df_features, encoders)
+        if X is None:
+            raise ValueError(f"Faltan columnas necesarias: {reporte.datos['columnas_faltantes']}")
+
+    with perfil.medir('prediccion', filas=len(X)):
+        probabilidades = modelo.predict_proba(X)[:, 1]
+
+    with perfil.medir('exportacion', filas=len(df_features)):
+        asignar_scores(df_features, probabilidades)
+        df_features.to_csv(destino, index=False, encoding='utf-8-sig')
+
+def medir_caso(universidad, n_filas, modelo, encoders, semilla, repeticiones, trazar_memoria):
+    """
+    Mejor tiempo de cada etapa en varias corridas y, aparte, memoria por etapa
+    con tracemalloc (infla los tiempos, por eso no se mide en la misma pasada)
+    """
+    df_crm = generar_crm(universidad, n_filas, semilla=semilla)
+    perfiles = []
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        destino = Path(carpeta) / "scores.csv"
+
+        for _ in range(repeticiones):
+            gc.collect()
+            perfiles.append(Perfil())
+            correr_pipeline(df_crm, modelo, encoders, perfiles[-1], destino)
+
+        if trazar_memoria:
+            gc.collect()
+            perfil_memoria = Perfil(trazar_memoria=True)
+            correr_pipeline(df_crm, modelo, encoders, perfil_memoria, destino)
+
+    # El mínimo es lo más estable entre corridas (el resto es ruido del sistema)
+    perfil = perfiles[0]
+    for i, medicion in enumerate(perfil.mediciones):
+        medicion.segundos = min(p.mediciones[i].segundos for p in perfiles)
+        if trazar_memoria:
+            medicion.memoria_pico_mb = perfil_memoria.mediciones[i].memoria_pico_mb
+
+    return {
+        'universidad': universidad,
+        'filas': n_filas,
+        'repeticiones': repeticiones,
+        'segundos_total': perfil.segundos_total,
+        'filas_por_segundo': n_filas / perfil.segundos_total,
+        'etapas': {m.etapa: m.como_dict() for m in perfil.mediciones},
+    }, perfil
+
+def describir_entorno(compacto):
+    return {
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'procesador': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'modelo': 'compacto' if compacto else 'pickle',
+    }
+
+def comparar_con_baseline(resultados, baseline, tolerancia):
+    """
+    Regresiones contra el baseline: etapas con más tiempo o más memoria que
+    baseline * (1 + tolerancia). Solo se comparan los casos presentes en ambos.
+
+    Returns: lista de mensajes (vacía si no hay regresiones)
+    """
+    referencia = {(r['universidad'], r['filas']): r for r in baseline['resultados']}
+    regresiones = []
+
+    print(f"\n{'='*80}")
+    print(f"📏 COMPARACIÓN CONTRA BASELINE ({baseline['fecha']}, tolerancia {tolerancia:.0%})")
+    print(f"{'='*80}")
+
+    for resultado in resultados:
+        clave = (resultado['universidad'], resultado['filas'])
+        if clave not in referencia:
+            print(f"   {clave[0]} {clave[1]:,} filas: sin baseline")
+            continue
+
+        for etapa, actual in resultado['etapas'].items():
+            previo = referencia[clave]['etapas'].get(etapa)
+            if previo is None:
+                continue
+
+            ratio = actual['segundos'] / previo['segundos']
+            estado = '✅'
+            if previo['segundos'] >= PISO_SEGUNDOS and ratio > 1 + tolerancia:
+                estado = '❌'
+                regresiones.append(
+                    f"{clave[0]} {clave[1]:,} filas - {etapa}: "
+                    f"{previo['segundos']*1000:.0f} ms → {actual['segundos']*1000:.0f} ms ({ratio:.2f}x)"
+                )
+
+            memoria = ''
+            if actual.get('memoria_pico_mb') is not None and previo.get('memoria_pico_mb'):
+                ratio_memoria = actual['memoria_pico_mb'] / previo['memoria_pico_mb']
+                memoria = f" | memoria {ratio_memoria:.2f}x"
+                if previo['memoria_pico_mb'] >= 1 and ratio_memoria > 1 + tolerancia:
+                    estado = '❌'
+                    regresiones.append(
+                        f"{clave[0]} {clave[1]:,} filas - {etapa}: memoria "
+                        f"{previo['memoria_pico_mb']:.1f} MB → {actual['memoria_pico_mb']:.1f} MB ({ratio_memoria:.2f}x)"
+                    )
+
+            print(f"   {estado} {clave[0]:<10} {clave[1]:>9,} {etapa:<13} tiempo {ratio:.2f}x{memoria}")
+
+    return regresiones
+
+def main():
+    universidades = cargar_config()['universities']
+
+    parser = argparse.ArgumentParser(description='Benchmark del pipeline de scoring con datos sintéticos')
+    parser.add_argument('--filas', type=int, nargs='+', default=[10_000, 100_000],
+                        help='Tamaños a medir (por defecto 10000 100000; agregar 1000000 para la prueba grande)')
+    parser.add_argument('--universidades', nargs='+', default=universidades, choices=universidades,
+                        help='Esquemas de CRM a medir (por defecto, todos)')
+    parser.add_argument('--semilla', type=int, default=0, help='Semilla del generador sintético')
+    parser.add_argument('--repeticiones', type=int, default=3,
+                        help='Corridas por caso; se guarda el mejor tiempo de cada etapa')
+    parser.add_argument('--sin-memoria', action='store_true',
+                        help='No medir memoria con tracemalloc (una corrida menos por caso)')
+    parser.add_argument('--pickle', action='store_true',
+                        help='Usar el modelo scikit-learn (.pkl) en lugar del compacto (.npz)')
+    parser.add_argument('--salida', type=Path, default=None,
+                        help='JSON de resultados (por defecto data/benchmarks/benchmark_<fecha>.json)')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_DEFAULT, help='JSON de referencia')
+    parser.add_argument('--guardar-baseline', action='store_true',
+                        help='Guardar esta corrida como el nuevo baseline')
+    parser.add_argument('--tolerancia', type=float, default=0.25,
+                        help='Empeoramiento permitido antes de marcar regresión (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    print("="*80)
+    print("⏱️  BENCHMARK DEL PIPELINE DE SCORING")
+    print("="*80)
+
+    modelo, encoders = cargar_artefactos(compacto=not args.pickle)
+
+    resultados = []
+    for n_filas in args.filas:
+        for universidad in args.universidades:
+            print(f"\n📊 {universidad} - {n_filas:,} filas")
+            resultado, perfil = medir_caso(
+                universidad, n_filas, modelo, encoders, args.semilla, args.repeticiones, not args.sin_memoria
+            )
+            perfil.imprimir()
+            print(f"   {'TOTAL':<13} {resultado['segundos_total']*1000:>10.1f} ms | {resultado['filas_por_segundo']:>12,.0f} filas/s")
+            resultados.append(resultado)
+
+    ahora = datetime.now()
+    corrida = {
+        'fecha': ahora.isoformat(timespec='seconds'),
+        'entorno': describir_entorno(not args.pickle),
+        'semilla': args.semilla,
+        'resultados': resultados,
+    }
+
+    BENCHMARK_DIR.mkdir(parents=True, exist_ok=True)
+    salida = args.salida or BENCHMARK_DIR / f"benchmark_{ahora:%Y%m%d_%H%M%S}.json"
+    with open(salida, 'w', encoding='utf-8') as f:
+        json.dump(corrida, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Resultados guardados en: {salida}")
+
+    regresiones = []
+    if args.guardar_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(corrida, f, indent=2, ensure_ascii=False)
+        print(f"📌 Baseline actualizado: {args.baseline}")
+    elif args.baseline.exists():
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline['entorno'] != corrida['entorno']:
+            print("⚠️ El baseline se generó en otro entorno; la comparación es orientativa")
+        regresiones = comparar_con_baseline(resultados, baseline, args.tolerancia)
+    else:
+        print(f"ℹ️ No hay baseline en {args.baseline} (crear uno con --guardar-baseline)")
+
+    if regresiones:
+        print(f"\n❌ {len(regresiones)} regresiones:")
+        for regresion in regresiones:
+            print(f"   - {regresion}")
+        return 1
+    if args.baseline.exists() and not args.guardar_baseline:
+        print("\n✅ Sin regresiones")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Generador de Carga - Smart Scoring
+Mide latencia (p50/p95/p99) y throughput del servidor de scoring por lead
+
+Envía pedidos POST /score con concurrencia fija, tomando los leads de un
+archivo del CRM (o leads sintéticos si no se indica archivo).
+
+Uso:
+    python scripts/carga_servicio.py --pedidos 5000 --concurrencia 50
+    python scripts/carga_servicio.py data/Consulta_Base_Unificada_UNAB.xls --url http://localhost:8000
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import io
+import json
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+from tornado.httpclient import AsyncHTTPClient, HTTPRequest
+
+# Configurar encoding UTF-8
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+def leads_sinteticos(n, semilla=0):
+    """Leads con la forma de un export del CRM (solo para probar carga)"""
+    rng = np.random.default_rng(semilla)
+    programas = ['MAESTRÍA EN DERECHO', 'ESPECIALIZACIÓN EN SALUD', 'ADMINISTRACIÓN DE EMPRESAS', 'INGENIERÍA DE SISTEMAS']
+    return [
+        {
+            'Base de datos': str(rng.choice(['UNAB - Posgrado', 'UNAB - Pregrado', 'UNAB - Leto'])),
+            'EMLMAIL': f"lead{i}@mail.com",
+            'Programa interes': str(rng.choice(programas)),
+            'CONTADOR_LLAMADOS_TEL': int(rng.integers(0, 15)),
+            'Llamadas_discador': int(rng.integers(0, 10)),
+            'Fecha insert Lead': '2025-10-01 09:00:00',
+            'Fecha y hora de actualización': '2025-10-15 18:30:00',
+            'UTM Source': str(rng.choice(['facebook', 'google', 'instagram'])),
+            'UTM Medium': str(rng.choice(['paid_social', 'organic', 'cpc'])),
+        }
+        for i in range(n)
+    ]
+
+def leads_desde_archivo(ruta):
+    df = pd.read_csv(ruta) if str(ruta).lower().endswith('.csv') else pd.read_excel(ruta)
+    # JSON no admite NaN ni fechas: se mandan como null y texto
+    return json.loads(df.to_json(orient='records', date_format='iso'))
+
+async def generar_carga(url, leads, pedidos, concurrencia):
+    cliente = AsyncHTTPClient(max_clients=concurrencia)
+    latencias = []
+    errores = 0
+    siguiente = 0
+    
+    async def trabajador():
+        nonlocal siguiente, errores
+        while siguiente < pedidos:
+            lead = leads[siguiente % len(leads)]
+            siguiente += 1
+            pedido = HTTPRequest(f"{url}/score", method='POST', body=json.dumps(lead),
+                                 headers={'Content-Type': 'application/json'})
+            inicio = time.perf_counter()
+            respuesta = await cliente.fetch(pedido, raise_error=False)
+            latencias.append(time.perf_counter() - inicio)
+            errores += respuesta.code != 200
+    
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabajador() for _ in range(concurrencia)))
+    duracion = time.perf_counter() - inicio
+    
+    return np.array(latencias) * 1000, errores, duracion
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generador de carga para el servidor de scoring')
+    parser.add_argument('archivo', nargs='?', type=Path, default=None,
+                        help='Archivo del CRM con leads a enviar (por defecto, sintéticos)')
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help='URL base del servidor')
+    parser.add_argument('--pedidos', type=int, default=2000, help='Cantidad total de pedidos')
+    parser.add_argument('--concurrencia', type=int, default=32, help='Pedidos simultáneos')
+    args = parser.parse_args()
+    
+    leads = leads_desde_archivo(args.archivo) if args.archivo else leads_sinteticos(1000)
+    latencias, errores, duracion = asyncio.run(
+        generar_carga(args.url, leads, args.pedidos, args.concurrencia)
+    )
+    
+    print("="*80)
+    print(f"CARGA: {args.pedidos:,} pedidos, concurrencia {args.concurrencia}")
+    print("="*80)
+    print(f"   Throughput: {len(latencias)/duracion:,.0f} pedidos/s")
+    print(f"   Latencia p50: {np.percentile(latencias, 50):.1f} ms | "
+          f"p95: {np.percentile(latencias, 95):.1f} ms | p99: {np.percentile(latencias, 99):.1f} ms")
+    print(f"   Errores: {errores}")
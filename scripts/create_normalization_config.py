@@ -11,6 +11,9 @@ from collections import defaultdict
 import sys
 import io
 
+# Secciones editadas a mano que no se derivan de los archivos del CRM
+SECCIONES_MANUALES = ['category_rules', 'duplicate_keys']
+
 # Configurar encoding UTF-8
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
@@ -158,7 +161,7 @@ def categorizar_resoluciones(resoluciones):
 def generar_config(mapeos_columnas, categorias_resoluciones):
     """Genera el archivo de configuración"""
     config = {
-        "version": "1.0",
+        "version": "1.4",
         "description": "Normalization configuration for multi-university data",
         "column_mappings": mapeos_columnas,
         "resolution_mappings": categorias_resoluciones,
@@ -173,6 +176,19 @@ def generar_config(mapeos_columnas, categorias_resoluciones):
             "rejected_other": 0,
             "informational": 0
         },
+        "resolution_patterns": {
+            "rejected_enrolled_elsewhere": [
+                "otra univ"
+            ],
+            "success": [
+                "matricul",
+                "inscripto",
+                "admitido"
+            ],
+            "in_progress": [
+                "proceso de pago"
+            ]
+        },
         "required_columns": [
             "dcontacto",
             "Resolución",
@@ -203,6 +219,10 @@ def generar_config(mapeos_columnas, categorias_resoluciones):
             "Nombre Operador",
             "Mensaje"
         ],
+        "duplicate_keys": [
+            "EMLMAIL",
+            "Programa interes"
+        ],
         "leakage_columns": [
             "Resolución",
             "Resolucion",
@@ -219,7 +239,61 @@ def generar_config(mapeos_columnas, categorias_resoluciones):
             "TELTELEFONO": "float64",
             "Fecha insert Lead": "datetime64[ns]",
             "Fecha y hora de actualización": "datetime64[ns]",
-            "Fecha y hora del próximo llamado": "datetime64[ns]"
+            "Fecha y hora del próximo llamado": "datetime64[ns]",
+            "universidad": "category",
+            "Resolución": "category",
+            "Ultima resolución": "category",
+            "Estado principal": "category",
+            "Etapa": "category",
+            "Base de datos": "category",
+            "Canal": "category",
+            "Programa interes": "category",
+            "WhatsApp entrante": "category",
+            "UTM Source": "category",
+            "UTM Medium": "category",
+            "UTM Campaing": "category",
+            "UTM Content": "category",
+            "UTM TERM": "category",
+            "Operador": "category",
+            "Nombre Operador": "category",
+            "resolucion_categoria": "category",
+            "resolucion_binaria": "int8",
+            "target": "int8",
+            "email_valido": "bool",
+            "dias_gestion": "int32",
+            "tiene_email": "int8",
+            "whatsapp_entrante_flag": "int8",
+            "lead_reciente": "int8",
+            "lead_antiguo": "int8",
+            "alta_actividad_llamadas": "int8",
+            "programa_categoria": "category",
+            "base_categoria": "category",
+            "utm_source_clean": "category",
+            "utm_medium_clean": "category"
+        },
+        "date_formats": {
+            "default": [
+                "%Y-%m-%d %H:%M:%S",
+                "%Y-%m-%d",
+                "%d/%m/%Y %H:%M:%S",
+                "%d/%m/%Y %H:%M",
+                "%d/%m/%Y"
+            ],
+            "UNAB": [
+                "%Y-%m-%d %H:%M:%S"
+            ],
+            "Crexe": [
+                "%d/%m/%Y %H:%M"
+            ],
+            "UEES": [
+                "%d/%m/%Y %H:%M:%S"
+            ],
+            "Anahuac": [
+                "%d/%m/%Y %H:%M"
+            ],
+            "Unisangil": [
+                "%Y-%m-%d %H:%M:%S"
+            ]
         },
         "universities": [
             "UNAB",
@@ -267,8 +341,16 @@ if __name__ == "__main__":
     # Generar configuración
     config = generar_config(mapeos, categorias)
     
-    # Guardar
+    # Conservar secciones manuales de la configuración existente
     config_path = CONFIG_DIR / 'normalization_config.json'
+    if config_path.exists():
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config_actual = json.load(f)
+        for seccion in SECCIONES_MANUALES:
+            if seccion in config_actual:
+                config[seccion] = config_actual[seccion]
+    
+    # Guardar
     with open(config_path, 'w', encoding='utf-8') as f:
         json.dump(config, f, indent=2, ensure_ascii=False)
     
@@ -0,0 +1,63 @@
+"""
+Exportar Modelo Compacto - Smart Scoring
+Genera models/modelo_scoring_sin_leakage.npz a partir de los pickles actuales
+
+train_model_sin_leakage.py ya lo genera al entrenar; este script sirve para
+modelos entrenados antes de existir el formato compacto.
+
+Uso:
+    python scripts/exportar_modelo_compacto.py
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import io
+import time
+import pickle
+from pathlib import Path
+
+# Añadir directorio raíz al path para importar el núcleo compartido
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scoring.bosque import exportar_bosque
+from scoring.modelo import (
+    MODELS_DIR,
+    ARCHIVO_MODELO,
+    ARCHIVO_ENCODERS,
+    ARCHIVO_MODELO_COMPACTO,
+    cargar_artefactos
+)
+
+# Configurar encoding UTF-8
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+if __name__ == "__main__":
+    with open(MODELS_DIR / ARCHIVO_MODELO, 'rb') as f:
+        modelo = pickle.load(f)
+    with open(MODELS_DIR / ARCHIVO_ENCODERS, 'rb') as f:
+        encoders = pickle.load(f)
+    
+    # El formato compacto solo representa Random Forest (la búsqueda de
+    # train_model_sin_leakage.py puede elegir HistGradientBoosting)
+    if not hasattr(modelo, 'estimators_'):
+        print(f"❌ {type(modelo).__name__} no se puede exportar al formato compacto: la app usa el pickle")
+        sys.exit(1)
+    
+    ruta = exportar_bosque(modelo, encoders, MODELS_DIR / ARCHIVO_MODELO_COMPACTO)
+    
+    print(f"✅ Modelo compacto guardado: {ruta}")
+    print(f"   Pickle: {(MODELS_DIR / ARCHIVO_MODELO).stat().st_size / 1024:,.0f} KB → "
+          f"npz: {ruta.stat().st_size / 1024:,.0f} KB")
+    
+    # Verificación rápida contra el modelo de scikit-learn
+    inicio = time.perf_counter()
+    compacto, _ = cargar_artefactos()
+    print(f"   Carga del modelo compacto: {(time.perf_counter() - inicio)*1000:.1f} ms")
+    
+    X = pd.DataFrame(
+        np.random.default_rng(0).integers(0, 10, size=(1000, modelo.n_features_in_)).astype(np.float32),
+        columns=modelo.feature_names_in_
+    )
+    iguales = np.array_equal(modelo.predict_proba(X), compacto.predict_proba(X))
+    print(f"   Predicciones idénticas a scikit-learn: {'✅' if iguales else '❌'}")
@@ -8,12 +8,35 @@ import numpy as np
 import sys
 import io
 from pathlib import Path
-import re
 import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Añadir directorio raíz al path para importar el núcleo compartido
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scoring.features import crear_features
+from scoring.fechas import procesar_fechas, tasa_fallos, COLUMNAS_FECHA_GESTION
+from scoring.pipeline import marcar_duplicados
+from scoring.duplicados import IndiceDuplicados
+from scoring.resoluciones import cargar_clasificador_resoluciones
+from scoring.emails import validar_emails
+from scoring.dataset import (
+    guardar_dataset, iniciar_particionado, agregar_particion, ruta_particionado,
+    DATASET_LIMPIOS, DATASET_FEATURES
+)
+from scoring.excel import leer_excel, ruta_cache
+from scoring.ingest_cache import hash_archivo
+from scoring.tipos import optimizar_tipos, aplicar_por_valor, imprimir_reporte_tipos, memoria_mb, MB
 
 # Configurar encoding UTF-8
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
+# Copy-on-Write: las copias superficiales y las columnas sin modificar
+# comparten memoria; solo se copia lo que cada paso reescribe
+pd.set_option('mode.copy_on_write', True)
+
 # Cargar configuración de normalización
 BASE_DIR = Path(__file__).parent.parent
 CONFIG_PATH = BASE_DIR / "config" / "normalization_config.json"
@@ -21,13 +44,6 @@ CONFIG_PATH = BASE_DIR / "config" / "normalization_config.json"
 with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
     NORMALIZATION_CONFIG = json.load(f)
 
-def validar_email(email):
-    """Valida si un email tiene formato correcto"""
-    if pd.isna(email):
-        return False
-    patron = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(patron, str(email).strip()))
-
 def normalizar_columnas(df, universidad_nombre=None):
     """
     Normaliza nombres de columnas para compatibilidad entre universidades
@@ -70,38 +86,29 @@ def normalizar_resoluciones(df):
     if 'Resolución' not in df.columns:
         return df
     
-    df_norm = df.copy()
+    df_norm = df.copy(deep=False)
     
-    # Crear mapeo inverso: valor -> categoría
-    valor_a_categoria = {}
-    for categoria, valores in NORMALIZATION_CONFIG['resolution_mappings'].items():
-        for valor in valores:
-            valor_a_categoria[valor] = categoria
-    
-    # Aplicar categorización
-    df_norm['resolucion_categoria'] = df_norm['Resolución'].apply(
-        lambda x: valor_a_categoria.get(str(x).strip(), 'unknown') if pd.notna(x) else 'unknown'
-    )
-    
-    # Crear target binario basado en categoría
-    categoria_a_binario = NORMALIZATION_CONFIG['resolution_to_binary']
-    df_norm['resolucion_binaria'] = df_norm['resolucion_categoria'].apply(
-        lambda x: categoria_a_binario.get(x, 0)
-    )
+    # Cada resolución distinta se clasifica una vez (mapeo exacto y después
+    # patrones); categoría como categórica y target binario como int8
+    categorias, binaria = cargar_clasificador_resoluciones().clasificar_columna(df_norm['Resolución'])
+    df_norm['resolucion_categoria'] = categorias
+    df_norm['resolucion_binaria'] = binaria
     
     return df_norm
 
-def cargar_universidad(archivo_path, nombre_universidad):
+def cargar_universidad(archivo_path, nombre_universidad, usar_cache=True, clave=None):
     """
     Carga y preprocesa datos de una universidad
+    usar_cache: False vuelve a parsear el Excel aunque esté cacheado en Parquet
+    clave: hash_archivo ya calculado (clave de la caché)
     """
     print(f"\n{'='*80}")
     print(f"CARGANDO: {nombre_universidad}")
     print(f"{'='*80}")
     
     try:
-        # Cargar archivo
-        df = pd.read_excel(archivo_path)
+        # Cargar archivo (solo columnas útiles; el .xls queda cacheado en Parquet)
+        df = leer_excel(archivo_path, usar_cache=usar_cache, clave=clave)
         print(f"✅ Cargados {len(df)} leads de {nombre_universidad}")
         
         # Normalizar columnas
@@ -122,15 +129,50 @@ def cargar_universidad(archivo_path, nombre_universidad):
         print(f"❌ Error cargando {nombre_universidad}: {str(e)}")
         return None
 
-def limpiar_datos_combinados(df):
+def _cargar_universidad_cronometrada(tarea):
+    """Carga una universidad (Excel cacheado en Parquet) y mide su tiempo - ejecutable en un proceso hijo"""
+    nombre, archivo, usar_cache = tarea
+    inicio = time.perf_counter()
+    # El archivo se hashea una sola vez: la misma clave sirve para ver si está
+    # cacheado y para leerlo
+    clave = hash_archivo(archivo)
+    desde_cache = usar_cache and ruta_cache(archivo, clave=clave).exists()
+    df = cargar_universidad(archivo, nombre, usar_cache=usar_cache, clave=clave)
+    return df, desde_cache and df is not None, time.perf_counter() - inicio
+
+def cargar_universidades(archivos_universidades, workers=1, usar_cache=True):
+    """
+    Carga las universidades en paralelo con un pool de procesos
+    Cada parseo de Excel + normalización es independiente y CPU-bound
+    
+    Returns: lista de (nombre, DataFrame | None, desde_cache, segundos) en el orden de entrada
+    """
+    tareas = [(nombre, archivo, usar_cache) for nombre, archivo in archivos_universidades.items()]
+    
+    if workers <= 1 or len(tareas) <= 1:
+        resultados = [_cargar_universidad_cronometrada(tarea) for tarea in tareas]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tareas))) as pool:
+            # pool.map conserva el orden de las tareas
+            resultados = list(pool.map(_cargar_universidad_cronometrada, tareas))
+    
+    return [(tarea[0], *resultado) for tarea, resultado in zip(tareas, resultados)]
+
+def limpiar_datos_combinados(df, claves_vistas=None):
     """
     Limpia los datos combinados de todas las universidades
+    No copia el DataFrame: cada paso reemplaza columnas enteras (Copy-on-Write)
+    y solo el filtro de duplicados genera un frame nuevo
+    
+    claves_vistas: ConjuntoHashes/IndiceDuplicados con las claves de partes
+    anteriores (modo particionado); los duplicados se buscan también contra
+    ellas y las claves de df se agregan
     """
     print(f"\n{'='*80}")
     print("LIMPIANDO DATOS COMBINADOS")
     print(f"{'='*80}")
     
-    df_limpio = df.copy()
+    df_limpio = df.copy(deep=False)
     
     # 1. Eliminar columnas completamente vacías
     columnas_vacias = df_limpio.columns[df_limpio.isnull().all()].tolist()
@@ -150,90 +192,87 @@ def limpiar_datos_combinados(df):
         unknown_count = (df_limpio['resolucion_categoria'] == 'unknown').sum()
         if unknown_count > 0:
             print(f"\n⚠️  {unknown_count} resoluciones no categorizadas:")
-            unknown_vals = df_limpio[df_limpio['resolucion_categoria'] == 'unknown']['Resolución'].value_counts().head(10)
+            es_unknown = df_limpio['resolucion_categoria'] == 'unknown'
+            unknown_vals = df_limpio.loc[es_unknown, 'Resolución'].value_counts().loc[lambda conteo: conteo > 0].head(10)
             for val, count in unknown_vals.items():
                 print(f"      - {val}: {count}")
         
         # Estadísticas por universidad
         print(f"\n📊 DISTRIBUCIÓN DE TARGET POR UNIVERSIDAD:")
-        for uni in df_limpio['universidad'].unique():
-            df_uni = df_limpio[df_limpio['universidad'] == uni]
-            positivos = df_uni['target'].sum()
-            tasa = (positivos / len(df_uni)) * 100 if len(df_uni) > 0 else 0
-            print(f"   {uni:12s}: {positivos:5d} / {len(df_uni):6d} ({tasa:5.2f}%)")
+        por_universidad = df_limpio.groupby('universidad', observed=True, sort=False)['target'].agg(['sum', 'size'])
+        for uni, (positivos, total) in por_universidad.iterrows():
+            tasa = (positivos / total) * 100 if total > 0 else 0
+            print(f"   {uni:12s}: {positivos:5d} / {total:6d} ({tasa:5.2f}%)")
     else:
         print("⚠️ No se encontró columna 'Resolución'")
         df_limpio['target'] = 0
     
     # 3. Validar y limpiar emails
     if 'EMLMAIL' in df_limpio.columns:
-        df_limpio['email_valido'] = df_limpio['EMLMAIL'].apply(validar_email)
+        df_limpio['email_valido'] = validar_emails(df_limpio['EMLMAIL'])
         emails_invalidos = (~df_limpio['email_valido']).sum()
         print(f"\n📧 Emails validados: {emails_invalidos} inválidos detectados")
     
-    # 4. Detectar y eliminar duplicados (mismo email + mismo programa)
+    # 4. Detectar y eliminar duplicados (mismo email + mismo programa, normalizados)
     if 'EMLMAIL' in df_limpio.columns and 'Programa interes' in df_limpio.columns:
-        df_con_email = df_limpio[df_limpio['email_valido']].copy()
-        duplicados_mask = df_con_email.duplicated(
-            subset=['EMLMAIL', 'Programa interes'], 
-            keep='first'
-        )
-        indices_duplicados = df_con_email[duplicados_mask].index
+        duplicados = marcar_duplicados(df_limpio, claves_vistas)
         
-        if len(indices_duplicados) > 0:
-            df_limpio = df_limpio.drop(indices_duplicados)
-            print(f"🗑️ {len(indices_duplicados)} duplicados eliminados")
+        if duplicados.any():
+            df_limpio = df_limpio[~duplicados]
+            print(f"🗑️ {duplicados.sum()} duplicados eliminados")
     
     # 5. Normalizar campos de texto y valores dentro de columnas
+    # (en las categóricas se normalizan solo los valores distintos)
     print(f"\n🔄 Normalizando valores dentro de columnas...")
     
     # Normalizar Canal (wsp, WSP, Wsp, whatsapp, Whatsapp → todos a minúsculas)
     if 'Canal' in df_limpio.columns:
-        df_limpio['Canal'] = df_limpio['Canal'].astype(str).str.strip().str.lower()
-        # Unificar variaciones de WhatsApp
-        df_limpio['Canal'] = df_limpio['Canal'].replace({
-            'wsp': 'whatsapp',
-            'whats': 'whatsapp',
-            'wa': 'whatsapp',
-            'nan': 'no_especificado'
-        })
+        df_limpio['Canal'] = aplicar_por_valor(
+            df_limpio['Canal'],
+            # Unificar variaciones de WhatsApp
+            lambda canal: canal.astype(str).str.strip().str.lower().replace({
+                'wsp': 'whatsapp',
+                'whats': 'whatsapp',
+                'wa': 'whatsapp',
+                'nan': 'no_especificado'
+            })
+        )
         print(f"   ✓ Canal normalizado")
     
     if 'Programa interes' in df_limpio.columns:
-        df_limpio['Programa interes'] = df_limpio['Programa interes'].fillna('NO ESPECIFICADO')
-        df_limpio['Programa interes'] = df_limpio['Programa interes'].astype(str).str.strip().str.upper()
+        df_limpio['Programa interes'] = aplicar_por_valor(
+            df_limpio['Programa interes'],
+            lambda programa: programa.fillna('NO ESPECIFICADO').astype(str).str.strip().str.upper()
+        )
         print(f"   ✓ Programa interes normalizado")
     
     if 'Base de datos' in df_limpio.columns:
-        df_limpio['Base de datos'] = df_limpio['Base de datos'].astype(str).str.strip()
+        df_limpio['Base de datos'] = aplicar_por_valor(
+            df_limpio['Base de datos'], lambda base: base.astype(str).str.strip()
+        )
         print(f"   ✓ Base de datos normalizado")
     
     # Normalizar UTMs a minúsculas
     for col in ['UTM Medium', 'UTM Source', 'UTM Campaing', 'UTM Content']:
         if col in df_limpio.columns:
-            df_limpio[col] = df_limpio[col].fillna('no_disponible')
-            df_limpio[col] = df_limpio[col].astype(str).str.strip().str.lower()
             # Reemplazar 'nan' string con 'no_disponible'
-            df_limpio[col] = df_limpio[col].replace('nan', 'no_disponible')
+            df_limpio[col] = aplicar_por_valor(
+                df_limpio[col],
+                lambda utm: utm.fillna('no_disponible').astype(str).str.strip().str.lower().replace('nan', 'no_disponible')
+            )
     
     print(f"   ✓ UTMs normalizados")
     
-    # 6. Procesar fechas
-    if 'Fecha insert Lead' in df_limpio.columns:
-        df_limpio['Fecha insert Lead'] = pd.to_datetime(df_limpio['Fecha insert Lead'], errors='coerce')
+    # 6. Procesar fechas (formatos de 'date_formats' por universidad) y días de gestión
+    fallos_fechas = procesar_fechas(df_limpio)
     
-    if 'Fecha y hora de actualización' in df_limpio.columns:
-        df_limpio['Fecha y hora de actualización'] = pd.to_datetime(
-            df_limpio['Fecha y hora de actualización'], errors='coerce'
+    print(f"\n📅 FECHAS NO INTERPRETADAS POR UNIVERSIDAD:")
+    for uni, columnas in fallos_fechas.items():
+        tasas = ' | '.join(
+            f"{columna}: {tasa_fallos(*columnas[columna])*100:5.2f}%"
+            for columna in COLUMNAS_FECHA_GESTION if columna in columnas
         )
-        
-        # Calcular días de gestión
-        if 'Fecha insert Lead' in df_limpio.columns:
-            df_limpio['dias_gestion'] = (
-                df_limpio['Fecha y hora de actualización'] - df_limpio['Fecha insert Lead']
-            ).dt.days
-            df_limpio['dias_gestion'] = df_limpio['dias_gestion'].fillna(0)
-            df_limpio['dias_gestion'] = df_limpio['dias_gestion'].apply(lambda x: max(0, x))
+        print(f"   {str(uni):12s}: {tasas}")
     
     print(f"\n✅ Limpieza completada: {len(df_limpio)} leads listos")
     
@@ -247,125 +286,79 @@ def crear_features_multiuniversidad(df):
     print("CREANDO FEATURES")
     print(f"{'='*80}")
     
-    df_features = df.copy()
-    
-    # 1. Features de Email
-    if 'email_valido' in df_features.columns:
-        df_features['tiene_email'] = df_features['email_valido'].astype(int)
-    else:
-        df_features['tiene_email'] = 0
-    
-    # 2. Features de WhatsApp
-    if 'WhatsApp entrante' in df_features.columns:
-        df_features['whatsapp_entrante_flag'] = df_features['WhatsApp entrante'].notna().astype(int)
-    else:
-        df_features['whatsapp_entrante_flag'] = 0
+    df_features = crear_features(df)
     
-    # 3. Features Temporales
-    if 'dias_gestion' in df_features.columns:
-        df_features['lead_reciente'] = (df_features['dias_gestion'] < 7).astype(int)
-        df_features['lead_antiguo'] = (df_features['dias_gestion'] > 30).astype(int)
-    else:
-        df_features['dias_gestion'] = 0
-        df_features['lead_reciente'] = 0
-        df_features['lead_antiguo'] = 0
-    
-    # 4. Features de Comportamiento
-    if 'CONTADOR_LLAMADOS_TEL' in df_features.columns:
-        df_features['ratio_llamadas_dias'] = df_features.apply(
-            lambda row: row['CONTADOR_LLAMADOS_TEL'] / max(row.get('dias_gestion', 1), 1),
-            axis=1
-        )
-        df_features['alta_actividad_llamadas'] = (df_features['CONTADOR_LLAMADOS_TEL'] > 5).astype(int)
-    else:
-        df_features['CONTADOR_LLAMADOS_TEL'] = 0
-        df_features['ratio_llamadas_dias'] = 0
-        df_features['alta_actividad_llamadas'] = 0
-    
-    if 'Llamadas_discador' not in df_features.columns:
-        df_features['Llamadas_discador'] = 0
-    
-    # 5. Categorizar Programas
-    def categorizar_programa(programa):
-        programa_str = str(programa).upper()
-        if 'TECNOLOGÍA' in programa_str or 'TECNOLOGIA' in programa_str:
-            return 'TECNOLOGIA'
-        elif 'ESPECIALIZACIÓN' in programa_str or 'ESPECIALIZACION' in programa_str:
-            return 'ESPECIALIZACION'
-        elif 'MAESTRÍA' in programa_str or 'MAESTRIA' in programa_str:
-            return 'MAESTRIA'
-        elif 'DERECHO' in programa_str:
-            return 'DERECHO'
-        elif 'ADMINISTR' in programa_str or 'NEGOCIO' in programa_str or 'CONTAD' in programa_str:
-            return 'NEGOCIOS'
-        elif 'SALUD' in programa_str or 'FARMACIA' in programa_str or 'EPIDEMIO' in programa_str:
-            return 'SALUD'
-        else:
-            return 'OTROS'
+    print("✅ Features creadas exitosamente!")
     
-    if 'Programa interes' in df_features.columns:
-        df_features['programa_categoria'] = df_features['Programa interes'].apply(categorizar_programa)
-    else:
-        df_features['programa_categoria'] = 'OTROS'
-    
-    # 6. Categorizar Base de Datos
-    def categorizar_base(base):
-        base_str = str(base).upper()
-        if 'PREGRADO' in base_str:
-            return 'PREGRADO'
-        elif 'POSGRADO' in base_str or 'POSTGRADO' in base_str:
-            return 'POSGRADO'
-        elif 'LETO' in base_str:
-            return 'LETO'
-        else:
-            return 'OTRO'
+    # Mostrar estadísticas por universidad
+    print(f"\n📊 RESUMEN POR UNIVERSIDAD:")
+    for uni, leads in df_features.groupby('universidad', observed=True, sort=False).size().items():
+        print(f"   {uni:12s}: {leads:6d} leads")
     
-    if 'Base de datos' in df_features.columns:
-        df_features['base_categoria'] = df_features['Base de datos'].apply(categorizar_base)
-    else:
-        df_features['base_categoria'] = 'OTRO'
-    
-    # 7. Limpiar UTM Source
-    def limpiar_utm_source(source):
-        source_str = str(source).lower()
-        if 'google' in source_str:
-            return 'google'
-        elif 'fb' in source_str or 'facebook' in source_str:
-            return 'facebook'
-        else:
-            return 'otros'
+    return df_features
+
+def construir_particionado(archivos_universidades, usar_cache=True):
+    """
+    Construye los datasets limpio y con features por partes (out-of-core)
     
-    if 'UTM Source' in df_features.columns:
-        df_features['utm_source_clean'] = df_features['UTM Source'].apply(limpiar_utm_source)
-    else:
-        df_features['utm_source_clean'] = 'otros'
-    
-    # 8. Limpiar UTM Medium
-    def limpiar_utm_medium(medium):
-        medium_str = str(medium).lower()
-        if 'paid' in medium_str or 'social' in medium_str:
-            return 'paid_social'
-        elif 'organic' in medium_str:
-            return 'organic'
-        else:
-            return 'otros'
+    Cada universidad pasa sola por carga → tipos → limpieza → features y se
+    agrega al dataset particionado por universidad/mes, así que el pico de
+    memoria lo marca la universidad más grande y no la suma de todas. Los
+    duplicados (email + programa) se detectan entre universidades con el
+    índice de hashes: 8 bytes por lead ya visto. No se escriben los CSV completos.
     
-    if 'UTM Medium' in df_features.columns:
-        df_features['utm_medium_clean'] = df_features['UTM Medium'].apply(limpiar_utm_medium)
-    else:
-        df_features['utm_medium_clean'] = 'otros'
+    Returns: dict con leads, positivos, particiones y universidades procesadas
+    """
+    iniciar_particionado(DATASET_LIMPIOS)
+    iniciar_particionado(DATASET_FEATURES)
     
-    print("✅ Features creadas exitosamente!")
+    # El dataset se reconstruye entero: su índice arranca vacío (el de cargas de la app no se toca)
+    claves_vistas = IndiceDuplicados(cargar=False)
+    resumen = {'leads': 0, 'positivos': 0, 'particiones': 0, 'universidades': []}
     
-    # Mostrar estadísticas por universidad
-    print(f"\n📊 RESUMEN POR UNIVERSIDAD:")
-    for uni in df_features['universidad'].unique():
-        df_uni = df_features[df_features['universidad'] == uni]
-        print(f"   {uni:12s}: {len(df_uni):6d} leads")
+    for nombre, archivo in archivos_universidades.items():
+        df_uni, desde_cache, segundos = _cargar_universidad_cronometrada((nombre, archivo, usar_cache))
+        if df_uni is None:
+            continue
+        inicio = time.perf_counter()
+        
+        df_uni, reporte_tipos = optimizar_tipos(df_uni)
+        memoria_parte = reporte_tipos['mb_despues']
+        
+        df_limpio = limpiar_datos_combinados(df_uni, claves_vistas=claves_vistas)
+        del df_uni
+        agregar_particion(df_limpio, DATASET_LIMPIOS)
+        
+        df_features = crear_features_multiuniversidad(df_limpio)
+        del df_limpio
+        df_features, _ = optimizar_tipos(df_features)
+        resumen['particiones'] += agregar_particion(df_features, DATASET_FEATURES)
+        
+        resumen['leads'] += len(df_features)
+        resumen['positivos'] += int(df_features['target'].sum())
+        resumen['universidades'].append(nombre)
+        memoria_parte = max(memoria_parte, memoria_mb(df_features))
+        del df_features
+        
+        origen = "caché" if desde_cache else "Excel"
+        print(f"\n📦 {nombre}: carga {segundos:.2f}s ({origen}) | proceso {time.perf_counter() - inicio:.2f}s | "
+              f"{memoria_parte:,.1f} MB | claves vistas: {len(claves_vistas):,} ({claves_vistas.nbytes / MB:.1f} MB)")
     
-    return df_features
+    resumen['indice_duplicados'] = claves_vistas.guardar()
+    return resumen
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Preparar datos multi-universidad')
+    parser.add_argument('--refrescar', action='store_true',
+                        help='Ignorar la caché de Excel (Parquet) y volver a parsear todos los archivos')
+    parser.add_argument('--workers', type=int, default=min(5, os.cpu_count() or 1),
+                        help='Procesos para cargar universidades en paralelo (1 = secuencial)')
+    parser.add_argument('--particionado', action='store_true',
+                        help='Procesar una universidad a la vez y escribir un dataset particionado por universidad/mes (memoria acotada)')
+    args = parser.parse_args()
+    
     # Rutas
     BASE_DIR = Path(__file__).parent.parent
     DATA_DIR = BASE_DIR / "data"
@@ -383,16 +376,48 @@ if __name__ == "__main__":
         'Unisangil': DATA_DIR / 'Consulta_Base_Unificada_Unisangil.xls'
     }
     
-    # Cargar todas las universidades
-    dataframes = []
+    archivos_existentes = {}
     for nombre, archivo in archivos_universidades.items():
         if archivo.exists():
-            df_uni = cargar_universidad(archivo, nombre)
-            if df_uni is not None:
-                dataframes.append(df_uni)
+            archivos_existentes[nombre] = archivo
         else:
             print(f"⚠️ Archivo no encontrado: {archivo}")
     
+    if args.particionado:
+        # Out-of-core: una universidad por vez, sin combinado en memoria
+        resumen = construir_particionado(archivos_existentes, usar_cache=not args.refrescar)
+        
+        print(f"\n{'='*80}")
+        print("PROCESO COMPLETADO EXITOSAMENTE")
+        print(f"{'='*80}")
+        print(f"\n📊 RESUMEN FINAL:")
+        print(f"   Total leads: {resumen['leads']:,}")
+        print(f"   Universidades: {len(resumen['universidades'])}")
+        print(f"   Particiones universidad/mes: {resumen['particiones']}")
+        if resumen['leads']:
+            print(f"   Target positivos: {resumen['positivos']:,} ({resumen['positivos'] / resumen['leads'] * 100:.2f}%)")
+        print(f"💾 Datos guardados en: {ruta_particionado(DATASET_LIMPIOS)}, {ruta_particionado(DATASET_FEATURES)}")
+        print(f"🔁 Índice de duplicados: {resumen['indice_duplicados']}")
+        sys.exit(0)
+    
+    # Cargar todas las universidades en paralelo (solo se re-parsean los archivos que cambiaron)
+    inicio_ingesta = time.perf_counter()
+    cargas = cargar_universidades(
+        archivos_existentes, workers=args.workers, usar_cache=not args.refrescar
+    )
+    tiempo_ingesta = time.perf_counter() - inicio_ingesta
+    
+    print(f"\n⏱️ TIEMPOS DE INGESTA ({args.workers} workers):")
+    dataframes = []
+    for nombre, df_uni, desde_cache, segundos in cargas:
+        if df_uni is None:
+            print(f"   {nombre:12s}: ❌ error ({segundos:6.2f}s)")
+            continue
+        origen = "caché" if desde_cache else "Excel"
+        print(f"   {nombre:12s}: {len(df_uni):7,} leads | {segundos:6.2f}s | {origen}")
+        dataframes.append(df_uni)
+    print(f"   {'Total':12s}: {tiempo_ingesta:6.2f}s de pared")
+    
     # Combinar todos los dataframes
     print(f"\n{'='*80}")
     print("COMBINANDO DATASETS")
@@ -400,22 +425,34 @@ if __name__ == "__main__":
     
     df_combinado = pd.concat(dataframes, ignore_index=True)
     print(f"✅ Total combinado: {len(df_combinado)} leads de {len(dataframes)} universidades")
+    # Los frames por universidad ya están copiados en el combinado
+    del cargas, dataframes
+    
+    # Tipos compactos según 'data_types' (categóricas, flags int8, contadores reducidos)
+    df_combinado, reporte_tipos = optimizar_tipos(df_combinado)
+    imprimir_reporte_tipos(reporte_tipos, "Memoria del combinado")
     
-    # Limpiar datos
-    df_limpio = limpiar_datos_combinados(df_combinado)
+    # Limpiar datos (se suelta el combinado: el limpio es el único frame vivo).
+    # Las claves de los leads que quedan forman el índice del dataset, que la
+    # app suma al de sus cargas para reconocer leads ya vistos
+    indice_duplicados = IndiceDuplicados(cargar=False)
+    df_limpio = limpiar_datos_combinados(df_combinado, claves_vistas=indice_duplicados)
+    del df_combinado
+    print(f"🔁 Índice de duplicados: {len(indice_duplicados):,} claves → {indice_duplicados.guardar()}")
     
     # Guardar datos limpios
-    ruta_limpios = DATA_DIR / "datos_multi_universidad_limpios.csv"
-    df_limpio.to_csv(ruta_limpios, index=False, encoding='utf-8-sig')
-    print(f"\n💾 Datos limpios guardados: {ruta_limpios}")
+    rutas_limpios = guardar_dataset(df_limpio, DATASET_LIMPIOS)
+    print(f"\n💾 Datos limpios guardados: {', '.join(str(r) for r in rutas_limpios)}")
     
     # Crear features
     df_features = crear_features_multiuniversidad(df_limpio)
+    del df_limpio
+    df_features, reporte_tipos = optimizar_tipos(df_features)
+    imprimir_reporte_tipos(reporte_tipos, "Memoria con features")
     
     # Guardar datos con features
-    ruta_features = DATA_DIR / "datos_multi_universidad_features.csv"
-    df_features.to_csv(ruta_features, index=False, encoding='utf-8-sig')
-    print(f"💾 Datos con features guardados: {ruta_features}")
+    rutas_features = guardar_dataset(df_features, DATASET_FEATURES)
+    print(f"💾 Datos con features guardados: {', '.join(str(r) for r in rutas_features)}")
     
     print(f"\n{'='*80}")
     print("PROCESO COMPLETADO EXITOSAMENTE")
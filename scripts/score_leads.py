@@ -0,0 +1,151 @@
+"""
+Scoring Batch de Leads - Smart Scoring
+Genera scores para archivos del CRM sin Streamlit (jobs nocturnos)
+
+Corre la misma cadena que la app: limpieza → features → codificación → predict_proba
+
+Uso:
+    python scripts/score_leads.py data/Consulta_Base_Unificada_UNAB.xls
+    python scripts/score_leads.py data/exports/ --salida data/scores --workers 4
+    python scripts/score_leads.py consolidado.csv --lote 100000
+"""
+
+import pandas as pd
+import sys
+import io
+import os
+import time
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+# Añadir directorio raíz al path para importar el núcleo compartido
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scoring.config import cargar_config
+from scoring.excel import leer_excel
+from scoring.modelo import cargar_artefactos
+from scoring.pipeline import puntuar_leads
+from scoring.streaming import puntuar_por_lotes, es_csv
+
+# Configurar encoding UTF-8
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+EXTENSIONES_CRM = ('.csv', '.xls', '.xlsx')
+
+# Artefactos cargados una sola vez por proceso (ver _inicializar_worker)
+_ARTEFACTOS = None
+
+def _inicializar_worker():
+    """Carga el modelo una vez en cada proceso del pool"""
+    global _ARTEFACTOS
+    _ARTEFACTOS = cargar_artefactos()
+
+def listar_archivos(entradas):
+    """Expande directorios a sus archivos del CRM (.csv, .xls, .xlsx)"""
+    archivos = []
+    for entrada in entradas:
+        ruta = Path(entrada)
+        if ruta.is_dir():
+            archivos.extend(sorted(
+                p for p in ruta.iterdir()
+                if p.suffix.lower() in EXTENSIONES_CRM and not p.stem.endswith('_scores')
+            ))
+        else:
+            archivos.append(ruta)
+    return archivos
+
+def puntuar_archivo(tarea):
+    """
+    Genera los scores de un archivo y los escribe en el directorio de salida
+
+    Returns: dict con archivo, salida, leads, segundos y error (si hubo)
+    """
+    archivo, directorio_salida, formato, tamano_lote, universidad = tarea
+    modelo, encoders = _ARTEFACTOS
+
+    salida = directorio_salida / f"{archivo.stem}_scores.{formato}"
+    resultado = {'archivo': archivo, 'salida': salida, 'leads': 0, 'segundos': 0.0, 'error': None}
+    inicio = time.perf_counter()
+
+    try:
+        if tamano_lote:
+            # Modo por lotes: memoria acotada, salida en el orden original
+            resumen = puntuar_por_lotes(
+                archivo, salida, modelo, encoders,
+                tamano_lote=tamano_lote, universidad=universidad
+            )
+            resultado['leads'] = resumen.total
+        else:
+            df = pd.read_csv(archivo) if es_csv(archivo) else leer_excel(archivo, solo_utiles=False)
+            df_scores, _ = puntuar_leads(df, modelo, encoders, universidad=universidad)
+
+            if formato == 'parquet':
+                df_scores.to_parquet(salida, index=False)
+            else:
+                df_scores.to_csv(salida, index=False, encoding='utf-8-sig')
+            resultado['leads'] = len(df_scores)
+    except Exception as e:
+        resultado['error'] = str(e)
+
+    resultado['segundos'] = time.perf_counter() - inicio
+    return resultado
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generar scores de leads sin la app Streamlit')
+    parser.add_argument('entradas', nargs='+',
+                        help='Archivos del CRM (.csv/.xls/.xlsx) o directorios que los contienen')
+    parser.add_argument('--salida', type=Path, default=None,
+                        help='Directorio de salida (por defecto, junto a cada archivo de entrada)')
+    parser.add_argument('--formato', choices=['csv', 'parquet'], default='csv',
+                        help='Formato de salida')
+    parser.add_argument('--lote', type=int, default=0,
+                        help='Leads por lote para procesar con memoria acotada (0 = archivo completo)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Archivos a procesar en paralelo')
+    parser.add_argument('--universidad', choices=cargar_config()['universities'], default=None,
+                        help='Universidad de los archivos (por defecto se detecta automáticamente)')
+    args = parser.parse_args()
+
+    if args.lote and args.formato != 'csv':
+        parser.error("--lote escribe los scores en streaming y solo admite --formato csv")
+
+    archivos = listar_archivos(args.entradas)
+    if not archivos:
+        print("❌ No se encontraron archivos del CRM para puntuar")
+        sys.exit(1)
+
+    if args.salida is not None:
+        args.salida.mkdir(parents=True, exist_ok=True)
+
+    tareas = [
+        (archivo, args.salida or archivo.parent, args.formato, args.lote, args.universidad)
+        for archivo in archivos
+    ]
+
+    print("="*80)
+    print(f"SCORING BATCH: {len(archivos)} archivo(s)")
+    print("="*80)
+
+    inicio = time.perf_counter()
+    workers = min(args.workers, len(tareas), os.cpu_count() or 1)
+
+    if workers <= 1:
+        _inicializar_worker()
+        resultados = [puntuar_archivo(tarea) for tarea in tareas]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_worker) as pool:
+            resultados = list(pool.map(puntuar_archivo, tareas))
+
+    errores = 0
+    for res in resultados:
+        if res['error']:
+            errores += 1
+            print(f"❌ {res['archivo'].name}: {res['error']}")
+        else:
+            velocidad = res['leads'] / res['segundos'] if res['segundos'] > 0 else 0
+            print(f"✅ {res['archivo'].name}: {res['leads']:,} leads en {res['segundos']:.2f}s "
+                  f"({velocidad:,.0f} leads/s) → {res['salida']}")
+
+    print(f"\n⏱️ Total: {time.perf_counter() - inicio:.2f}s | {len(resultados) - errores} ok, {errores} con error")
+    sys.exit(1 if errores else 0)
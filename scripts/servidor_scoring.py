@@ -0,0 +1,70 @@
+"""
+Servidor de Scoring por Lead - Smart Scoring
+Expone el modelo por HTTP para que el CRM pida el score al insertar un lead
+
+Uso:
+    python scripts/servidor_scoring.py --puerto 8000
+    python scripts/servidor_scoring.py --universidad UNAB --max-lote 128 --max-espera-ms 3
+
+Ejemplo:
+    curl -X POST localhost:8000/score -d '{"Base de datos": "UNAB - Posgrado", "EMLMAIL": "ana@mail.com", ...}'
+"""
+
+import sys
+import io
+import time
+import asyncio
+import argparse
+from functools import partial
+from pathlib import Path
+
+# Añadir directorio raíz al path para importar el núcleo compartido
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scoring.config import cargar_config
+from scoring.modelo import cargar_artefactos
+from scoring.servicio import (
+    AgrupadorLotes,
+    crear_aplicacion,
+    puntuar_registros,
+    MAX_LOTE_DEFAULT,
+    MAX_ESPERA_MS_DEFAULT
+)
+
+# Configurar encoding UTF-8
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', line_buffering=True)
+
+async def servir(args):
+    inicio = time.perf_counter()
+    modelo, encoders = cargar_artefactos()
+    puntuar = partial(puntuar_registros, modelo=modelo, encoders=encoders, universidad=args.universidad)
+    
+    # Calentar el pipeline (primer llamado a pandas/NumPy) antes de aceptar pedidos
+    puntuar([{'EMLMAIL': 'calentamiento@ejemplo.com'}])
+    print(f"✅ Modelo cargado en {(time.perf_counter() - inicio)*1000:.0f} ms")
+    
+    agrupador = AgrupadorLotes(puntuar, max_lote=args.max_lote, max_espera_ms=args.max_espera_ms)
+    agrupador.iniciar()
+    
+    crear_aplicacion(agrupador).listen(args.puerto, address=args.host)
+    print(f"🚀 Escuchando en http://{args.host}:{args.puerto} "
+          f"(max_lote={args.max_lote}, max_espera={args.max_espera_ms} ms)")
+    
+    await asyncio.Event().wait()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Servicio HTTP de scoring por lead')
+    parser.add_argument('--host', default='127.0.0.1', help='Interfaz donde escuchar')
+    parser.add_argument('--puerto', type=int, default=8000, help='Puerto HTTP')
+    parser.add_argument('--max-lote', type=int, default=MAX_LOTE_DEFAULT,
+                        help='Máximo de leads por llamada al modelo')
+    parser.add_argument('--max-espera-ms', type=float, default=MAX_ESPERA_MS_DEFAULT,
+                        help='Espera máxima para juntar pedidos en un micro-lote')
+    parser.add_argument('--universidad', choices=cargar_config()['universities'], default=None,
+                        help='Universidad por defecto de los leads que no la indican')
+    args = parser.parse_args()
+    
+    try:
+        asyncio.run(servir(args))
+    except KeyboardInterrupt:
+        print("\n👋 Servidor detenido")
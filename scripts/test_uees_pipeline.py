@@ -1,12 +1,14 @@
 import sys
+import io
 import os
 import pandas as pd
 import numpy as np
 
-# AÃ±adir directorio padre al path para importar app
+# AÃ±adir directorio padre al path para importar el pipeline
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app import detectar_universidad, limpiar_datos_integrado, crear_features_integrado
+from scoring.features import crear_features
+from scoring.pipeline import detectar_universidad, limpiar_datos, resolver_universidad
 
 def test_uees_pipeline():
     file_path = r'C:\Users\franc\OneDrive\Escritorio\Mis Cosas\Prob Leads - Data Science Nods\data\Consulta_Base_Unificada_UEES.xls'
@@ -28,33 +30,8 @@ def test_uees_pipeline():
 
     print("\n--- TEST: LIMPIEZA DATOS ---")
     try:
-        # Mocking streamlit spinner/success/info since they don't work in script
-        import streamlit as st
-        
-        class MockSpinner:
-            def __init__(self, text): pass
-            def __enter__(self): pass
-            def __exit__(self, exc_type, exc_val, exc_tb): pass
-
-        def safe_print(*args, **kwargs):
-            try:
-                print(*args, **kwargs)
-            except UnicodeEncodeError:
-                # Fallback for Windows console issues
-                clean_args = []
-                for arg in args:
-                    if isinstance(arg, str):
-                        clean_args.append(arg.encode('ascii', 'replace').decode('ascii'))
-                    else:
-                        clean_args.append(arg)
-                print(*clean_args, **kwargs)
-
-        st.spinner = MockSpinner
-        st.info = safe_print
-        st.success = safe_print
-        st.warning = safe_print
-        
-        df_limpio = limpiar_datos_integrado(df)
+        df_limpio, reporte = limpiar_datos(df)
+        reporte.imprimir()
         print(f"Datos limpios: {df_limpio.shape}")
         
         if 'target' in df_limpio.columns:
@@ -70,8 +47,9 @@ def test_uees_pipeline():
 
     print("\n--- TEST: FEATURE ENGINEERING ---")
     try:
-        st.session_state = {} # Mock session state
-        df_features = crear_features_integrado(df_limpio)
+        universidad = resolver_universidad(df_limpio, reporte=reporte)
+        df_features = crear_features(df_limpio, universidad=universidad)
+        reporte.imprimir('features')
         print(f"Features creadas: {df_features.shape}")
         print("Columnas de features:", df_features.columns.tolist())
         
@@ -85,4 +63,7 @@ def test_uees_pipeline():
          traceback.print_exc()
 
 if __name__ == "__main__":
+    # Configurar encoding UTF-8 (los eventos del reporte usan emojis); solo al
+    # correrlo como script: bajo pytest rompería la captura de la salida
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     test_uees_pipeline()
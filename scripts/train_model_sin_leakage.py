@@ -10,11 +10,28 @@ import io
 from pathlib import Path
 import pickle
 import json
+import os
+import time
+import argparse
+
+# Añadir directorio raíz al path para importar el núcleo compartido
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scoring.bosque import exportar_bosque
+from scoring.busqueda import (
+    buscar_hiperparametros,
+    columnas_categoricas_nativas,
+    crear_estimador,
+    FOLDS_DEFAULT
+)
+from scoring.dataset import cargar_dataset, DATASET_FEATURES
+from scoring.modelo import ARCHIVO_MODELO_COMPACTO
 
 # Machine Learning
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import LabelEncoder
+from sklearn.inspection import permutation_importance
 from sklearn.metrics import (
     classification_report, 
     confusion_matrix, 
@@ -119,7 +136,7 @@ def preparar_datos_sin_leakage(df):
             print(f"   {uni:12s}: {total:6,} leads | {positivos:4.0f} positivos | {tasa:5.2f}%")
     
     # Codificar variables categoricas
-    columnas_categoricas = X.select_dtypes(include=['object']).columns.tolist()
+    columnas_categoricas = X.select_dtypes(include=['object', 'category']).columns.tolist()
     label_encoders = {}
     
     if columnas_categoricas:
@@ -132,15 +149,8 @@ def preparar_datos_sin_leakage(df):
     
     return X, y, label_encoders
 
-def entrenar_modelo_limpio(X, y):
-    """
-    Entrena modelo Random Forest con features limpias
-    """
-    print("\n" + "="*80)
-    print("ENTRENANDO MODELO SIN DATA LEAKAGE")
-    print("="*80)
-    
-    # Split train/test (stratified)
+def dividir_datos(X, y):
+    """Split train/test estratificado (el mismo en ambos modos de entrenamiento)"""
     X_train, X_test, y_train, y_test = train_test_split(
         X, y,
         test_size=0.2,
@@ -152,6 +162,19 @@ def entrenar_modelo_limpio(X, y):
     print(f"   Train: {len(X_train):,} leads ({y_train.sum()} positivos)")
     print(f"   Test:  {len(X_test):,} leads ({y_test.sum()} positivos)")
     
+    return X_train, X_test, y_train, y_test
+
+def entrenar_modelo_limpio(X, y):
+    """
+    Entrena modelo Random Forest con features limpias
+    """
+    print("\n" + "="*80)
+    print("ENTRENANDO MODELO SIN DATA LEAKAGE")
+    print("="*80)
+    
+    # Split train/test (stratified)
+    X_train, X_test, y_train, y_test = dividir_datos(X, y)
+    
     # Entrenar Random Forest
     print("\nENTRENANDO RANDOM FOREST...")
     
@@ -171,6 +194,60 @@ def entrenar_modelo_limpio(X, y):
     
     return modelo, X_train, X_test, y_train, y_test
 
+def entrenar_con_busqueda(X, y, label_encoders, folds=FOLDS_DEFAULT, workers=None):
+    """
+    Busca hiperparámetros con validación cruzada estratificada sobre el train
+    (Random Forest de varios tamaños/profundidades y HistGradientBoosting) y
+    re-entrena la mejor configuración con todo el train
+    
+    Returns: (modelo, X_train, X_test, y_train, y_test, busqueda)
+    """
+    print("\n" + "="*80)
+    print("BUSQUEDA DE HIPERPARAMETROS (VALIDACION CRUZADA)")
+    print("="*80)
+    
+    X_train, X_test, y_train, y_test = dividir_datos(X, y)
+    
+    # HistGradientBoosting trata las columnas codificadas como categóricas
+    categoricas = columnas_categoricas_nativas(X_train, label_encoders)
+    
+    busqueda = buscar_hiperparametros(X_train, y_train, categoricas, folds=folds, workers=workers)
+    
+    print(f"\nRESULTADOS ({busqueda['folds']} folds, {busqueda['workers']} workers, {busqueda['segundos']:.1f}s de pared):")
+    for resultado in busqueda['resultados']:
+        print(f"   AUC {resultado['auc_media']:.4f} ± {resultado['auc_std']:.4f} | "
+              f"{resultado['segundos_total']:7.1f}s | {resultado['nombre']}")
+    
+    mejor = busqueda['resultados'][0]
+    print(f"\nMEJOR CONFIGURACION: {mejor['nombre']}")
+    print("   Re-entrenando con todo el train...")
+    
+    modelo = crear_estimador(mejor['tipo'], mejor['parametros'], categoricas, n_jobs=-1)
+    inicio = time.perf_counter()
+    modelo.fit(X_train, y_train)
+    busqueda['segundos_refit'] = time.perf_counter() - inicio
+    
+    print(f"   -> Modelo entrenado exitosamente! ({busqueda['segundos_refit']:.1f}s)")
+    
+    return modelo, X_train, X_test, y_train, y_test, busqueda
+
+def importancia_features(modelo, X_test, y_test, features):
+    """
+    feature_importances_ del Random Forest; HistGradientBoosting no la tiene,
+    así que se usa la importancia por permutación (caída de AUC en el test)
+    """
+    if hasattr(modelo, 'feature_importances_'):
+        importancias = modelo.feature_importances_
+    else:
+        importancias = permutation_importance(
+            modelo, X_test, y_test, scoring='roc_auc', n_repeats=5, random_state=42, n_jobs=-1
+        ).importances_mean
+    
+    return pd.DataFrame({
+        'feature': features,
+        'importance': importancias
+    }).sort_values('importance', ascending=False)
+
 def evaluar_modelo_limpio(modelo, X_train, X_test, y_train, y_test, features, df_original):
     """
     Evalua modelo sin leakage
@@ -210,10 +287,7 @@ def evaluar_modelo_limpio(modelo, X_train, X_test, y_train, y_test, features, df
     print(f"   FN={cm[1,0]:4d}  |  TP={cm[1,1]:4d}")
     
     # Feature importance
-    feature_importance = pd.DataFrame({
-        'feature': features,
-        'importance': modelo.feature_importances_
-    }).sort_values('importance', ascending=False)
+    feature_importance = importancia_features(modelo, X_test, y_test, features)
     
     print("\nTOP 10 FEATURES MAS IMPORTANTES:")
     print(feature_importance.head(10).to_string(index=False))
@@ -363,6 +437,16 @@ def guardar_modelo(modelo, label_encoders, metricas, output_dir):
         pickle.dump(label_encoders, f)
     print(f"   Encoders guardados: {ruta_encoders}")
     
+    # Exportar modelo compacto (.npz) para scoring sin scikit-learn ni pickle
+    ruta_compacto = output_dir / ARCHIVO_MODELO_COMPACTO
+    if isinstance(modelo, RandomForestClassifier):
+        exportar_bosque(modelo, label_encoders, ruta_compacto)
+        print(f"   Modelo compacto guardado: {ruta_compacto}")
+    else:
+        # El formato compacto es solo para Random Forest: la app usa el pickle
+        ruta_compacto.unlink(missing_ok=True)
+        print(f"   Sin modelo compacto ({type(modelo).__name__}): la app carga el pickle")
+    
     # Guardar metricas
     ruta_metricas = output_dir / 'metricas_modelo_sin_leakage.json'
     with open(ruta_metricas, 'w', encoding='utf-8') as f:
@@ -370,27 +454,45 @@ def guardar_modelo(modelo, label_encoders, metricas, output_dir):
     print(f"   Metricas guardadas: {ruta_metricas}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Entrenar el modelo multi-universidad sin data leakage')
+    parser.add_argument('--busqueda', action='store_true',
+                        help='Buscar hiperparámetros con validación cruzada en paralelo (RF + HistGradientBoosting)')
+    parser.add_argument('--folds', type=int, default=FOLDS_DEFAULT,
+                        help='Folds de la validación cruzada estratificada')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Procesos para la búsqueda (1 = secuencial)')
+    args = parser.parse_args()
+    
     # Rutas
     BASE_DIR = Path(__file__).parent.parent
-    RUTA_DATOS = BASE_DIR / "data" / "datos_multi_universidad_features.csv"
     OUTPUT_DIR = BASE_DIR / "models"
     OUTPUT_DIR.mkdir(exist_ok=True)
     
-    # Cargar datos
+    # Cargar datos (solo features validas + target)
     print("\nCargando datos multi-universidad...")
-    df = pd.read_csv(RUTA_DATOS, low_memory=False)
+    df = cargar_dataset(DATASET_FEATURES, columnas=FEATURES_VALIDAS + ['target'])
     print(f"Cargados {len(df):,} leads")
     
     # Preparar datos SIN leakage
     X, y, label_encoders = preparar_datos_sin_leakage(df)
     
-    # Entrenar modelo
-    modelo, X_train, X_test, y_train, y_test = entrenar_modelo_limpio(X, y)
+    # Entrenar modelo (configuración fija o la mejor de la búsqueda)
+    busqueda = None
+    if args.busqueda:
+        modelo, X_train, X_test, y_train, y_test, busqueda = entrenar_con_busqueda(
+            X, y, label_encoders, folds=args.folds, workers=args.workers
+        )
+    else:
+        modelo, X_train, X_test, y_train, y_test = entrenar_modelo_limpio(X, y)
     
     # Evaluar
     metricas, y_pred_proba, feature_importance = evaluar_modelo_limpio(
         modelo, X_train, X_test, y_train, y_test, X.columns.tolist(), df
     )
+    metricas['modelo'] = type(modelo).__name__
+    if busqueda is not None:
+        # Scores de CV y tiempos de cada configuración junto al modelo elegido
+        metricas['busqueda_hiperparametros'] = busqueda
     
     # Visualizaciones
     crear_visualizaciones(y_test, y_pred_proba, feature_importance, OUTPUT_DIR)
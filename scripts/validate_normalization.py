@@ -11,6 +11,12 @@ import sys
 import io
 from collections import defaultdict
 
+# Añadir directorio raíz al path para importar el núcleo compartido
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scoring.dataset import cargar_dataset, existe_dataset, ruta_dataset, DATASET_LIMPIOS
+from scoring.tipos import tipo_compatible
+
 # Configurar encoding UTF-8
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
@@ -61,7 +67,7 @@ def validar_esquema(df, nombre_universidad):
     for col, tipo_esperado in tipos_esperados.items():
         if col in df.columns:
             tipo_actual = str(df[col].dtype)
-            if tipo_actual != tipo_esperado:
+            if not tipo_compatible(df[col].dtype, tipo_esperado):
                 advertencia = f"{col}: esperado {tipo_esperado}, actual {tipo_actual}"
                 resultados['advertencias'].append(advertencia)
                 print(f"   ⚠️  {advertencia}")
@@ -110,7 +116,8 @@ def validar_resoluciones(df, nombre_universidad):
     # Verificar categorización
     if 'resolucion_categoria' in df.columns:
         print("\n✓ Distribución de categorías:")
-        categorias = df['resolucion_categoria'].value_counts()
+        # Las categóricas conservan valores de otras universidades con conteo 0
+        categorias = df['resolucion_categoria'].value_counts().loc[lambda conteo: conteo > 0]
         for cat, count in categorias.items():
             pct = (count / len(df)) * 100
             print(f"   - {cat:35s}: {count:6,} ({pct:5.2f}%)")
@@ -119,7 +126,7 @@ def validar_resoluciones(df, nombre_universidad):
         unknown_count = (df['resolucion_categoria'] == 'unknown').sum()
         if unknown_count > 0:
             print(f"\n⚠️  {unknown_count} resoluciones no categorizadas:")
-            unknown_vals = df[df['resolucion_categoria'] == 'unknown']['Resolución'].value_counts().head(10)
+            unknown_vals = df[df['resolucion_categoria'] == 'unknown']['Resolución'].value_counts().loc[lambda conteo: conteo > 0].head(10)
             for val, count in unknown_vals.items():
                 print(f"      - {val}: {count}")
             return {'universidad': nombre_universidad, 'unknown_count': unknown_count}
@@ -230,23 +237,18 @@ if __name__ == "__main__":
                         help='Verificar calidad de datos')
     args = parser.parse_args()
     
-    BASE_DIR = Path(__file__).parent.parent
-    DATA_DIR = BASE_DIR / "data"
-    
     print("="*80)
     print("VALIDADOR DE NORMALIZACIÓN MULTI-UNIVERSIDAD")
     print("="*80)
     
     # Cargar datos normalizados
-    archivo_normalizado = DATA_DIR / "datos_multi_universidad_limpios.csv"
-    
-    if not archivo_normalizado.exists():
-        print(f"\n❌ Error: No se encontró {archivo_normalizado}")
+    if not existe_dataset(DATASET_LIMPIOS):
+        print(f"\n❌ Error: No se encontró {ruta_dataset(DATASET_LIMPIOS)}")
         print("   Ejecuta primero: python scripts/prepare_multi_university_data.py")
         sys.exit(1)
     
     print(f"\n📂 Cargando datos normalizados...")
-    df_completo = pd.read_csv(archivo_normalizado)
+    df_completo = cargar_dataset(DATASET_LIMPIOS)
     print(f"✅ Cargados {len(df_completo):,} leads")
     
     # Validar por universidad
@@ -0,0 +1,78 @@
+"""
+Paridad del motor NumPy (scoring.bosque) con scikit-learn
+BosqueCompacto.predict_proba tiene que ser bit a bit igual a
+RandomForestClassifier.predict_proba del modelo entrenado
+
+Las filas se arman con los propios umbrales del bosque (valores exactamente
+en el umbral y sus vecinos float32), enteros típicos del CRM y nulos.
+"""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from scoring.bosque import BosqueCompacto, aplanar_bosque
+from scoring.modelo import ARCHIVO_MODELO, ARCHIVO_MODELO_COMPACTO, MODELS_DIR
+
+pytestmark = pytest.mark.skipif(
+    not (MODELS_DIR / ARCHIVO_MODELO).exists() or not (MODELS_DIR / ARCHIVO_MODELO_COMPACTO).exists(),
+    reason="sin modelo entrenado (.pkl y .npz) en models/"
+)
+
+# Tamaños que cubren una fila, lotes parciales y varios lotes del motor
+TAMANOS = [1, 2, 7, 2047, 2048, 2049, 50_000]
+
+@pytest.fixture(scope='module')
+def modelo():
+    with open(MODELS_DIR / ARCHIVO_MODELO, 'rb') as f:
+        modelo = pickle.load(f)
+    if not isinstance(modelo, RandomForestClassifier):
+        pytest.skip("el modelo entrenado no es un Random Forest (no tiene versión compacta)")
+    # Suma secuencial de árboles (con n_jobs > 1 el orden depende de los hilos)
+    modelo.n_jobs = 1
+    return modelo
+
+@pytest.fixture(scope='module')
+def filas(modelo):
+    """Filas que caen justo en los umbrales, a un ulp de distancia y en nulos"""
+    rng = np.random.default_rng(0)
+    n_filas, n_features = max(TAMANOS), modelo.n_features_in_
+    X = rng.integers(0, 40, size=(n_filas, n_features)).astype(np.float32)
+
+    for f in range(n_features):
+        umbrales = np.concatenate([
+            e.tree_.threshold[e.tree_.feature == f] for e in modelo.estimators_
+        ]).astype(np.float32)
+        if len(umbrales) == 0:
+            continue
+
+        candidatos = np.concatenate([
+            umbrales,
+            np.nextafter(umbrales, np.float32(np.inf)),
+            np.nextafter(umbrales, np.float32(-np.inf)),
+        ])
+        usar = rng.random(n_filas) < 0.5
+        X[usar, f] = rng.choice(candidatos, size=usar.sum())
+
+    X[rng.random(X.shape) < 0.02] = np.nan
+    return pd.DataFrame(X, columns=modelo.feature_names_in_)
+
+@pytest.mark.parametrize('n', TAMANOS)
+def test_predict_proba_igual_a_sklearn(modelo, filas, n):
+    bosque = BosqueCompacto(aplanar_bosque(modelo))
+    X = filas.iloc[:n]
+    np.testing.assert_array_equal(bosque.predict_proba(X), modelo.predict_proba(X))
+
+def test_mismas_hojas(modelo, filas):
+    bosque = BosqueCompacto(aplanar_bosque(modelo))
+    X = filas.iloc[:5000]
+    np.testing.assert_array_equal(bosque.aplicar(X) - bosque.raices, modelo.apply(X))
+
+def test_npz_exportado_igual_al_pickle(modelo, filas):
+    """El .npz que carga la app corresponde al pickle vigente"""
+    compacto = BosqueCompacto.cargar(MODELS_DIR / ARCHIVO_MODELO_COMPACTO)
+    X = filas.iloc[:5000]
+    np.testing.assert_array_equal(compacto.predict_proba(X), modelo.predict_proba(X))
@@ -0,0 +1,42 @@
+"""
+Claves de duplicados: hash estable de email + programa (+ teléfono)
+"""
+
+import numpy as np
+import pandas as pd
+
+from scoring.duplicados import ConjuntoHashes, hash_claves
+
+CLAVE_CON_TELEFONO = ['EMLMAIL', 'Programa interes', 'TELTELEFONO']
+
+def test_telefono_entero():
+    df = pd.DataFrame({
+        'EMLMAIL': ['ana@mail.com', ' ANA@mail.com', 'beto@mail.com'],
+        'Programa interes': ['Medicina', 'medicina ', 'Medicina'],
+        'TELTELEFONO': np.array([3001234567, 3001234567, 3007654321], dtype=np.int64),
+    })
+    hashes = hash_claves(df, CLAVE_CON_TELEFONO)
+    assert hashes[0] == hashes[1]
+    assert hashes[0] != hashes[2]
+
+def test_telefono_igual_en_cualquier_tipo():
+    """El mismo teléfono como int, float (con nulos) o texto da la misma clave"""
+    base = {'EMLMAIL': ['ana@mail.com', 'ana@mail.com'], 'Programa interes': ['Medicina', 'Medicina']}
+    formas = [
+        np.array([3001234567, 3001234567], dtype=np.int64),
+        np.array([3001234567.0, np.nan]),
+        ['300-123-4567', None],
+    ]
+    primeros = {hash_claves(pd.DataFrame(dict(base, TELTELEFONO=forma)), CLAVE_CON_TELEFONO)[0] for forma in formas}
+    assert len(primeros) == 1
+
+def test_columna_booleana_y_nulos():
+    df = pd.DataFrame({'EMLMAIL': ['ana@mail.com', None], 'Programa interes': [None, None], 'flag': [True, False]})
+    hashes = hash_claves(df, ['EMLMAIL', 'Programa interes', 'flag'])
+    assert hashes.dtype == np.uint64 and hashes[0] != hashes[1]
+
+def test_conjunto_marca_vistos():
+    conjunto = ConjuntoHashes([5, 1])
+    vistos = conjunto.marcar_vistos(np.array([1, 2, 2, 7], dtype=np.uint64))
+    assert vistos.tolist() == [True, False, True, False]
+    assert conjunto.hashes.tolist() == [1, 2, 5, 7]
@@ -0,0 +1,62 @@
+"""
+Servicio de scoring: el score de un lead no depende del micro-lote que le toca
+"""
+
+import pytest
+
+from scoring.modelo import MODELS_DIR, ARCHIVO_MODELO_COMPACTO, cargar_artefactos
+from scoring.servicio import puntuar_registros
+from scoring.sintetico import generar_crm
+
+pytestmark = pytest.mark.skipif(
+    not (MODELS_DIR / ARCHIVO_MODELO_COMPACTO).exists(), reason="sin modelo entrenado en models/"
+)
+
+@pytest.fixture(scope='module')
+def artefactos():
+    return cargar_artefactos()
+
+def leads_sinteticos(universidad='Crexe', n=20):
+    """Leads sintéticos como los recibe el servicio (JSON: sin NaN)"""
+    df = generar_crm(universidad, n, semilla=3)
+    return [
+        {columna: (None if valor != valor else valor) for columna, valor in fila.items()}
+        for fila in df.to_dict('records')
+    ]
+
+@pytest.mark.parametrize('whatsapp', [0, 1, True, 'No', 'Si', None])
+def test_score_igual_solo_y_en_lote_mixto(artefactos, whatsapp):
+    modelo, encoders = artefactos
+    leads = [dict(lead, CHKENTRANTEWHATSAPP=whatsapp) for lead in leads_sinteticos()]
+    # Compañeros de lote con otros tipos de valor en la misma columna
+    companeros = [dict(leads[0], CHKENTRANTEWHATSAPP=valor) for valor in ('Si', 1.5, None, False)]
+
+    for lead in leads:
+        solo, = puntuar_registros([lead], modelo, encoders)
+        en_lote = puntuar_registros(companeros + [lead], modelo, encoders)[-1]
+        assert en_lote == solo
+
+@pytest.mark.parametrize('faltantes', [
+    ('CONTADOR_LLAMADOS_TEL', 'Llamadas_discador'),
+    ('Fecha insert Lead', 'Fecha y hora de actualización'),
+    ('WhatsApp entrante', 'EMLMAIL', 'UTM Source', 'UTM Medium'),
+])
+def test_score_igual_con_claves_faltantes(artefactos, faltantes):
+    modelo, encoders = artefactos
+    leads = [
+        {clave: valor for clave, valor in lead.items() if clave not in faltantes}
+        for lead in leads_sinteticos('UNAB')
+    ]
+    # Compañeros que sí traen esas claves (con nombre estándar o alias del CRM)
+    completo = leads_sinteticos('UNAB', 1)[0]
+    companeros = [
+        dict(completo, CONTADOR_LLAMADOS_TEL=12, Llamadas_discador=4,
+             **{'WhatsApp entrante': 'Si', 'Fecha insert Lead': '01/03/2024 10:00',
+                'Fecha y hora de actualización': '20/03/2024 10:00'}),
+        dict(completo, **{'Contador de Llamadas': 3, 'UTM Origen': 'facebook'}),
+    ]
+
+    for lead in leads:
+        solo, = puntuar_registros([lead], modelo, encoders)
+        en_lote = puntuar_registros(companeros + [lead], modelo, encoders)[-1]
+        assert en_lote == solo